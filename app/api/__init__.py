@@ -27,7 +27,8 @@ from app.api.controllers import (
     bh_airflow,
     import_db_catalog,
     bh_cluster,
-    user_detail
+    user_detail,
+    jobs
 )
 
 api_router = APIRouter()
@@ -58,3 +59,4 @@ api_router.include_router(schema.router, prefix='/schema', tags=['Schema'])
 api_router.include_router(release_bundle.router, prefix="/release_bundle", tags=['Release Bundle'])
 api_router.include_router(bh_airflow.router, prefix="/bh_airflow", tags=['Airflow Endpoints'])
 api_router.include_router(bh_cluster.router, prefix="/bh_cluster", tags=['Cluster Endpoints'])
+api_router.include_router(jobs.router, prefix="/jobs", tags=['Background Jobs'])
@@ -49,7 +49,7 @@ async def get_sample_data(
             authorized: Optional[dict] = Depends(authorize('admin_module', 'view')),
     ):
 
-    data_source = await ctx.data_source_service.get(id=data_src_id)
+    data_source = await ctx.data_source_service.get(id=data_src_id, profile="detail")
     data_source_layout = await ctx.data_source_layout_service.list(data_src_id=data_src_id)
     layout_fields = await ctx.layout_fields_service.list(lyt_id=data_source_layout[0].data_src_lyt_id)
 
@@ -1,3 +1,4 @@
+import json
 import logging
 from typing import List, Optional
 
@@ -7,13 +8,16 @@ from app.core.context import Context
 from app.exceptions.bh_project import DecryptExceptionError
 from app.services.aes import decrypt_string
 from app.utils.cloud_service_utils import get_cloud_decrypted_secrets
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi import status as http_status
+from fastapi.responses import StreamingResponse
 
 from app.utils.auth_wrapper import authorize
 from app.core.config import Config
 
+from app.models.airflow import DagRunStatus, DagRunStatusRequest
 from app.utils.airflow_utils.airflow_factory import AirflowFactory
+from app.utils.airflow_utils.airflow_gateway import airflow_gateway
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -170,12 +174,86 @@ async def dag_status(
     if authorized:
         cfg = Config()
         airflow_service = await AirflowFactory.get_airflow_service(cfg.CLOUD_TYPE, bh_env_name, ctx, airflow_env_name)
-        response = await airflow_service.get_dag_status(dag_id=dag_id, dag_run_id=dag_run_id)
+        response = await airflow_gateway.get_status(
+            airflow_service, (cfg.CLOUD_TYPE, bh_env_name, airflow_env_name), dag_id, dag_run_id
+        )
     else:
         response = {"error": "Unauthorized access."}
     return response
 
 
+@router.post(
+    "/dag_status/batch",
+    status_code=http_status.HTTP_200_OK,
+)
+async def dag_status_batch(
+    obj: DagRunStatusRequest,
+    bh_env_name: str,
+    airflow_env_name: str = None,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'edit'))
+):
+    """
+    To get the status of many DAG runs in one call, in the order of `runs`.
+    """
+    if authorized:
+        cfg = Config()
+        airflow_service = await AirflowFactory.get_airflow_service(cfg.CLOUD_TYPE, bh_env_name, ctx, airflow_env_name)
+        statuses = await airflow_gateway.get_statuses(
+            airflow_service,
+            (cfg.CLOUD_TYPE, bh_env_name, airflow_env_name),
+            [(run.dag_id, run.dag_run_id) for run in obj.runs],
+        )
+        response = [DagRunStatus(**status) for status in statuses]
+    else:
+        response = {"error": "Unauthorized access."}
+    return response
+
+
+@router.get(
+    "/dag_status/stream",
+    status_code=http_status.HTTP_200_OK,
+)
+async def dag_status_stream(
+    bh_env_name: str,
+    runs: List[str] = Query(..., description="Dag runs as dag_id:dag_run_id, repeat the parameter for each run"),
+    airflow_env_name: str = None,
+    interval: float = Query(None, description="Seconds between polls, AIRFLOW_STATUS_TTL at least"),
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'edit'))
+):
+    """
+    Server-sent events with the status of each DAG run, then one event per state
+    change. Runs that can't be read are sent as `error` events, a run not found
+    or failing AIRFLOW_WATCH_MAX_FAILURES polls in a row is no longer polled.
+    A `done` event closes the stream once every run has finished or was given up.
+    """
+    if not authorized:
+        return {"error": "Unauthorized access."}
+    dag_runs = []
+    for run in runs:
+        # DAG ids can't contain ':', run ids can
+        dag_id, sep, dag_run_id = run.partition(':')
+        if not sep or not dag_id or not dag_run_id:
+            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=f"Invalid dag run '{run}', expected dag_id:dag_run_id")
+        dag_runs.append((dag_id, dag_run_id))
+
+    cfg = Config()
+    airflow_service = await AirflowFactory.get_airflow_service(cfg.CLOUD_TYPE, bh_env_name, ctx, airflow_env_name)
+    # The stream can stay open for the whole run, don't hold a pooled DB connection for it
+    await ctx.release_db_session()
+
+    async def event_generator():
+        async for item in airflow_gateway.watch(
+            airflow_service, (cfg.CLOUD_TYPE, bh_env_name, airflow_env_name), dag_runs, interval
+        ):
+            event = "error" if item.get("error") else "dag_run"
+            yield f"event: {event}\ndata: {json.dumps(item, default=str)}\n\n"
+        yield f"event: done\ndata: {json.dumps({'runs': len(dag_runs)})}\n\n"
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 @router.get(
     "/get_dag_logs",
     status_code=http_status.HTTP_200_OK,
@@ -1,15 +1,17 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from fastapi import status as http_status
 
 from app.api.deps import get_context
 from app.core.context import Context
+from app.enums.pagination import TotalCount
 from app.models.base import StatusMessage
 from app.models.codes_hdr import (CodesDtlCreate, CodesDtlReturn,
                                   CodesDtlUpdate, CodesHdrCreate,
                                   CodesHdrReturn, CodesHdrUpdate)
 from app.utils.auth_wrapper import authorize
+from app.utils.pagination import CURSOR_DESCRIPTION, set_page_headers
 
 router = APIRouter()
 
@@ -29,17 +31,24 @@ async def get_all_codes_hdr(
         None, description="Field to order by, e.g., 'codes_hdr_id', 'codes_hdr_name'"
     ),
     order_desc: bool = False,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    with_total: Optional[TotalCount] = None,
+    response: Response,
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize("admin_module", "view"))
 ):
-    return await ctx.codes_hdr_service.list(
+    page = await ctx.codes_hdr_service.list(
         id=id,
         type_cd=type_cd,
         offset=offset,
         limit=limit,
         order_by=order_by,
         order_desc=order_desc,
+        cursor=cursor,
+        with_total=with_total,
     )
+    set_page_headers(response, page)
+    return page
 
 
 @router.get(
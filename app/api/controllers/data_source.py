@@ -2,11 +2,13 @@ from typing import Any, Dict, List, Optional
 from urllib.parse import parse_qs
 
 from app.utils.data_source_utils import get_text_embedding
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi import status as http_status
 
 from app.api.deps import get_context
 from app.core.context import Context
+from app.enums.job import JobType
+from app.enums.pagination import TotalCount
 from app.exceptions import DSMissingRequiredParameter
 from app.models.base import StatusMessage
 from app.models.data_source import (DataSource, DataSourceCreate, DataSourceMetadataCreate,
@@ -14,6 +16,10 @@ from app.models.data_source import (DataSource, DataSourceCreate, DataSourceMeta
                                     DataSourceMetadataUpdate, DataSourceReturn,
                                     DataSourceUpdate)
 from app.utils.auth_wrapper import authorize
+from app.utils.json_utils import NDJSON_DESCRIPTION, ndjson_response
+from app.utils.job_utils import AS_JOB_DESCRIPTION
+from app.utils.pagination import CURSOR_DESCRIPTION, set_page_headers
+from app.utils.search_utils import TEXT_SEARCH_DESCRIPTION
 
 router = APIRouter()
 
@@ -97,10 +103,28 @@ async def get_all_data_sources(
         None, description="Field to order by, e.g., 'data_src_name', 'data_src_key'"
     ),
     order_desc: bool = False,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    with_total: Optional[TotalCount] = None,
+    format: str = Query('json', regex='^(json|ndjson)$', description=NDJSON_DESCRIPTION),
+    response: Response,
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
-    return await ctx.data_source_service.list(
+    if format == 'ndjson':
+        return ndjson_response(ctx.data_source_service.stream_list(
+            data_src_id=data_src_id,
+            data_src_name=data_src_name,
+            data_src_key=data_src_key,
+            data_src_status_cd=data_src_status_cd,
+            lake_zone_id=lake_zone_id,
+            connection_config_id=connection_config_id,
+            offset=offset,
+            limit=limit,
+            order_by=order_by,
+            order_desc=order_desc,
+            cursor=cursor,
+        ))
+    page = await ctx.data_source_service.list(
         data_src_id=data_src_id,
         data_src_name=data_src_name,
         data_src_key=data_src_key,
@@ -111,7 +135,11 @@ async def get_all_data_sources(
         limit=limit,
         order_by=order_by,
         order_desc=order_desc,
+        cursor=cursor,
+        with_total=with_total,
     )
+    set_page_headers(response, page)
+    return page
 
 
 @router.get(
@@ -174,6 +202,26 @@ async def search_field_for_word(
     return await ctx.data_source_service.search(params=params)
 
 
+@router.get(
+    "/text-search/",
+    response_model=List[DataSourceReturn],
+    status_code=http_status.HTTP_200_OK,
+)
+async def text_search_data_sources(
+    *,
+    q: str = Query(..., min_length=1, description=TEXT_SEARCH_DESCRIPTION),
+    offset: int = 0,
+    limit: int = 10,
+    with_total: Optional[TotalCount] = None,
+    response: Response,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    page = await ctx.data_source_service.text_search(q, offset=offset, limit=limit, with_total=with_total)
+    set_page_headers(response, page)
+    return page
+
+
 @router.get(
     "/check_src_exists",
     response_model=bool,
@@ -203,11 +251,7 @@ async def get_data_source(
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
-    data_source = await ctx.data_source_service.get(data_src_id)
-    if data_source.connection_config_id:
-        connection_config = await ctx.connection_config_service.get(data_source.connection_config_id)
-        data_source.connection_config = connection_config
-    return data_source
+    return await ctx.data_source_service.get(data_src_id, profile="detail")
 
 
 @router.post(
@@ -250,11 +294,11 @@ async def patch_data_source(
             updated_fields.append('desc')
     else:
         data_source.data_src_desc = current_data_source.data_src_desc
+    # Unchanged name and description keep the stored (deferred) embedding,
+    # update() skips fields left as None
     if updated_fields:
         embedding = await get_text_embedding(data_source.data_src_name, data_source.data_src_desc)
         data_source.data_src_embeddings=embedding
-    else:
-        data_source.data_src_embeddings=current_data_source.data_src_embeddings
     
     return await ctx.data_source_service.update(data_src_id, data_source, authorized=authorized)
 
@@ -407,13 +451,14 @@ async def search_field_for_word(
 async def semantic_search(
     query: str = Query(..., description="Enter a full sentence to search related data sources"),
     connection_config_id: int = Query(..., description="Filter by connection config ID"),
+    bh_project_id: Optional[int] = Query(None, description="Filter by project ID"),
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
     """
     Search for related data sources based on a full sentence.
     """
-    return await ctx.data_source_service.semantic_search(query, connection_config_id)
+    return await ctx.data_source_service.semantic_search(query, connection_config_id, bh_project_id=bh_project_id)
 
 
 #TODO only for testing will remove later
@@ -425,13 +470,14 @@ async def semantic_search(
 async def semantic_search2(
     query: str = Query(..., description="Enter a full sentence to search related data sources"),
     connection_config_id: int = Query(..., description="Filter by connection config ID"),
+    bh_project_id: Optional[int] = Query(None, description="Filter by project ID"),
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
     """
     Search for related data sources based on a full sentence.
     """
-    return await ctx.data_source_service.semantic_search2(query, connection_config_id)
+    return await ctx.data_source_service.semantic_search2(query, connection_config_id, bh_project_id=bh_project_id)
 
 
 
@@ -439,6 +485,7 @@ async def semantic_search2(
 @router.post("/generate-datasource-descriptions", response_model=dict)
 async def generate_datasource_descriptions(
     request: List[int],
+    as_job: bool = Query(False, description=AS_JOB_DESCRIPTION),
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'edit'))
     ):
@@ -447,11 +494,14 @@ async def generate_datasource_descriptions(
     
     Args:
         request (List[int]): List of data source IDs.
-        db (AsyncSession): Database session.
+        as_job (bool): Run in the background and return the job id.
     
     Returns:
         dict: Success message or error details.
     """
+    if as_job:
+        job = await ctx.job_service.submit(JobType.GENERATE_DESCRIPTIONS, items=request, authorized=authorized)
+        return {"message": "Description generation queued", "job_id": job.job_id}
 
     return await ctx.data_source_service.create_description(request=request)
 
@@ -459,6 +509,7 @@ async def generate_datasource_descriptions(
 @router.post("/update-datasource-embeddings", response_model=dict)
 async def update_datasource_embeddings(
     request: List[int],
+    as_job: bool = Query(False, description=AS_JOB_DESCRIPTION),
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'edit'))
 ):
@@ -467,9 +518,13 @@ async def update_datasource_embeddings(
 
     Args:
         request (List[int]): List of data source IDs.
+        as_job (bool): Run in the background and return the job id.
 
     Returns:
         dict: Success message or error details.
     """
+    if as_job:
+        job = await ctx.job_service.submit(JobType.UPDATE_EMBEDDINGS, items=request, authorized=authorized)
+        return {"message": "Embedding update queued", "job_id": job.job_id}
 
     return await ctx.data_source_service.update_embeddings(request=request)
@@ -1,11 +1,12 @@
 from typing import List, Optional
 from urllib.parse import parse_qs
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi import status as http_status
 
 from app.api.deps import get_context
 from app.core.context import Context
+from app.enums.pagination import TotalCount
 from app.models.base import StatusMessage
 from app.models.data_source_layout import (DataSourceLayoutCreate,
                                            DataSourceLayoutFullReturn,
@@ -13,6 +14,7 @@ from app.models.data_source_layout import (DataSourceLayoutCreate,
                                            DataSourceLayoutUpdate)
 from app.models.connection_registry import ConnectionConfigReturn
 from app.utils.auth_wrapper import authorize
+from app.utils.pagination import CURSOR_DESCRIPTION, set_page_headers
 
 router = APIRouter()
 
@@ -86,10 +88,13 @@ async def get_all_data_source_layouts(
         description="Field to order by, e.g., 'data_src_lyt_name', 'data_src_lyt_key'",
     ),
     order_desc: bool = False,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    with_total: Optional[TotalCount] = None,
+    response: Response,
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
-    return await ctx.data_source_layout_service.list(
+    page = await ctx.data_source_layout_service.list(
         data_src_lyt_id=data_src_lyt_id,
         data_src_lyt_name=data_src_lyt_name,
         data_src_lyt_key=data_src_lyt_key,
@@ -99,7 +104,11 @@ async def get_all_data_source_layouts(
         limit=limit,
         order_by=order_by,
         order_desc=order_desc,
+        cursor=cursor,
+        with_total=with_total,
     )
+    set_page_headers(response, page)
+    return page
 
 
 @router.get(
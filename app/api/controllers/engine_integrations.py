@@ -1,12 +1,13 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi import status as http_status
 
 from app.api.deps import get_context
 from app.core.context import Context
 from app.exceptions import MissingRequiredParameter
 from app.utils.auth_wrapper import authorize
+from app.utils.json_utils import ndjson_response
 
 router = APIRouter()
 
@@ -16,9 +17,14 @@ router = APIRouter()
     status_code=http_status.HTTP_200_OK,
 )
 async def export_tables(
-    *, ctx: Context = Depends(get_context),
+    *, format: str = Query('json', regex='^(json|ndjson)$'),
+    ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
+    """ Every exported table, or with format=ndjson one `{"table", "row"}` line
+        per row streamed as the rows are read."""
+    if format == 'ndjson':
+        return ndjson_response(ctx.engine_integrations_service.stream_export_tables())
     return await ctx.engine_integrations_service.export_tables()
 
 
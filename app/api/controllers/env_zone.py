@@ -121,7 +121,7 @@ async def create_lake_zone(
 ):
 
     env = await ctx.project_environment_service.get(id=obj.bh_env_id)
-    env_provider = await ctx.codes_dtl_service.get(id=env.bh_env_provider)
+    env_provider = await ctx.reference_data_service.get_code(id=env.bh_env_provider)
     env_cd = env_provider.dtl_desc[:1].lower() if env_provider else ""
 
     lake_zone = await ctx.lake_zone_service.create(obj=obj, authorized=authorized)
@@ -1,4 +1,6 @@
+import asyncio
 from datetime import datetime
+import functools
 import json
 from typing import List, Optional
 from urllib.parse import parse_qs
@@ -9,11 +11,12 @@ from app.services.aws import AWSS3Service
 from app.utils.cloud_service_utils import get_secret_manager_formatted_name
 from app.utils.pipeline_utils import pipeline_sample_json
 from app.utils.validata_flow_schema import validate_json
-from fastapi import APIRouter, Depends, Query, Query, Request
+from fastapi import APIRouter, Depends, Query, Query, Request, Response
 from fastapi import status as http_status
 from src.flow import FlowRunner
 from app.api.deps import get_context
 from app.core.context import Context
+from app.enums.pagination import TotalCount
 from app.enums.flow import SchemaTypes
 from app.exceptions.flow import (
     FlowAlreadyExists,
@@ -33,6 +36,7 @@ from app.models.flow import (
     FlowDefinitionCreate,
     FlowDefinitionReturn,
     FlowDefinitionUpdate,
+    DagDeploymentStatus,
     FlowDeploymentBase,
     FlowDeploymentCreate,
     FlowDeploymentReturn,
@@ -45,6 +49,8 @@ from app.models.flow import (
     FlowVersionUpdate,
 )
 from app.utils.auth_wrapper import authorize
+from app.utils.pagination import CURSOR_DESCRIPTION, set_page_headers
+from app.utils.search_utils import TEXT_SEARCH_DESCRIPTION
 from app.utils.bh_project import generate_github_secret_name
 from app.utils.flow_utils import (
     create_flow_release_version,
@@ -53,6 +59,13 @@ from app.utils.flow_utils import (
 from app.utils.moniter_utils import request_create_monitor, store_monitor_data
 from app.utils.normalization import normalise_name
 from app.utils.constants import AWS, GCP, AZURE, AWS_ID, GCP_ID, AZURE_ID
+from app.utils.dag_deployment import (
+    DAG_DEPLOYMENT_HEADER,
+    DAG_FINGERPRINT_HEADER,
+    FINGERPRINT_METADATA_KEY,
+    dag_deployer,
+    dag_fingerprint,
+)
 
 router = APIRouter()
 
@@ -72,6 +85,9 @@ async def get_all_flows(
         None, description="Field to order by, e.g., 'flow_name', 'flow_description'"
     ),
     order_desc: bool = False,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    with_total: Optional[TotalCount] = None,
+    response: Response,
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize("admin_module", "view")),
 ):
@@ -85,8 +101,12 @@ async def get_all_flows(
         limit=limit,
         order_by=order_by,
         order_desc=order_desc,
+        cursor=cursor,
+        with_total=with_total,
     )
 
+    set_page_headers(response, flows)
+
     # Add the schedule intervals to the flows list
     return flows
 
@@ -101,7 +121,7 @@ async def get_flow(
     authorized: Optional[dict] = Depends(authorize("admin_module", "view")),
 ):
 
-    flow = await ctx.flow_service.get(flow_id)
+    flow = await ctx.flow_service.get(flow_id, profile="detail")
     return flow
 
 
@@ -126,6 +146,26 @@ async def search_flow_field_for_word(
     return await ctx.flow_service.search(params=params)
 
 
+@router.get(
+    "/flow/text-search",
+    response_model=List[FlowReturn],
+    status_code=http_status.HTTP_200_OK,
+)
+async def text_search_flows(
+    *,
+    q: str = Query(..., min_length=1, description=TEXT_SEARCH_DESCRIPTION),
+    offset: int = 0,
+    limit: int = 10,
+    with_total: Optional[TotalCount] = None,
+    response: Response,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    page = await ctx.flow_service.text_search(q, offset=offset, limit=limit, with_total=with_total)
+    set_page_headers(response, page)
+    return page
+
+
 @router.post(
     "/create/", response_model=FlowReturn, status_code=http_status.HTTP_201_CREATED
 )
@@ -184,7 +224,7 @@ async def create_flow(
     )
     await ctx.flow_config_service.create(obj=flow_config_obj, authorized=authorized)
 
-    await ctx.db_session.refresh(new_flow)
+    new_flow = await ctx.flow_service.refresh(new_flow, profile="detail")
 
     return new_flow
 
@@ -520,6 +560,140 @@ async def create_flow_definition(
     )
 
 
+def _dag_generator_inputs(flow_deployment) -> dict:
+    """Everything besides the flow JSON the DAG generator reads."""
+    # Determine cloud provider
+    cloud_provider_map = {
+        AWS_ID: AWS,
+        GCP_ID: GCP,
+        AZURE_ID: AZURE,
+    }  # cloud service add here
+    client_cloud_provider = cloud_provider_map.get(
+        flow_deployment.project_environment.cloud_provider_cd
+    )
+    if not client_cloud_provider:
+        raise ValueError("Unsupported cloud provider")
+
+    cfg = Config()
+    return dict(
+        bh_app_bucket=cfg.BH_APP_BUCKET,
+        client_airflow_bucket=flow_deployment.project_environment.airflow_bucket_name,
+        bh_cloud_provider=cfg.CLOUD_TYPE,
+        client_cloud_provider=client_cloud_provider,
+        pipeline_engine_version=cfg.PIPELINE_ENGINE_VERSION,
+        schema_file_path=cfg.SCHEMA_FILE_PATH,
+    )
+
+
+def _dag_target(flow_deployment, generator_inputs: dict) -> tuple:
+    return (
+        generator_inputs["client_cloud_provider"],
+        flow_deployment.project_environment.airflow_bucket_name,
+        f"dags/{flow_deployment.flow.flow_key}.py",
+    )
+
+
+async def _dag_s3_service(ctx: Context, flow_deployment) -> AWSS3Service:
+    try:
+        secret_name = flow_deployment.project_environment.pvt_key
+        secret_key = await ctx.aws_service.secrets.get_secret(secret_name)
+        return AWSS3Service(
+            secret_key.get("aws_access_key", ""),
+            secret_key.get("aws_secret_access_key", ""),
+            "us-east-1",
+        )
+    except Exception as e:
+        raise AWSSecretsClientError(context={"message": str(e)})
+
+
+def _deployed_fingerprint(aws_s3_service: AWSS3Service, bucket_name: str, dag_key: str) -> Optional[str]:
+    metadata = aws_s3_service.get_object_metadata(bucket_name, dag_key)
+    return (metadata or {}).get(FINGERPRINT_METADATA_KEY)
+
+
+async def _deploy_flow_dag(ctx: Context, flow_deployment, flow_json: dict, response: Response) -> None:
+    """ Generate the Airflow DAG of `flow_json` and upload it in the background.
+        Nothing is done when the DAG file on S3 already holds the same flow JSON
+        and generator inputs. The outcome is returned in the `X-DAG-Deployment`
+        (`unchanged`, `scheduled` or `validated`) and `X-DAG-Fingerprint` headers,
+        the upload itself is followed with `/flow-deployment/{id}/dag-status`."""
+    generator_inputs = _dag_generator_inputs(flow_deployment)
+    target = _dag_target(flow_deployment, generator_inputs)
+    client_cloud_provider, bucket_name, dag_key = target
+    fingerprint = dag_fingerprint(flow_json, generator_inputs)
+    response.headers[DAG_FINGERPRINT_HEADER] = fingerprint
+
+    aws_s3_service = None
+    if client_cloud_provider == AWS:
+        aws_s3_service = await _dag_s3_service(ctx, flow_deployment)
+        # S3 is the source of truth, another worker may have deployed since
+        deployed = functools.partial(_deployed_fingerprint, aws_s3_service, bucket_name, dag_key)
+        if not await dag_deployer.needs_upload(target, fingerprint, deployed):
+            response.headers[DAG_DEPLOYMENT_HEADER] = "unchanged"
+            return
+
+    # Generate DAG file from flow JSON
+    try:
+        flow_runner = FlowRunner(config=flow_json, **generator_inputs)
+        dag_file = await asyncio.to_thread(flow_runner.get_dag_code)
+    except Exception as e:
+        raise JsonNotValidError(context={"error": str(e)})
+
+    # Deploy DAG file based on cloud provider
+    if client_cloud_provider == AWS:
+        # Upload the DAG file to the bucket in the Airflow DAGs folder
+        dag_deployer.schedule(target, fingerprint, functools.partial(
+            aws_s3_service.upload_file_to_s3,
+            bucket_name=bucket_name,
+            key=dag_key,
+            file_content=dag_file,
+            content_type="application/x-python-code",
+            metadata={FINGERPRINT_METADATA_KEY: fingerprint},
+        ))
+        response.headers[DAG_DEPLOYMENT_HEADER] = "scheduled"
+    else:
+        # GCP / Azure deployments are not implemented yet, the DAG is only validated
+        response.headers[DAG_DEPLOYMENT_HEADER] = "validated"
+
+
+@router.get(
+    "/flow-deployment/{flow_deployment_id}/dag-status",
+    response_model=DagDeploymentStatus,
+    status_code=http_status.HTTP_200_OK,
+)
+async def get_flow_deployment_dag_status(
+    *,
+    flow_deployment_id: int,
+    fingerprint: Optional[str] = Query(
+        None, description="`X-DAG-Fingerprint` of the save to check, reported as `outdated` when S3 holds another one"
+    ),
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize("admin_module", "view")),
+):
+    """ State of the DAG file of a flow deployment: the upload queued, running or
+        failed on this worker, otherwise the fingerprint the S3 object holds."""
+    flow_deployment = await ctx.flow_deployment_service.get_flow_deployment_with_flow(flow_deployment_id)
+    generator_inputs = _dag_generator_inputs(flow_deployment)
+    target = _dag_target(flow_deployment, generator_inputs)
+    client_cloud_provider, bucket_name, dag_key = target
+
+    status = dag_deployer.status(target)
+    if status is not None and (fingerprint is None or status["fingerprint"] == fingerprint):
+        return DagDeploymentStatus(**status)
+    if client_cloud_provider != AWS:
+        return DagDeploymentStatus(state="unknown", fingerprint=fingerprint)
+
+    aws_s3_service = await _dag_s3_service(ctx, flow_deployment)
+    deployed = await asyncio.to_thread(_deployed_fingerprint, aws_s3_service, bucket_name, dag_key)
+    if deployed is None:
+        state = "missing"
+    elif fingerprint is not None and deployed != fingerprint:
+        state = "outdated"
+    else:
+        state = "deployed"
+    return DagDeploymentStatus(state=state, fingerprint=deployed, error=(status or {}).get("error"))
+
+
 @router.patch(
     "/flow-definition/{flow_definition_id}",
     response_model=FlowDefinitionReturn,
@@ -530,6 +704,7 @@ async def update_flow_definition(
     flow_definition_id: int,
     obj: FlowDefinitionUpdate,
     ctx: Context = Depends(get_context),
+    response: Response,
     authorized: Optional[dict] = Depends(authorize("admin_module", "edit")),
 ):
 
@@ -552,63 +727,7 @@ async def update_flow_definition(
     except Exception as e:
         raise ValueError("Failed to fetch flow deployment") from e
 
-    # Determine cloud provider
-    cloud_provider_map = {
-        AWS_ID: AWS,
-        GCP_ID: GCP,
-        AZURE_ID: AZURE,
-    }  # cloud service add here
-    client_cloud_provider = cloud_provider_map.get(
-        flow_deployment.project_environment.cloud_provider_cd
-    )
-    if not client_cloud_provider:
-        raise ValueError("Unsupported cloud provider")
-
-    # Generate DAG file from flow JSON
-    try:
-        cfg = Config()
-        flow_runner = FlowRunner(
-            config=obj.flow_json,
-            bh_app_bucket=cfg.BH_APP_BUCKET,
-            client_airflow_bucket=flow_deployment.project_environment.airflow_bucket_name,
-            bh_cloud_provider=cfg.CLOUD_TYPE,
-            client_cloud_provider=client_cloud_provider,
-            pipeline_engine_version=cfg.PIPELINE_ENGINE_VERSION,
-            schema_file_path=cfg.SCHEMA_FILE_PATH,
-        )
-        dag_file = flow_runner.get_dag_code()
-    except Exception as e:
-        raise JsonNotValidError(context={"error": str(e)})
-
-    # Deploy DAG file based on cloud provider
-    try:
-        if client_cloud_provider == AWS:
-            secret_name = flow_deployment.project_environment.pvt_key
-            secret_key = await ctx.aws_service.secrets.get_secret(secret_name)
-            aws_s3_service = AWSS3Service(
-                secret_key.get("aws_access_key", ""),
-                secret_key.get("aws_secret_access_key", ""),
-                "us-east-1",
-            )
-            bucket_name = flow_deployment.project_environment.airflow_bucket_name
-            airflow_dag_folder = "dags/"
-            dag_file_name = f"{flow_deployment.flow.flow_key}.py"
-            # Upload the DAG file to the bucket in the Airflow DAGs folder
-            aws_s3_service.upload_file_to_s3(
-                bucket_name=bucket_name,
-                key=f"{airflow_dag_folder}{dag_file_name}",
-                file_content=dag_file,
-                content_type="application/x-python-code",
-            )
-        elif client_cloud_provider == GCP:
-            # deploy to gcp
-            pass
-
-        elif client_cloud_provider == AZURE:
-            # deploy to azure
-            pass
-    except Exception as e:
-        raise AWSSecretsClientError(context={"message": str(e)})
+    await _deploy_flow_dag(ctx, flow_deployment, obj.flow_json, response)
 
     # Restore full flow JSON before updating
     obj.flow_deployment_id = None
@@ -683,6 +802,7 @@ async def update_flow_definition_by_flow_id(
     flow_id: int,
     obj: FlowDefinitionUpdate,
     ctx: Context = Depends(get_context),
+    response: Response,
     authorized: Optional[dict] = Depends(authorize("admin_module", "edit")),
 ):
     """
@@ -708,63 +828,7 @@ async def update_flow_definition_by_flow_id(
     except Exception as e:
         raise ValueError("Failed to fetch flow deployment") from e
 
-    # Determine cloud provider
-    cloud_provider_map = {
-        AWS_ID: AWS,
-        GCP_ID: GCP,
-        AZURE_ID: AZURE,
-    }  # cloud service add here
-    client_cloud_provider = cloud_provider_map.get(
-        flow_deployment.project_environment.cloud_provider_cd
-    )
-    if not client_cloud_provider:
-        raise ValueError("Unsupported cloud provider")
-
-    # Generate DAG file from flow JSON
-    try:
-        cfg = Config()
-        flow_runner = FlowRunner(
-            config=obj.flow_json,
-            bh_app_bucket=cfg.BH_APP_BUCKET,
-            client_airflow_bucket=flow_deployment.project_environment.airflow_bucket_name,
-            bh_cloud_provider=cfg.CLOUD_TYPE,
-            client_cloud_provider=client_cloud_provider,
-            pipeline_engine_version=cfg.PIPELINE_ENGINE_VERSION,
-            schema_file_path=cfg.SCHEMA_FILE_PATH,
-        )
-        dag_file = flow_runner.get_dag_code()
-    except Exception as e:
-        raise JsonNotValidError(context={"error": str(e)})
-
-    # Deploy DAG file based on cloud provider
-    try:
-        if client_cloud_provider == AWS:
-            secret_name = flow_deployment.project_environment.pvt_key
-            secret_key = await ctx.aws_service.secrets.get_secret(secret_name)
-            aws_s3_service = AWSS3Service(
-                secret_key.get("aws_access_key", ""),
-                secret_key.get("aws_secret_access_key", ""),
-                "us-east-1",
-            )
-            bucket_name = flow_deployment.project_environment.airflow_bucket_name
-            airflow_dag_folder = "dags/"
-            dag_file_name = f"{flow_deployment.flow.flow_key}.py"
-            # Upload the DAG file to the bucket in the Airflow DAGs folder
-            aws_s3_service.upload_file_to_s3(
-                bucket_name=bucket_name,
-                key=f"{airflow_dag_folder}{dag_file_name}",
-                file_content=dag_file,
-                content_type="application/x-python-code",
-            )
-        elif client_cloud_provider == GCP:
-            # deploy to gcp
-            pass
-
-        elif client_cloud_provider == AZURE:
-            # deploy to azure
-            pass
-    except Exception as e:
-        raise AWSSecretsClientError(context={"message": str(e)})
+    await _deploy_flow_dag(ctx, flow_deployment, obj.flow_json, response)
 
     # Restore full flow JSON before updating
     obj.flow_deployment_id = None
@@ -21,10 +21,10 @@ Design requrieemtns
 """
 
 from app.utils.auth_wrapper import authorize
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from app.api.deps import get_context
+from app.enums.job import JobType
 from typing import List, Optional
-from app.celery_conf.tasks import create_data_source_async
 
 router = APIRouter()
 
@@ -90,17 +90,29 @@ async def create_data_source(
     create_description: Optional[bool] = None,
     schema: str,
     tables: List[str],  # List of selected tables
-    background_tasks: BackgroundTasks,
     ctx = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize("admin_module", "edit")),
 ):
-    """Create Data Source and Data Source Layout for selected tables"""
+    """ Create Data Source and Data Source Layout for selected tables. The import runs
+        as a background job, follow it with `/jobs/{job_id}` or `/jobs/{job_id}/events`."""
 
     # Validate input
     if not tables:
         raise HTTPException(status_code=400, detail="At least one table must be selected")
-    background_tasks.add_task(create_data_source_async, bh_project_id, connection_config_id, schema, tables, create_description, authorized, ctx)
+    job = await ctx.job_service.submit(
+        JobType.IMPORT_CATALOG,
+        items=tables,
+        params={
+            "bh_project_id": bh_project_id,
+            "connection_config_id": connection_config_id,
+            "schema": schema,
+            "create_description": bool(create_description),
+            "authorized": {"user_detail_id": authorized["user_detail_id"]} if authorized else None,
+        },
+        authorized=authorized,
+    )
     return {
-        "message": "Data source and layouts created successfully",
-        "tables": tables
+        "message": "Data source import queued",
+        "tables": tables,
+        "job_id": job.job_id,
     }
@@ -0,0 +1,140 @@
+import asyncio
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi import status as http_status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_context
+from app.core.config import Config
+from app.core.context import Context
+from app.enums.job import JobStatus, JobType
+from app.models.job import BHJobReturn
+from app.services.job import TERMINAL_STATUSES
+from app.utils.auth_wrapper import authorize
+from app.utils.pagination import CURSOR_DESCRIPTION, set_page_headers
+
+router = APIRouter()
+
+
+@router.get(
+    "/list/",
+    response_model=List[BHJobReturn],
+    status_code=http_status.HTTP_200_OK,
+)
+async def get_all_jobs(
+    *,
+    job_type: Optional[JobType] = None,
+    status: Optional[JobStatus] = None,
+    offset: int = 0,
+    limit: int = 10,
+    order_desc: bool = True,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    response: Response,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    """List background jobs, newest first. Per item progress is left out, see `/jobs/{job_id}`."""
+    page = await ctx.job_service.list(
+        job_type=job_type,
+        status=status,
+        offset=offset,
+        limit=limit,
+        order_by="job_id",
+        order_desc=order_desc,
+        cursor=cursor,
+    )
+    for job in page:
+        job.progress = None
+    set_page_headers(response, page)
+    return page
+
+
+@router.get(
+    "/{job_id}",
+    response_model=BHJobReturn,
+    status_code=http_status.HTTP_200_OK,
+)
+async def get_job(
+    *,
+    job_id: int,
+    with_progress: bool = Query(True, description="Include the state of every item"),
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    """Status and progress of a background job, for polling."""
+    job = await ctx.job_service.get_job(job_id)
+    return ctx.job_service.snapshot(job, with_progress=with_progress)
+
+
+@router.get(
+    "/{job_id}/events",
+    status_code=http_status.HTTP_200_OK,
+)
+async def stream_job_events(
+    *,
+    job_id: int,
+    request: Request,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    """ Server-sent events with the job state (without per item progress), one
+        `progress` event per change and a final `done` event."""
+    await ctx.job_service.get_job(job_id)
+    # The stream can stay open for the whole job, don't hold a pooled DB connection for it
+    await ctx.release_db_session()
+
+    async def event_generator():
+        last = None
+        while not await request.is_disconnected():
+            # Short lived context per poll, each check holds a connection only briefly
+            async with Context() as poll_ctx:
+                job = await poll_ctx.job_service.get_job(job_id)
+                snapshot = jsonable_encoder(poll_ctx.job_service.snapshot(job, with_progress=False))
+            if snapshot != last:
+                last = snapshot
+                yield f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+            if job.status in TERMINAL_STATUSES:
+                yield f"event: done\ndata: {json.dumps(snapshot)}\n\n"
+                return
+            await asyncio.sleep(Config.JOB_EVENTS_INTERVAL)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/{job_id}/cancel",
+    response_model=BHJobReturn,
+    status_code=http_status.HTTP_200_OK,
+)
+async def cancel_job(
+    *,
+    job_id: int,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'edit'))
+):
+    """Cancel a queued or running job, a running job stops after its current chunk."""
+    job = await ctx.job_service.cancel(job_id)
+    return ctx.job_service.snapshot(job, with_progress=False)
+
+
+@router.post(
+    "/{job_id}/resume",
+    response_model=BHJobReturn,
+    status_code=http_status.HTTP_202_ACCEPTED,
+)
+async def resume_job(
+    *,
+    job_id: int,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'edit'))
+):
+    """Queue a failed or cancelled job again, only the items not done yet are processed."""
+    job = await ctx.job_service.resume(job_id)
+    return ctx.job_service.snapshot(job, with_progress=False)
@@ -2,15 +2,19 @@ from typing import List, Optional
 from urllib.parse import parse_qs
 
 from app.utils.data_source_utils import get_text_embedding
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi import status as http_status
 
 from app.api.deps import get_context
 from app.core.context import Context
+from app.enums.pagination import TotalCount
 from app.models.base import StatusMessage
 from app.models.layout_fields import (LayoutFields, LayoutFieldsCreate, LayoutFieldsReturn,
                                       LayoutFieldsUpdate, LayoutBulkDescriptionUpdate)
 from app.utils.auth_wrapper import authorize
+from app.utils.json_utils import NDJSON_DESCRIPTION, ndjson_response
+from app.utils.pagination import CURSOR_DESCRIPTION, set_page_headers
+from app.utils.search_utils import TEXT_SEARCH_DESCRIPTION
 
 router = APIRouter()
 
@@ -33,10 +37,27 @@ async def get_all_layout_fields(
         None, description="Field to order by, e.g., 'field_name', 'field_type'"
     ),
     order_desc: bool = False,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    with_total: Optional[TotalCount] = None,
+    format: str = Query('json', regex='^(json|ndjson)$', description=NDJSON_DESCRIPTION),
+    response: Response,
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
-    return await ctx.layout_fields_service.list(
+    if format == 'ndjson':
+        return ndjson_response(ctx.layout_fields_service.stream_list(
+            lyt_fld_id=lyt_fld_id,
+            lyt_fld_name=lyt_fld_name,
+            lyt_fld_key=lyt_fld_key,
+            lyt_fld_is_pk=lyt_fld_is_pk,
+            lyt_id=lyt_id,
+            offset=offset,
+            limit=limit,
+            order_by=order_by,
+            order_desc=order_desc,
+            cursor=cursor,
+        ))
+    page = await ctx.layout_fields_service.list(
         lyt_fld_id=lyt_fld_id,
         lyt_fld_name=lyt_fld_name,
         lyt_fld_key=lyt_fld_key,
@@ -46,7 +67,11 @@ async def get_all_layout_fields(
         limit=limit,
         order_by=order_by,
         order_desc=order_desc,
+        cursor=cursor,
+        with_total=with_total,
     )
+    set_page_headers(response, page)
+    return page
 
 
 @router.get(
@@ -70,6 +95,26 @@ async def search_field_for_word(
     return await ctx.data_source_layout_service.search(params=params)
 
 
+@router.get(
+    "/text-search/",
+    response_model=List[LayoutFieldsReturn],
+    status_code=http_status.HTTP_200_OK,
+)
+async def text_search_layout_fields(
+    *,
+    q: str = Query(..., min_length=1, description=TEXT_SEARCH_DESCRIPTION),
+    offset: int = 0,
+    limit: int = 10,
+    with_total: Optional[TotalCount] = None,
+    response: Response,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    page = await ctx.layout_fields_service.text_search(q, offset=offset, limit=limit, with_total=with_total)
+    set_page_headers(response, page)
+    return page
+
+
 @router.get(
     "/{lyt_fld_id}",
     response_model=LayoutFieldsReturn,
@@ -137,11 +182,11 @@ async def update_layout_fields(
     else:
         layout_fields.lyt_fld_desc = current_layout_field.lyt_fld_desc
 
+    # Unchanged name and description keep the stored (deferred) embedding,
+    # update() skips fields left as None
     if updated_fields:
         embedding = await get_text_embedding(layout_fields.lyt_fld_name, layout_fields.lyt_fld_desc)
         layout_fields.lyt_fld_embedding = embedding
-    else:
-        layout_fields.lyt_fld_embedding = current_layout_field.lyt_fld_embedding
 
     return await ctx.layout_fields_service.update(lyt_fld_id, layout_fields, authorized=authorized)
 
@@ -3,17 +3,19 @@ from datetime import datetime
 from typing import List, Optional
 from urllib.parse import parse_qs
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi import status as http_status
 from fastapi.responses import StreamingResponse
 
 from app.api.deps import get_context
 from app.core.context import Context
+from app.enums.pagination import TotalCount
 from app.enums.flow import SchemaTypes
 from app.enums.pipeline import ParameterType
 from app.exceptions.bh_project import BHProjectDoesNotExist
 from app.exceptions.pipeline import PipelineAlreadyExists, PipelineDoesNotExist, SchemaDoesNotExist
 from app.models.base import StatusMessage
+from app.models.schema import SchemaValidationResult
 from app.models.pipelines import (PipelineBase, PipelineConfigBase, PipelineConnectionCreate, PipelineConnectionReturn, PipelineConnectionUpdate, PipelineCreate, PipelineUpdate, PipelineReturn, 
                                   PipelineDefinition,
                                   PipelineDefinitionCreate,
@@ -25,9 +27,12 @@ from app.models.pipelines import (PipelineBase, PipelineConfigBase, PipelineConn
                                   )
 from app.services.aws import AWSS3Service
 from app.services.pipelines import PipelineDebugService, PipelineLogService
+from app.utils.arrow_stream import ARROW_STREAM_MEDIA_TYPE, NDJSON_MEDIA_TYPE, prefetch, to_arrow_stream, to_ndjson
 from app.utils.bh_project import generate_github_secret_name
 from app.utils.pipeline_utils import(create_pipeline_release_version, validate_pipeline_name)
 from app.utils.auth_wrapper import authorize
+from app.utils.pagination import CURSOR_DESCRIPTION, set_page_headers
+from app.utils.search_utils import TEXT_SEARCH_DESCRIPTION
 from app.utils.git_utils.git_utils import extract_secret_name
 from app.utils.normalization import normalise_name
 from app.utils.data_source_utils import get_text_embedding
@@ -52,10 +57,13 @@ async def get_all_pipelines(
         description="Field to order by, e.g., 'pipeline_name', 'pipeline_description'",
     ),
     order_desc: bool = False,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    with_total: Optional[TotalCount] = None,
+    response: Response,
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
-    return await ctx.pipeline_service.list(
+    page = await ctx.pipeline_service.list(
         pipeline_id=pipeline_id,
         pipeline_name=pipeline_name,
         bh_project_id=bh_project_id,
@@ -63,7 +71,11 @@ async def get_all_pipelines(
         limit=limit,
         order_by=order_by,
         order_desc=order_desc,
+        cursor=cursor,
+        with_total=with_total,
     )
+    set_page_headers(response, page)
+    return page
 
 
 @router.get(
@@ -88,6 +100,26 @@ async def search_field_for_word(
     return await ctx.pipeline_service.search(params=params)
 
 
+@router.get(
+    "/text-search/",
+    response_model=List[PipelineReturn],
+    status_code=http_status.HTTP_200_OK,
+)
+async def text_search_pipelines(
+    *,
+    q: str = Query(..., min_length=1, description=TEXT_SEARCH_DESCRIPTION),
+    offset: int = 0,
+    limit: int = 10,
+    with_total: Optional[TotalCount] = None,
+    response: Response,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    page = await ctx.pipeline_service.text_search(q, offset=offset, limit=limit, with_total=with_total)
+    set_page_headers(response, page)
+    return page
+
+
 @router.get(
     "/{pipeline_id}",
     response_model=PipelineReturn,
@@ -701,15 +733,14 @@ async def delete_pipeline_version_by_id(
 
 @router.get(
     "/validate/{pipeline_id}/",
-    response_model=PipelineValidationErrorReturn,
+    response_model=SchemaValidationResult,
     status_code=http_status.HTTP_200_OK,
 )
 async def validate_pipeline(
-    *, pipeline_id: int, ctx: Context = Depends(get_context),
+    *, pipeline_id: int, schema_id: Optional[int] = None, ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
-    # TODO: validate json
-    return await ctx.pipeline_service.validate_pipeline(pipeline_id)
+    return await ctx.pipeline_service.validate_pipeline(pipeline_id, schema_id=schema_id)
 
 
 @router.post(
@@ -881,6 +912,68 @@ async def get_transformation_output(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+        "/debug/stream_transformation_output",
+        status_code=http_status.HTTP_200_OK,
+)
+async def stream_transformation_output(
+    pipeline_id: Optional[int] = None,
+    pipeline_name: Optional[str] = None,
+    transformation_name: str = Query(...),
+    page: int = Query(...),
+    page_size: int = Query(...),
+    sort_columns: List[str] = Query([]),
+    format: str = Query('ndjson', regex='^(ndjson|arrow)$'),
+    output_name: Optional[str] = Query(None, description="Output sent with format=arrow, the first one by default"),
+    host:str = 'host.docker.internal',
+    port:int = 15003,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    """ Transformation output relayed batch by batch as the debug server streams it:
+        NDJSON with one line of columns per batch, or an Arrow IPC stream of one output."""
+    try:
+
+        if not authorized:
+            raise HTTPException(
+                status_code=http_status.HTTP_403_FORBIDDEN,
+                detail="Unauthorized access."
+            )
+
+        if pipeline_id:
+            pipeline = await ctx.pipeline_service.get_pipeline(pipeline_id)
+            if not pipeline:
+                raise HTTPException(
+                    status_code=http_status.HTTP_404_NOT_FOUND,
+                    detail=f"Pipeline with ID {pipeline_id} not found."
+                )
+            pipeline_name = pipeline.pipeline_name
+
+        if not pipeline_name:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Either pipeline_id or pipeline_name must be provided."
+            )
+
+        # Don't hold a pooled DB connection while the batches are relayed
+        await ctx.release_db_session()
+
+        pipeline_debug_service = PipelineDebugService(host, port)
+        await pipeline_debug_service.connect()
+        batches = pipeline_debug_service.stream_transformation_output(
+            pipeline_name, transformation_name, page, page_size, sort_columns
+        )
+        # A server error or timeout before the first batch is still answered with its status code
+        batches = await prefetch(batches)
+        if format == 'arrow':
+            return StreamingResponse(to_arrow_stream(batches, output_name), media_type=ARROW_STREAM_MEDIA_TYPE)
+        return StreamingResponse(to_ndjson(batches), media_type=NDJSON_MEDIA_TYPE)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get(
         "/debug/get_transformation_count",
         status_code=http_status.HTTP_200_OK,
@@ -921,6 +1014,20 @@ async def get_transformation_count(pipeline_id: Optional[int] = None,
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+        "/debug/health",
+        status_code=http_status.HTTP_200_OK,
+)
+async def pipeline_debug_health(
+    host: str = 'host.docker.internal',
+    port: int = 15003,
+    authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
+):
+    """Whether the pipeline debug server accepts connections, checked on the shared channel."""
+    pipeline_debug_service = PipelineDebugService(host, port)
+    return {"healthy": await pipeline_debug_service.is_healthy()}
+
+
 @router.post(
     "/run-next-checkpoint",
     status_code=http_status.HTTP_200_OK,
@@ -971,6 +1078,7 @@ async def stream_logs(
     pipeline_name: Optional[str] = None,
     host:str = 'host.docker.internal',
     port:int = 15003,
+    ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize('admin_module', 'view'))
 ):
     try:
@@ -995,8 +1103,12 @@ async def stream_logs(
                 status_code=http_status.HTTP_400_BAD_REQUEST,
                 detail="Either pipeline_id or pipeline_name must be provided."
             )
-        
+
+        # The stream can stay open for minutes, don't hold a pooled DB connection for it
+        await ctx.release_db_session()
+
         pipeline_log_service = PipelineLogService(host, port)
+        await pipeline_log_service.connect()
         log_generator = pipeline_log_service.stream_logs(pipeline_name)
 
         async def event_generator():
@@ -73,7 +73,7 @@ async def get_release_bundle(
     ctx: Context = Depends(get_context),
     authorized: Optional[dict] = Depends(authorize("admin_module", "view")),
 ):
-    response = await ctx.release_bundle_service.get(id=bh_bundle_id)
+    response = await ctx.release_bundle_service.get(id=bh_bundle_id, profile="detail")
     return response
     
 @router.post(
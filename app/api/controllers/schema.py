@@ -11,7 +11,7 @@ from app.api.deps import get_context
 from app.core.context import Context
 from app.enums.flow import SchemaTypes
 from app.models.base import StatusMessage
-from app.models.schema import Schema, SchemaCreate, SchemaReturn, SchemaUpdate
+from app.models.schema import Schema, SchemaCreate, SchemaReturn, SchemaUpdate, SchemaValidationRequest, SchemaValidationResult
 import json
 
 router = APIRouter()
@@ -181,3 +181,24 @@ async def get_repo_branc_list(
         return {"tags": result}
     else:
         return result['message']
+
+
+@router.post(
+    "/validate",
+    response_model=List[SchemaValidationResult],
+    status_code=http_status.HTTP_200_OK,
+)
+async def validate_documents(
+    *,
+    obj: SchemaValidationRequest,
+    ctx: Context = Depends(get_context),
+    authorized: Optional[dict] = Depends(authorize("admin_module", "view"))
+):
+    """ Validate a batch of pipeline JSONs or flowJsons against one schema and
+        return every error of each document."""
+    return await ctx.schema_validation_service.validate(
+        obj.documents,
+        obj.schema_type,
+        schema_id=obj.schema_id,
+        version_tag=obj.version_tag,
+    )
@@ -0,0 +1,19 @@
+from celery import Celery
+
+from app.core.config import Config
+
+RUN_JOB_TASK = "bh_catalog.run_job"
+
+# Start a worker with: celery -A app.celery_conf.celery_app worker --concurrency=2
+celery_app = Celery(
+    "bh_catalog",
+    broker=Config.CELERY_BROKER_URL,
+    include=["app.celery_conf.tasks"],
+)
+celery_app.conf.update(
+    # Progress lives in `bh_job`, a task lost with its worker is delivered again and resumes
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_ignore_result=True,
+)
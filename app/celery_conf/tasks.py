@@ -1,25 +1,112 @@
-from fastapi import Depends
-from app.api.deps import get_context
+import asyncio
+from typing import Dict, List
+
+from sqlalchemy import or_, select
+
+from app.celery_conf.celery_app import celery_app, RUN_JOB_TASK
 from app.core.context import Context
+from app.enums.job import JobItemStatus, JobType
+from app.models.data_source import DataSource
+from app.models.job import BHJob
+from app.services.job import JobService
+
 
-async def create_data_source_async(
-    bh_project_id, connection_config_id, schema, tables, create_description, authorized,  ctx: Context = Depends(get_context)
-):
-    """Handles the full pipeline of data source creation asynchronously."""
-    print("Creating data source and layout for each table")
-    created_data_sources, data_source_ids = await ctx.connection_config_service.create_data_source_and_layout_for_each_table(
-        connection_config_id=connection_config_id,
-        schema=schema,
-        tables=tables,
-        bh_project_id=bh_project_id,
-        authorized=authorized,
+async def import_catalog(ctx: Context, job: BHJob, tables: List[str]) -> Dict[str, dict]:
+    """ Import a chunk of source tables as data sources, then describe and embed them
+        when `create_description` is set. Tables imported by an earlier attempt
+        whose progress was not recorded are not imported twice."""
+    params = job.params
+    bh_project_id = params["bh_project_id"]
+    keys = {f"{bh_project_id}_{table}": table for table in tables}
+    result = await ctx.db_session.execute(
+        select(DataSource.data_src_key, DataSource.data_src_id)
+        .where(DataSource.connection_config_id == params["connection_config_id"])
+        .where(DataSource.data_src_key.in_(list(keys)))
+        .where(or_(DataSource.is_deleted == False, DataSource.is_deleted == None))
     )
+    data_source_ids = {keys[key]: data_src_id for key, data_src_id in result.all()}
+
+    new_tables = [table for table in tables if table not in data_source_ids]
+    if new_tables:
+        created_data_sources, _ = await ctx.connection_config_service.create_data_source_and_layout_for_each_table(
+            connection_config_id=params["connection_config_id"],
+            schema=params["schema"],
+            tables=new_tables,
+            bh_project_id=bh_project_id,
+            authorized=params.get("authorized"),
+        )
+        data_source_ids.update({created["table"]: created["data_src_id"] for created in created_data_sources})
+
+    finished = {
+        table: {"status": JobItemStatus.DONE.value, "data_src_id": data_source_ids[table]}
+        for table in tables if table in data_source_ids
+    }
+    if params.get("create_description") and finished:
+        ids = [state["data_src_id"] for state in finished.values()]
+        try:
+            await ctx.data_source_service.create_description(request=ids)
+            await ctx.data_source_service.update_embeddings(request=ids)
+        except Exception as e:
+            # The tables are in the catalog, keep them done and report what is missing
+            await ctx.db_session.rollback()
+            for state in finished.values():
+                state["warning"] = f"Description or embeddings not created: {getattr(e, 'detail', None) or e}"
+    return finished
+
+
+async def generate_descriptions(ctx: Context, job: BHJob, data_source_ids: List[str]) -> Dict[str, dict]:
+    response = await ctx.data_source_service.create_description(request=[int(id) for id in data_source_ids])
+    described = {str(id) for id in response.get("results", {})}
+    return {
+        id: {"status": JobItemStatus.DONE.value} if id in described
+        else {"status": JobItemStatus.FAILED.value, "error": "No description generated"}
+        for id in data_source_ids
+    }
 
-    if create_description:
-        await ctx.data_source_service.create_description(request=data_source_ids)
-        await ctx.data_source_service.update_embeddings(request=data_source_ids)
 
+async def update_embeddings(ctx: Context, job: BHJob, data_source_ids: List[str]) -> Dict[str, dict]:
+    response = await ctx.data_source_service.update_embeddings(request=[int(id) for id in data_source_ids])
+    embedded = {str(id) for id in response.get("results", {})}
     return {
-        "message": "Data source and layouts created successfully",
-        "tables": tables,
+        id: {"status": JobItemStatus.DONE.value} if id in embedded
+        else {"status": JobItemStatus.SKIPPED.value, "reason": "No description or relationships to embed"}
+        for id in data_source_ids
     }
+
+
+JobService.handlers = {
+    JobType.IMPORT_CATALOG: import_catalog,
+    JobType.GENERATE_DESCRIPTIONS: generate_descriptions,
+    JobType.UPDATE_EMBEDDINGS: update_embeddings,
+}
+
+
+async def execute_job(job_id: int) -> None:
+    """Run a job with its own context, independent of any request."""
+    async with Context() as ctx:
+        await ctx.job_service.run(job_id)
+
+
+async def release_job(job_id: int) -> None:
+    async with Context() as ctx:
+        await ctx.job_service.release(job_id)
+
+
+async def _execute_in_worker(job_id: int) -> None:
+    from app.db.base import engine
+    from app.utils.agent_client import agent_client
+    from app.utils.embedding_client import embedding_client
+    from app.utils.source_pool import source_pools
+    try:
+        await execute_job(job_id)
+    finally:
+        # Every task gets a new event loop, pooled connections must not outlive it
+        await embedding_client.aclose()
+        await agent_client.aclose()
+        await source_pools.close_all()
+        await engine.dispose()
+
+
+@celery_app.task(name=RUN_JOB_TASK)
+def run_job(job_id: int) -> None:
+    asyncio.run(_execute_in_worker(job_id))
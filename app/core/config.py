@@ -22,7 +22,10 @@ class ConfigHelper:
 
         if value is None:
             value = default
-        
+
+        if factory is not None and value is not None:
+            value = factory(value)
+
         return value
     
     @staticmethod
@@ -33,6 +36,12 @@ class ConfigHelper:
             return value.split(delimiter)
         return inner
 
+    @staticmethod
+    def parse_bool(value: Union[str, bool]) -> bool:
+        if isinstance(value, bool):
+            return value
+        return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
 class Config:
     load_dotenv(verbose=True)
 
@@ -54,6 +63,66 @@ class Config:
     AZURE_REPOS_PROVIDER_BASE_URL: str = cfg.get('AZURE_REPOS_PROVIDER_BASE_URL')
     BITBUCKET_PROVIDER_BASE_URL: str = cfg.get('BITBUCKET_PROVIDER_BASE_URL')
 
+    # Authorization caches
+    AUTH_IDENTITY_CACHE_TTL: int = cfg.get('AUTH_IDENTITY_CACHE_TTL', default=300, factory=int)
+    AUTH_IDENTITY_CACHE_SIZE: int = cfg.get('AUTH_IDENTITY_CACHE_SIZE', default=4096, factory=int)
+    AUTH_TOKEN_CACHE_SIZE: int = cfg.get('AUTH_TOKEN_CACHE_SIZE', default=4096, factory=int)
+
+    # Git provider HTTP client, shared by every GitWrapper
+    GIT_HTTP_TIMEOUT: float = cfg.get('GIT_HTTP_TIMEOUT', default=30, factory=float)
+    GIT_HTTP_MAX_CONNECTIONS: int = cfg.get('GIT_HTTP_MAX_CONNECTIONS', default=20, factory=int)
+    # Git reads cache, content at a commit SHA is kept in memory and under GIT_CONTENT_CACHE_DIR (empty for memory only)
+    GIT_CONTENT_CACHE_DIR: str = cfg.get('GIT_CONTENT_CACHE_DIR', default='/tmp/bh-catalog/git-cache')
+    GIT_CONTENT_CACHE_SIZE: int = cfg.get('GIT_CONTENT_CACHE_SIZE', default=1024, factory=int)
+    # Size cap (MB) and age limit (seconds) of the on-disk copy, least recently read files are removed first
+    GIT_CONTENT_CACHE_MAX_MB: int = cfg.get('GIT_CONTENT_CACHE_MAX_MB', default=512, factory=int)
+    GIT_CONTENT_CACHE_MAX_AGE: int = cfg.get('GIT_CONTENT_CACHE_MAX_AGE', default=7 * 24 * 3600, factory=int)
+    # Seconds a tag / branch is assumed to point to the same commit
+    GIT_REF_CACHE_TTL: int = cfg.get('GIT_REF_CACHE_TTL', default=60, factory=int)
+
+    # Airflow dag run statuses, cached and shared by polling clients and status streams
+    AIRFLOW_STATUS_TTL: float = cfg.get('AIRFLOW_STATUS_TTL', default=5, factory=float)
+    AIRFLOW_TERMINAL_STATUS_TTL: float = cfg.get('AIRFLOW_TERMINAL_STATUS_TTL', default=3600, factory=float)
+    AIRFLOW_MAX_CONCURRENCY: int = cfg.get('AIRFLOW_MAX_CONCURRENCY', default=8, factory=int)
+    AIRFLOW_STATUS_CACHE_SIZE: int = cfg.get('AIRFLOW_STATUS_CACHE_SIZE', default=4096, factory=int)
+    AIRFLOW_WATCH_MAX_FAILURES: int = cfg.get('AIRFLOW_WATCH_MAX_FAILURES', default=3, factory=int)
+
+    # JSON schema validation of pipelines / flows, compiled validators kept per schema version
+    SCHEMA_VALIDATOR_CACHE_SIZE: int = cfg.get('SCHEMA_VALIDATOR_CACHE_SIZE', default=64, factory=int)
+    SCHEMA_VALIDATION_MAX_ERRORS: int = cfg.get('SCHEMA_VALIDATION_MAX_ERRORS', default=100, factory=int)
+
+    # Per request cost (DB, outbound calls, serialization) as a Server-Timing header and a log line,
+    # at INFO for requests of at least REQUEST_METRICS_LOG_MIN_MS and at DEBUG for the others
+    REQUEST_METRICS_ENABLED: bool = cfg.get('REQUEST_METRICS_ENABLED', default=True, factory=ConfigHelper.parse_bool)
+    REQUEST_METRICS_LOG_MIN_MS: float = cfg.get('REQUEST_METRICS_LOG_MIN_MS', default=1000, factory=float)
+
+    # Rows fetched per round trip by the NDJSON list / export streams
+    STREAM_BATCH_SIZE: int = cfg.get('STREAM_BATCH_SIZE', default=500, factory=int)
+
+    # Airflow DAG deployment, failed uploads remembered per DAG file for the status endpoint
+    DAG_DEPLOY_MAX_TARGETS: int = cfg.get('DAG_DEPLOY_MAX_TARGETS', default=1024, factory=int)
+
+    # gRPC channels to the pipeline debug / log servers
+    GRPC_MAX_CHANNELS: int = cfg.get('GRPC_MAX_CHANNELS', default=16, factory=int)
+    GRPC_CONNECT_TIMEOUT: float = cfg.get('GRPC_CONNECT_TIMEOUT', default=5, factory=float)
+    GRPC_CALL_TIMEOUT: float = cfg.get('GRPC_CALL_TIMEOUT', default=60, factory=float)
+    # Deadline of a whole server stream (e.g. transformation output), 0 for none
+    GRPC_STREAM_TIMEOUT: float = cfg.get('GRPC_STREAM_TIMEOUT', default=1800, factory=float)
+    # Pings only while calls are open, servers reject intervals under 5 minutes by default
+    GRPC_KEEPALIVE_TIME: int = cfg.get('GRPC_KEEPALIVE_TIME', default=300, factory=int)
+    GRPC_KEEPALIVE_TIMEOUT: int = cfg.get('GRPC_KEEPALIVE_TIMEOUT', default=10, factory=int)
+    # Attempts per call on UNAVAILABLE, including the first one
+    GRPC_MAX_ATTEMPTS: int = cfg.get('GRPC_MAX_ATTEMPTS', default=3, factory=int)
+
+    # Reference data cache (codes, DQ types, platform regions, latest schemas)
+    REFERENCE_CACHE_TTL: int = cfg.get('REFERENCE_CACHE_TTL', default=300, factory=int)
+    # Optional, e.g. redis://redis:6379/0, publishes invalidations to every API worker
+    REFERENCE_CACHE_REDIS_URL: str = cfg.get('REFERENCE_CACHE_REDIS_URL')
+
+    # AWS / GCP secret values cache, 0 TTL disables it
+    SECRETS_CACHE_TTL: int = cfg.get('SECRETS_CACHE_TTL', default=300, factory=int)
+    SECRETS_CACHE_SIZE: int = cfg.get('SECRETS_CACHE_SIZE', default=512, factory=int)
+
     CORS_ALLOW_ORIGINS: List = cfg.get('CORS_ALLOW_ORIGINS', default=['*'], factory=ConfigHelper.parse_list())
 
     SQLALCHEMY_DATABASE_URI: URL = URL(
@@ -63,9 +132,73 @@ class Config:
         host=cfg.get('POSTGRES_HOST', 'localhost'),
         port=cfg.get('POSTGRES_PORT', '5432'),
         database=cfg.get('POSTGRES_DB'),
-        query={},
+        query={
+            # SQLAlchemy side prepared statement cache of the asyncpg dialect
+            'prepared_statement_cache_size': cfg.get('DB_STATEMENT_CACHE_SIZE', default='100'),
+        },
     )
 
+    # Catalog DB connection pool
+    DB_ECHO: bool = cfg.get('DB_ECHO', default=False, factory=ConfigHelper.parse_bool)
+    DB_POOL_SIZE: int = cfg.get('DB_POOL_SIZE', default=10, factory=int)
+    DB_MAX_OVERFLOW: int = cfg.get('DB_MAX_OVERFLOW', default=10, factory=int)
+    DB_POOL_TIMEOUT: int = cfg.get('DB_POOL_TIMEOUT', default=30, factory=int)
+    DB_POOL_RECYCLE: int = cfg.get('DB_POOL_RECYCLE', default=1800, factory=int)
+    # A ping per pool checkout, i.e. a round trip per request. DB_POOL_RECYCLE already replaces
+    # old connections, turn it on only when idle connections get dropped sooner (firewalls, failovers)
+    DB_POOL_PRE_PING: bool = cfg.get('DB_POOL_PRE_PING', default=False, factory=ConfigHelper.parse_bool)
+    DB_CONNECT_TIMEOUT: int = cfg.get('DB_CONNECT_TIMEOUT', default=10, factory=int)
+    # asyncpg statement cache per connection, set to 0 behind pgbouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = cfg.get('DB_STATEMENT_CACHE_SIZE', default=100, factory=int)
+    DB_APPLICATION_NAME: str = cfg.get('DB_APPLICATION_NAME', default='bh-catalog-api')
+    DB_STATEMENT_TIMEOUT_MS: int = cfg.get('DB_STATEMENT_TIMEOUT_MS', default=0, factory=int)
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = cfg.get('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', default=60000, factory=int)
+
+    # Vector search (pgvector HNSW indexes)
+    VECTOR_EF_SEARCH: int = cfg.get('VECTOR_EF_SEARCH', default=100, factory=int)
+    VECTOR_SEARCH_CANDIDATES: int = cfg.get('VECTOR_SEARCH_CANDIDATES', default=50, factory=int)
+    # pgvector >= 0.8 only, e.g. 'relaxed_order' to keep scanning when filters drop candidates
+    VECTOR_ITERATIVE_SCAN: str = cfg.get('VECTOR_ITERATIVE_SCAN')
+    # Cosine distance cut off of the per-field vector search. The embeddings are two
+    # concatenated unit vectors (norm sqrt(2)), so L2 < 0.8 is cosine distance < 0.16
+    VECTOR_MAX_DISTANCE: float = cfg.get('VECTOR_MAX_DISTANCE', default=0.16, factory=float)
+
+    # Embedding service client
+    EMBEDDING_SERVICE_URL: str = cfg.get('EMBEDDING_SERVICE_URL', default='http://agent-ai-app:8090/api/embedding/get_text_embedding')
+    # Part of the cache key, change it when the service switches models
+    EMBEDDING_MODEL: str = cfg.get('EMBEDDING_MODEL', default='default')
+    EMBEDDING_BATCH_SIZE: int = cfg.get('EMBEDDING_BATCH_SIZE', default=64, factory=int)
+    EMBEDDING_MAX_CONCURRENCY: int = cfg.get('EMBEDDING_MAX_CONCURRENCY', default=4, factory=int)
+    EMBEDDING_TIMEOUT: float = cfg.get('EMBEDDING_TIMEOUT', default=60, factory=float)
+    EMBEDDING_CACHE_SIZE: int = cfg.get('EMBEDDING_CACHE_SIZE', default=4096, factory=int)
+    EMBEDDING_CACHE_TTL: int = cfg.get('EMBEDDING_CACHE_TTL', default=3600, factory=int)
+
+    # BH AI agent client (description generation), BH_AI_AGENT_URL is the endpoint
+    AI_AGENT_MAX_CONCURRENCY: int = cfg.get('AI_AGENT_MAX_CONCURRENCY', default=8, factory=int)
+    AI_AGENT_TIMEOUT: float = cfg.get('AI_AGENT_TIMEOUT', default=120, factory=float)
+    AI_AGENT_RETRIES: int = cfg.get('AI_AGENT_RETRIES', default=2, factory=int)
+    AI_AGENT_RETRY_BACKOFF: float = cfg.get('AI_AGENT_RETRY_BACKOFF', default=1.0, factory=float)
+
+    # Source database pools (catalog browsing and imports), one per connection config
+    SOURCE_POOL_MAX_POOLS: int = cfg.get('SOURCE_POOL_MAX_POOLS', default=32, factory=int)
+    SOURCE_POOL_MAX_SIZE: int = cfg.get('SOURCE_POOL_MAX_SIZE', default=5, factory=int)
+    # Seconds before an idle connection, and a pool nobody used, is closed
+    SOURCE_POOL_IDLE_TIMEOUT: int = cfg.get('SOURCE_POOL_IDLE_TIMEOUT', default=300, factory=int)
+
+    # Background jobs (catalog imports, descriptions, embeddings)
+    # `local` runs jobs on an asyncio pool of the API process, `celery` sends them to Celery workers
+    JOB_BACKEND: str = cfg.get('JOB_BACKEND', default='local')
+    JOB_CHUNK_SIZE: int = cfg.get('JOB_CHUNK_SIZE', default=25, factory=int)
+    JOB_LOCAL_CONCURRENCY: int = cfg.get('JOB_LOCAL_CONCURRENCY', default=2, factory=int)
+    # A running job without heartbeat for this long is picked up again
+    JOB_STALE_AFTER: int = cfg.get('JOB_STALE_AFTER', default=900, factory=int)
+    # Seconds between heartbeats of a running job, also refreshed while a chunk runs; keep well below JOB_STALE_AFTER
+    JOB_HEARTBEAT_INTERVAL: float = cfg.get('JOB_HEARTBEAT_INTERVAL', default=60, factory=float)
+    # Seconds between sweeps dispatching stale jobs again, 0 only resumes them at startup
+    JOB_RECLAIM_INTERVAL: int = cfg.get('JOB_RECLAIM_INTERVAL', default=300, factory=int)
+    JOB_EVENTS_INTERVAL: float = cfg.get('JOB_EVENTS_INTERVAL', default=1.0, factory=float)
+    CELERY_BROKER_URL: str = cfg.get('CELERY_BROKER_URL')
+
     CLOUD_TYPE: str = cfg.get('CLOUD_TYPE', default='AWS')
     ENVIRONMENT: str = cfg.get('ENVIRONMENT')
     DB_SCHEMA: str = cfg.get('DB_SCHEMA', default='catalogdb')
@@ -1,5 +1,4 @@
 from app.db.base import AsyncSessionLocal
-from app.core.config import Config
 
 class Context:
     def __init__(self):
@@ -56,6 +55,7 @@ class Context:
         self._pipeline_config_service = None
         self._pipeline_version_service = None
         self._schema_service = None
+        self._schema_validation_service = None
         self._flow_defination_service = None
         self._flow_version_service = None
         self._flow_config_service = None
@@ -63,11 +63,12 @@ class Context:
         self._release_bundle_service = None
         self._pipeline_connection_service = None
         self._pipeline_parameter_service = None
+        self._job_service = None
+        self._reference_data_service = None
         
     async def __aenter__(self):
-        # Create a new AsyncSession instance when entering the context
-        self._db_session = AsyncSessionLocal()
-        await self._db_session.execute(f"SET search_path TO {Config.DB_SCHEMA}")
+        # The AsyncSession is created lazily by `db_session`, so requests
+        # which never touch the catalog DB never check out a connection.
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -83,15 +84,31 @@ class Context:
             print(exc_val)
             print(exc_tb)
         # Close the session when exiting the context
-        await self._db_session.close()
+        await self.release_db_session()
 
     @property
     def db_session(self):
-        # This property now simply returns the session without being async
+        # Lazy initialization of the session. The pooled connection itself is
+        # only checked out by the first statement and is handed back to the
+        # pool when the transaction commits or rolls back.
+        if self._db_session is None:
+            self._db_session = AsyncSessionLocal()
         return self._db_session
-    
+
+    @db_session.setter
+    def db_session(self, session):
+        self._db_session = session
+
     def set_db_session(self, session):
         self._db_session = session
+
+    async def release_db_session(self):
+        """ Close the request session and return its connection to the pool.
+            Long lived responses (streams) call this once their DB work is done,
+            any later access to `db_session` opens a new session."""
+        if self._db_session is not None:
+            session, self._db_session = self._db_session, None
+            await session.close()
     
     @property
     def bh_project_service(self) -> 'BHProjectService':
@@ -435,6 +452,13 @@ class Context:
             self._schema_service = SchemaService(self)
         return self._schema_service
 
+    @property
+    def schema_validation_service(self) -> 'SchemaValidationService':
+        # Lazy initialization of the service
+        if self._schema_validation_service is None:
+            self._schema_validation_service = SchemaValidationService(self)
+        return self._schema_validation_service
+
     @property
     def flow_defination_service(self) -> 'FlowDefinitionService':
         # Lazy initialization of the service
@@ -476,6 +500,20 @@ class Context:
         if self._pipeline_parameter_service is None:
             self._pipeline_parameter_service = PipelineParameterService(self)
         return self._pipeline_parameter_service
+
+    @property
+    def job_service(self) -> 'JobService':
+        # Lazy initialization of the service
+        if self._job_service is None:
+            self._job_service = JobService(self)
+        return self._job_service
+
+    @property
+    def reference_data_service(self) -> 'ReferenceDataService':
+        # Lazy initialization of the service
+        if self._reference_data_service is None:
+            self._reference_data_service = ReferenceDataService(self)
+        return self._reference_data_service
     
 
 # To Avoid Circular Imports added at the end
@@ -502,5 +540,7 @@ from app.services.aws import AthenaQueryService,TestConnectionService,SnowflakeC
 from app.services.connection_registry import ConnectionRegistryService, ConnectionConfigService
 from app.services.gcp import GCPService
 from app.services.flow import FlowService, FlowDeploymentService, FlowDefinitionService, FlowVersionService, FlowConfigService
-from app.services.schema import SchemaService
+from app.services.schema import SchemaService, SchemaValidationService
 from app.services.release_bundle import BHReleaseBundleService
+from app.services.job import JobService
+from app.services.reference_data import ReferenceDataService
@@ -1,6 +1,10 @@
+import time
+
 from app.core.config import Config
+from app.utils.request_metrics import record
 from typing import AsyncIterator
 
+from sqlalchemy import event
 from sqlmodel import create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession, AsyncEngine
 
@@ -8,11 +12,61 @@ from sqlalchemy.orm import sessionmaker
 
 config = Config()
 
-engine = AsyncEngine(create_engine(config.SQLALCHEMY_DATABASE_URI, echo=True, future=True))
+
+def get_connect_args(cfg: Config) -> dict:
+    """ Build the asyncpg connect arguments.
+        `server_settings` are sent in the startup packet of every new physical
+        connection, so `search_path` and the other session settings cost no
+        extra round trip per request.
+    Args:
+        cfg: Config: Application config"""
+    server_settings = {
+        'search_path': cfg.DB_SCHEMA,
+        'application_name': cfg.DB_APPLICATION_NAME,
+    }
+    if cfg.DB_STATEMENT_TIMEOUT_MS:
+        server_settings['statement_timeout'] = str(cfg.DB_STATEMENT_TIMEOUT_MS)
+    if cfg.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS:
+        server_settings['idle_in_transaction_session_timeout'] = str(cfg.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS)
+
+    return {
+        'server_settings': server_settings,
+        'statement_cache_size': cfg.DB_STATEMENT_CACHE_SIZE,
+        'timeout': cfg.DB_CONNECT_TIMEOUT,
+    }
+
+
+def get_engine_options(cfg: Config) -> dict:
+    """ Pool settings for the catalog engine, all tunable through `Config`."""
+    return {
+        'echo': cfg.DB_ECHO,
+        'future': True,
+        'pool_size': cfg.DB_POOL_SIZE,
+        'max_overflow': cfg.DB_MAX_OVERFLOW,
+        'pool_timeout': cfg.DB_POOL_TIMEOUT,
+        'pool_recycle': cfg.DB_POOL_RECYCLE,
+        'pool_pre_ping': cfg.DB_POOL_PRE_PING,
+        'connect_args': get_connect_args(cfg),
+    }
+
+
+engine = AsyncEngine(create_engine(config.SQLALCHEMY_DATABASE_URI, **get_engine_options(config)))
+
+
+@event.listens_for(engine.sync_engine, 'before_cursor_execute')
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context.metrics_start = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, 'after_cursor_execute')
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    """Each statement counts as a `db` call of the current request, rows streamed later are not timed."""
+    record('db', time.perf_counter() - context.metrics_start)
+
+
 AsyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
 
 
 async def get_db() -> AsyncIterator[AsyncSession]:
     async with AsyncSessionLocal() as session:
-        print("called get_session")
         yield session
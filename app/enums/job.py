@@ -0,0 +1,23 @@
+from enum import Enum
+
+class JobType(str, Enum):
+    IMPORT_CATALOG = "import_catalog"
+    GENERATE_DESCRIPTIONS = "generate_descriptions"
+    UPDATE_EMBEDDINGS = "update_embeddings"
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class JobBackend(str, Enum):
+    LOCAL = "local"
+    CELERY = "celery"
+
+# Item states inside `BHJob.progress`
+class JobItemStatus(str, Enum):
+    DONE = "done"
+    SKIPPED = "skipped"
+    FAILED = "failed"
@@ -0,0 +1,5 @@
+from enum import Enum
+
+class TotalCount(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
@@ -53,3 +53,9 @@ class CreateException(BaseHTTPException):
     status_code = status.HTTP_400_BAD_REQUEST 
     message = 'Creation failed: {error}'
     error_code = 'CREATE_ERROR'
+
+
+class InvalidCursor(BaseHTTPException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    message = 'Invalid pagination cursor: {cursor!r}'
+    error_code = 'INVALID_CURSOR'
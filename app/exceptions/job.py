@@ -0,0 +1,14 @@
+from fastapi import status
+from app.exceptions import BaseHTTPException
+
+
+class JobNotFound(BaseHTTPException):
+    status_code = status.HTTP_404_NOT_FOUND
+    message = 'Job [{job_id}] does not exist.'
+    error_code = 'JOB_NOT_FOUND'
+
+
+class JobStateConflict(BaseHTTPException):
+    status_code = status.HTTP_409_CONFLICT
+    message = 'Job [{job_id}] is {status}, it cannot be {action}.'
+    error_code = 'JOB_STATE_CONFLICT'
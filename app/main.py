@@ -5,9 +5,22 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from app.api import api_router
+from app.core.config import Config
+from app.core.context import Context
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.exceptions import BaseHTTPException
+from app.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.utils.agent_client import agent_client
+from app.utils.dag_deployment import DAG_DEPLOYMENT_HEADER, DAG_FINGERPRINT_HEADER, dag_deployer
+from app.utils.embedding_client import embedding_client
+from app.utils.git_utils.http_client import git_http_client
+from app.utils.grpc_channels import grpc_channels
+from app.utils.job_utils import get_job_backend, job_reclaimer, resume_jobs
+from app.utils.json_utils import ORJSONResponse
+from app.utils.reference_cache import reference_cache
+from app.utils.request_metrics import SERVER_TIMING_HEADER, start_request
+from app.utils.source_pool import source_pools
 import sys
 sys.path.append("/usr/src/app/cluster-utils")
 
@@ -19,6 +32,7 @@ app = FastAPI(
             description="BH Catalog API is a RESTful API that provides endpoints to manage Metadata",
             version="1.0",
             debug=True,
+            default_response_class=ORJSONResponse,
         )
 
 @app.exception_handler(BaseHTTPException)
@@ -32,6 +46,37 @@ def base_exception_handler(request: Request, exc: BaseHTTPException):
         headers=exc.headers,
     )
 
+@app.on_event("startup")
+async def start_jobs():
+    try:
+        await resume_jobs()
+    except Exception:
+        logger.exception("Could not resume background jobs")
+    await job_reclaimer.start()
+
+@app.on_event("startup")
+async def load_reference_data():
+    await reference_cache.start()
+    try:
+        async with Context() as ctx:
+            await ctx.reference_data_service.warm()
+    except Exception:
+        # Loaded on first use instead
+        logger.exception("Could not load reference data")
+
+@app.on_event("shutdown")
+async def close_clients():
+    # DAG uploads still queued would be lost otherwise
+    await dag_deployer.drain(timeout=30)
+    await job_reclaimer.stop()
+    await get_job_backend().shutdown()
+    await embedding_client.aclose()
+    await agent_client.aclose()
+    await source_pools.close_all()
+    await reference_cache.stop()
+    await grpc_channels.close_all()
+    await git_http_client.aclose()
+
 app.include_router(
     api_router,
     prefix='/api/v1'
@@ -43,13 +88,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
     allow_headers=["*"],
+    expose_headers=[
+        NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, SERVER_TIMING_HEADER,
+        DAG_DEPLOYMENT_HEADER, DAG_FINGERPRINT_HEADER,
+    ],
 )
 
 @app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    print('Middleware is called')
+async def add_request_metrics(request: Request, call_next):
+    if not Config.REQUEST_METRICS_ENABLED:
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        return response
+
+    metrics = start_request()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
+    # Headers carry the cost until the response started, the log line includes streamed bodies
+    response.headers[SERVER_TIMING_HEADER] = metrics.server_timing()
+    response.headers["X-Process-Time"] = str(metrics.elapsed)
+
+    body_iterator = response.body_iterator
+
+    async def body_with_log():
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            # The route template groups requests of one endpoint
+            path = getattr(request.scope.get('route'), 'path', request.url.path)
+            metrics.log(request.method, path, response.status_code, Config.REQUEST_METRICS_LOG_MIN_MS)
+
+    response.body_iterator = body_with_log()
     return response
@@ -17,6 +17,7 @@ from .platform_region import PlatformRegion
 from .data_source import DataSource, DataSourceMetadata
 from .data_source_layout import DataSourceLayout
 from .layout_fields import LayoutFields
+from .embedding_cache import EmbeddingCache
 from .fld_dq_types import FieldDQTypes
 from .layout_fields_dq import LayoutFieldsDQ
 from .function_registry import FunctionRegistry
@@ -32,4 +33,5 @@ from .aws import AWSCredentials,SnowflakeCredentials
 from .connection_registry import ConnectionRegistry, ConnectionConfig
 from .flow import Flow
 from .schema import Schema
-from .release_bundle import BHReleaseBundle
\ No newline at end of file
+from .release_bundle import BHReleaseBundle
+from .job import BHJob
@@ -0,0 +1,21 @@
+from typing import List, Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class DagRunRef(SQLModel):
+    dag_id: str
+    dag_run_id: str
+
+
+class DagRunStatusRequest(SQLModel):
+    runs: List[DagRunRef] = Field(..., description="Dag runs to get the status of")
+
+
+class DagRunStatus(SQLModel):
+    dag_id: str
+    dag_run_id: str
+    state: Optional[str] = Field(default=None, description="Dag run state, None when it could not be read")
+    status_code: Optional[int] = Field(default=None, description="Status code of the Airflow REST API call")
+    run: Optional[dict] = Field(default=None, description="Dag run as returned by Airflow")
+    error: Optional[str] = None
@@ -3,11 +3,31 @@ from sqlmodel import SQLModel, Field, Column, DateTime
 from datetime import datetime
 from sqlalchemy.sql import func
 from sqlalchemy import text, Integer, ForeignKey, Column
+from sqlalchemy.orm import declared_attr, deferred
 from app.core.config import Config
 
 from typing import Optional
 from pydantic import EmailStr
 
+# Deferred load group of the pgvector embedding columns
+EMBEDDINGS_GROUP = "embeddings"
+
+
+def defer_embeddings(*column_names: str):
+    """ `__mapper_args__` for table models carrying pgvector columns.
+        The columns are deferred, so plain selects never fetch the vectors.
+        Load them explicitly with `undefer_group(EMBEDDINGS_GROUP)`."""
+    @declared_attr
+    def mapper_args(cls):
+        return {
+            "properties": {
+                name: deferred(cls.__table__.c[name], group=EMBEDDINGS_GROUP)
+                for name in column_names
+            }
+        }
+    return mapper_args
+
+
 class IDModel(SQLModel):
     id: int = Field(default=None, primary_key=True)
 
@@ -31,11 +31,11 @@ class BHProject(BHProjectBase, TimestampModel, table=True):
     __table_args__ = {'schema': Config.DB_SCHEMA}
 
     # Relationships with children
-    publish_details: List[PublishDetails] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "selectin"})
-    data_source: List["DataSource"] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "selectin"})
-    flow: List["Flow"] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "selectin"})
-    pipeline: List["Pipeline"] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "selectin"})
-    project_environment: List["ProjectEnvironment"] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "selectin"})
+    publish_details: List[PublishDetails] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "raise_on_sql"})
+    data_source: List["DataSource"] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "raise_on_sql"})
+    flow: List["Flow"] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "raise_on_sql"})
+    pipeline: List["Pipeline"] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "raise_on_sql"})
+    project_environment: List["ProjectEnvironment"] = Relationship(back_populates="bh_project", sa_relationship_kwargs={"lazy": "raise_on_sql"})
 
 class BHProjectCreate(SQLModel):
     bh_project_name: str = None
@@ -90,15 +90,15 @@ class ProjectEnvironment(ProjectEnvironmentBase, TimestampModel, table=True):
     __table_args__ = {'schema': Config.DB_SCHEMA}
 
     # Relationships with children
-    lake_zone: Optional["LakeZone"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"uselist": False, "lazy": "selectin"})
-    pre_configure_zone: Optional["PreConfigureZone"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"uselist": False, "lazy": "selectin"})
-    configure_lifecycle: Optional["ConfigureLifecycle"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"uselist": False, "lazy": "selectin"})
-    flow_connection: Optional["FlowConnection"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"uselist": False, "lazy": "selectin"})
-    flow_deployment: Optional["FlowDeployment"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"lazy": "selectin"})
+    lake_zone: Optional["LakeZone"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"uselist": False, "lazy": "raise_on_sql"})
+    pre_configure_zone: Optional["PreConfigureZone"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"uselist": False, "lazy": "raise_on_sql"})
+    configure_lifecycle: Optional["ConfigureLifecycle"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"uselist": False, "lazy": "raise_on_sql"})
+    flow_connection: Optional["FlowConnection"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"uselist": False, "lazy": "raise_on_sql"})
+    flow_deployment: Optional["FlowDeployment"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"lazy": "raise_on_sql"})
     bh_project: Optional["BHProject"] = Relationship(
-        back_populates="project_environment", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="project_environment", sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
-    pipeline_connection: Optional["PipelineConnection"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"lazy": "selectin"})
+    pipeline_connection: Optional["PipelineConnection"] = Relationship(back_populates="project_environment", sa_relationship_kwargs={"lazy": "raise_on_sql"})
 
 
 class ProjectEnvironmentCreate(SQLModel): 
@@ -7,7 +7,7 @@ from datetime import datetime
  
 from app.models.bh_project import BHProject
 from app.models.connection_registry import ConnectionConfig
-from app.models.base import TimestampModel
+from app.models.base import TimestampModel, defer_embeddings
 from app.models import LakeZone
 from app.core.config import Config
 from pgvector.sqlalchemy import Vector
@@ -37,8 +37,8 @@ class DataSourceBase(SQLModel):
     data_src_status: Optional[Status] = Field(default=Status.ACTIVE, nullable=True, description="Status of the project")
     # Foreign Keys
     lake_zone_id: int = Field(default=None, foreign_key=f"{Config.DB_SCHEMA}.lake_zone.lake_zone_id")
-    connection_config_id: int = Field(default=None, nullable=True, foreign_key=f"{Config.DB_SCHEMA}.bh_connection_config.id")
-    bh_project_id: int = Field(default=None, nullable=True, foreign_key=f"{Config.DB_SCHEMA}.bh_project.bh_project_id")
+    connection_config_id: int = Field(default=None, nullable=True, index=True, foreign_key=f"{Config.DB_SCHEMA}.bh_connection_config.id")
+    bh_project_id: int = Field(default=None, nullable=True, index=True, foreign_key=f"{Config.DB_SCHEMA}.bh_project.bh_project_id")
     owner: int = Field(default=None, nullable=True, foreign_key=f"{Config.DB_SCHEMA}.bh_user.bh_user_id")
  
     # Platform Managed Attributes
@@ -62,19 +62,20 @@ class DataSourceBase(SQLModel):
 class DataSource(DataSourceBase, TimestampModel, table=True):
     __tablename__ = "data_source"
     __table_args__ = {'schema': Config.DB_SCHEMA}
+    __mapper_args__ = defer_embeddings('data_src_embeddings', 'data_src_relationships_embeddings')
  
     # Relationships with Parent
-    lake_zone: Optional[LakeZone] = Relationship(sa_relationship_kwargs={"lazy": "selectin"})
-    connection_config: Optional[ConnectionConfig] = Relationship(sa_relationship_kwargs={"lazy": "selectin"})
-    bh_project: Optional[BHProject] = Relationship(sa_relationship_kwargs={"lazy": "selectin"})
+    lake_zone: Optional[LakeZone] = Relationship(sa_relationship_kwargs={"lazy": "raise_on_sql"})
+    connection_config: Optional[ConnectionConfig] = Relationship(sa_relationship_kwargs={"lazy": "raise_on_sql"})
+    bh_project: Optional[BHProject] = Relationship(sa_relationship_kwargs={"lazy": "raise_on_sql"})
     
     # Relationships with children
     data_source_metadata: Optional[List["DataSourceMetadata"]] = Relationship(
-        back_populates="data_source", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="data_source", sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
     
     data_source_layout: Optional[List["DataSourceLayout"]] = Relationship(
-        back_populates="data_source", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="data_source", sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
  
 # DTO models for creating and updating DataSource
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, DateTime, text
+from sqlmodel import SQLModel, Field
+
+from app.core.config import Config
+
+
+class EmbeddingCache(SQLModel, table=True):
+    """ Embeddings returned by the embedding service, keyed by a hash of the
+        model name and the input text (see app.utils.embedding_client)."""
+    __tablename__ = "embedding_cache"
+    __table_args__ = {'schema': Config.DB_SCHEMA}
+
+    text_hash: str = Field(primary_key=True, max_length=64, description="sha256 of the model and the text")
+    embedding: List[float] = Field(sa_column=Column(Vector(), nullable=False))
+    created_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=text("(CURRENT_TIMESTAMP AT TIME ZONE 'UTC')")
+        )
+    )
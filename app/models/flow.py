@@ -52,35 +52,35 @@ class Flow(FlowBase, TimestampModel, table=True):
 
     # relationship with Flowdeployment
     flow_deployment: Optional[List["FlowDeployment"]] = Relationship(
-        back_populates="flow", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="flow", sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
 
     flow_definition: Optional["FlowDefinition"] = Relationship(
         back_populates="flow",
-        sa_relationship_kwargs={"uselist": False, "lazy": "selectin"},
+        sa_relationship_kwargs={"uselist": False, "lazy": "raise_on_sql"},
     )
 
     # relationship with Project
     bh_project: Optional["BHProject"] = Relationship(
-        back_populates="flow", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="flow", sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
 
     # relationship with flow config
     flow_config: Optional["FlowConfig"] = Relationship(
-        back_populates="flow", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="flow", sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
 
     bh_bundle:Optional["BHReleaseBundle"] = Relationship(
-        back_populates="flow", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="flow", sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
     flow_version: Optional["FlowVersion"] = Relationship(
-        back_populates="flow", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="flow", sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
     # Relationship with UserDetail for created_by
     created_by_user: Optional["UserDetail"] = Relationship(
         sa_relationship_kwargs={
             "primaryjoin": "Flow.created_by == UserDetail.user_detail_id",
-            "lazy": "selectin",
+            "lazy": "raise_on_sql",
         }
     )
 
@@ -88,7 +88,7 @@ class Flow(FlowBase, TimestampModel, table=True):
     updated_by_user: Optional["UserDetail"] = Relationship(
         sa_relationship_kwargs={
             "primaryjoin": "Flow.updated_by == UserDetail.user_detail_id",
-            "lazy": "selectin",
+            "lazy": "raise_on_sql",
         }
     )
 
@@ -176,6 +176,12 @@ class FlowDeploymentReturn(FlowDeploymentBase):
     bh_env_name: Optional[str]
 
 
+class DagDeploymentStatus(SQLModel):
+    state: str = Field(..., description="pending, uploading, failed, deployed, outdated, missing or unknown")
+    fingerprint: Optional[str] = Field(default=None, description="Fingerprint of the DAG file concerned")
+    error: Optional[str] = Field(default=None, description="Error of the last failed upload on this worker")
+
+
 class FlowDeploymentInFlowReturn(SQLModel):
     flow_deployment_id: Optional[int]
     bh_env_id: Optional[str]
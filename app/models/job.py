@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime
+from sqlmodel import SQLModel, Field, JSON
+
+from app.core.config import Config
+from app.enums.job import JobStatus, JobType
+from app.models.base import TimestampModel
+
+
+class BHJobBase(SQLModel):
+    job_id: int = Field(default=None, primary_key=True)
+    job_type: JobType = Field(..., description="Kind of work, e.g. import_catalog")
+    status: JobStatus = Field(default=JobStatus.QUEUED, index=True, description="Status of the job")
+    params: Dict[str, Any] = Field(default={}, sa_column=Column(JSON, nullable=False), description="Parameters of the job")
+    items: List[str] = Field(default=[], sa_column=Column(JSON, nullable=False), description="Units of work, e.g. table names")
+    progress: Dict[str, Any] = Field(
+        default={}, sa_column=Column(JSON, nullable=False),
+        description="State of each finished item, e.g. {'orders': {'status': 'done', 'data_src_id': 7}}",
+    )
+    total_items: int = Field(default=0, description="Number of items")
+    completed_items: int = Field(default=0, description="Number of items done")
+    skipped_items: int = Field(default=0, description="Number of items with nothing to do")
+    failed_items: int = Field(default=0, description="Number of items failed")
+    result: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON, nullable=True), description="Summary once finished")
+    error: Optional[str] = Field(default=None, nullable=True, description="Last error of the job")
+    attempts: int = Field(default=0, description="Number of times a worker picked up the job")
+    worker_id: Optional[str] = Field(default=None, nullable=True, description="Worker running the job")
+    started_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
+    heartbeat_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
+    finished_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
+
+
+class BHJob(BHJobBase, TimestampModel, table=True):
+    __tablename__ = "bh_job"
+    __table_args__ = {'schema': Config.DB_SCHEMA}
+
+
+class BHJobReturn(SQLModel):
+    job_id: int = None
+    job_type: JobType = None
+    status: JobStatus = None
+    params: Optional[Dict[str, Any]] = None
+    total_items: int = 0
+    completed_items: int = 0
+    skipped_items: int = 0
+    failed_items: int = 0
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_by: Optional[int] = None
@@ -2,7 +2,7 @@ from typing import Optional, List
 from sqlalchemy import Column
 from sqlmodel import SQLModel, Field, JSON, Relationship
 
-from app.models.base import TimestampModel
+from app.models.base import TimestampModel, defer_embeddings
 from app.core.config import Config
 from pgvector.sqlalchemy import Vector
 
@@ -40,6 +40,7 @@ class LayoutFieldsBase(SQLModel):
 class LayoutFields(LayoutFieldsBase, TimestampModel, table=True):
     __tablename__ = "layout_fields"
     __table_args__ = {'schema': Config.DB_SCHEMA}
+    __mapper_args__ = defer_embeddings('lyt_fld_embedding')
 
     from app.models.data_source_layout import DataSourceLayout
     data_source_layout: DataSourceLayout = Relationship(back_populates="layout_fields")
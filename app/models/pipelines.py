@@ -5,7 +5,7 @@ from sqlalchemy import Column, Integer, ForeignKey
 from sqlmodel import SQLModel, Field, JSON, Relationship
 from datetime import datetime
 from app.core.config import Config
-from app.models.base import TimestampModel
+from app.models.base import TimestampModel, defer_embeddings
 from app.models.bh_project import BHProject, ProjectEnvironment
 from app.enums.bh_project import Status
 from sqlalchemy.types import JSON
@@ -68,31 +68,32 @@ class Pipeline(PipelineBase, TimestampModel, table=True):
  
     __tablename__ = "pipeline"
     __table_args__ = {'schema': Config.DB_SCHEMA}
+    __mapper_args__ = defer_embeddings('pipeline_name_embedding')
  
     bh_project: Optional["BHProject"] = Relationship(
         back_populates="pipeline",
-        sa_relationship_kwargs={"lazy": "selectin"}
+        sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
  
     # Relationship to PipelineDefinition
     pipeline_definitions: Optional["PipelineDefinition"] = Relationship(
         back_populates="pipeline",
-        sa_relationship_kwargs={"uselist": False, "lazy": "selectin"},
+        sa_relationship_kwargs={"uselist": False, "lazy": "raise_on_sql"},
     )
  
     pipeline_config: Optional["PipelineConfig"] = Relationship(
         back_populates="pipeline",
-        sa_relationship_kwargs={"lazy": "selectin"}
+        sa_relationship_kwargs={"lazy": "raise_on_sql"}
     )
 
     pipeline_parameters: Optional["PipelineParameter"] = Relationship(
         back_populates="pipeline",
-        sa_relationship_kwargs={"uselist": True, "lazy": "selectin"},
+        sa_relationship_kwargs={"uselist": True, "lazy": "raise_on_sql"},
     )
     created_by_user: Optional["UserDetail"] = Relationship(
         sa_relationship_kwargs={
             "primaryjoin": "Pipeline.created_by == UserDetail.user_detail_id",
-            "lazy": "selectin",
+            "lazy": "raise_on_sql",
         }
     )
 
@@ -100,7 +101,7 @@ class Pipeline(PipelineBase, TimestampModel, table=True):
     updated_by_user: Optional["UserDetail"] = Relationship(
         sa_relationship_kwargs={
             "primaryjoin": "Pipeline.updated_by == UserDetail.user_detail_id",
-            "lazy": "selectin",
+            "lazy": "raise_on_sql",
         }
     )
 
@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field
-from typing import Optional
+from typing import List, Optional
 from app.core.config import Config
 from app.enums.flow import SchemaTypes
 from app.models.base import TimestampModel
@@ -46,3 +46,22 @@ class SchemaReturn(SchemaBase):
     schema_path: Optional[str] = None
     schema_dependencies_path: Optional[str] = None
     platform_version: Optional[str] = None
+
+
+class SchemaValidationError(SQLModel):
+    path: str = Field(..., description="JSON pointer of the invalid value, e.g. /tasks/0/task_id")
+    message: str
+    validator: Optional[str] = Field(default=None, description="Failed schema keyword, e.g. required, enum")
+
+
+class SchemaValidationRequest(SQLModel):
+    schema_type: SchemaTypes
+    schema_id: Optional[int] = Field(default=None, description="Schema to validate against, the latest of schema_type by default")
+    version_tag: Optional[str] = Field(default=None, description="Git version tag of the schema, instead of schema_id")
+    documents: List[dict] = Field(..., description="Pipeline JSONs or flowJsons to validate")
+
+
+class SchemaValidationResult(SQLModel):
+    index: int
+    valid: bool
+    errors: List[SchemaValidationError] = []
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11protos/data.proto\x12\x04\x64\x61ta\"\x94\x01\n\x15TransformationRequest\x12\x15\n\rpipeline_name\x18\x01 \x01(\t\x12\x1b\n\x13transformation_name\x18\x02 \x01(\t\x12\x0c\n\x04page\x18\x03 \x01(\x05\x12\x11\n\tpage_size\x18\x04 \x01(\x05\x12&\n\x0csort_columns\x18\x05 \x03(\x0b\x32\x10.data.SortColumn\")\n\nSortColumn\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05order\x18\x02 \x01(\t\"U\n\x03Row\x12!\n\x04\x64\x61ta\x18\x01 \x03(\x0b\x32\x13.data.Row.DataEntry\x1a+\n\tDataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"/\n\x06Output\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x17\n\x04rows\x18\x02 \x03(\x0b\x32\t.data.Row\"Z\n\x1cTransformationOutputResponse\x12\x1b\n\x13transformation_name\x18\x01 \x01(\t\x12\x1d\n\x07outputs\x18\x02 \x03(\x0b\x32\x0c.data.Output\"=\n$GetTransformationOutputCountsRequest\x12\x15\n\rpipeline_name\x18\x01 \x01(\t\"K\n\x19TransformationOutputCount\x12\x1b\n\x13transformation_name\x18\x01 \x01(\t\x12\x11\n\trow_count\x18\x02 \x01(\x03\"n\n%GetTransformationOutputCountsResponse\x12\x45\n\x1ctransformation_output_counts\x18\x01 \x03(\x0b\x32\x1f.data.TransformationOutputCount2\xe3\x01\n\x0b\x44\x61taService\x12Z\n\x17GetTransformationOutput\x12\x1b.data.TransformationRequest\x1a\".data.TransformationOutputResponse\x12x\n\x1dGetTransformationOutputCounts\x12*.data.GetTransformationOutputCountsRequest\x1a+.data.GetTransformationOutputCountsResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11protos/data.proto\x12\x04\x64\x61ta\"\x94\x01\n\x15TransformationRequest\x12\x15\n\rpipeline_name\x18\x01 \x01(\t\x12\x1b\n\x13transformation_name\x18\x02 \x01(\t\x12\x0c\n\x04page\x18\x03 \x01(\x05\x12\x11\n\tpage_size\x18\x04 \x01(\x05\x12&\n\x0csort_columns\x18\x05 \x03(\x0b\x32\x10.data.SortColumn\")\n\nSortColumn\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05order\x18\x02 \x01(\t\"U\n\x03Row\x12!\n\x04\x64\x61ta\x18\x01 \x03(\x0b\x32\x13.data.Row.DataEntry\x1a+\n\tDataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"/\n\x06Output\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x17\n\x04rows\x18\x02 \x03(\x0b\x32\t.data.Row\"Z\n\x1cTransformationOutputResponse\x12\x1b\n\x13transformation_name\x18\x01 \x01(\t\x12\x1d\n\x07outputs\x18\x02 \x03(\x0b\x32\x0c.data.Output\"C\n\x19TransformationRecordBatch\x12\x13\n\x0boutput_name\x18\x01 \x01(\t\x12\x11\n\tarrow_ipc\x18\x02 \x01(\x0c\"=\n$GetTransformationOutputCountsRequest\x12\x15\n\rpipeline_name\x18\x01 \x01(\t\"K\n\x19TransformationOutputCount\x12\x1b\n\x13transformation_name\x18\x01 \x01(\t\x12\x11\n\trow_count\x18\x02 \x01(\x03\"n\n%GetTransformationOutputCountsResponse\x12\x45\n\x1ctransformation_output_counts\x18\x01 \x03(\x0b\x32\x1f.data.TransformationOutputCount2\xc1\x02\n\x0b\x44\x61taService\x12Z\n\x17GetTransformationOutput\x12\x1b.data.TransformationRequest\x1a\".data.TransformationOutputResponse\x12x\n\x1dGetTransformationOutputCounts\x12*.data.GetTransformationOutputCountsRequest\x1a+.data.GetTransformationOutputCountsResponse\x12\\\n\x1aStreamTransformationOutput\x12\x1b.data.TransformationRequest\x1a\x1f.data.TransformationRecordBatch0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,12 +35,14 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_OUTPUT']._serialized_end=355
   _globals['_TRANSFORMATIONOUTPUTRESPONSE']._serialized_start=357
   _globals['_TRANSFORMATIONOUTPUTRESPONSE']._serialized_end=447
-  _globals['_GETTRANSFORMATIONOUTPUTCOUNTSREQUEST']._serialized_start=449
-  _globals['_GETTRANSFORMATIONOUTPUTCOUNTSREQUEST']._serialized_end=510
-  _globals['_TRANSFORMATIONOUTPUTCOUNT']._serialized_start=512
-  _globals['_TRANSFORMATIONOUTPUTCOUNT']._serialized_end=587
-  _globals['_GETTRANSFORMATIONOUTPUTCOUNTSRESPONSE']._serialized_start=589
-  _globals['_GETTRANSFORMATIONOUTPUTCOUNTSRESPONSE']._serialized_end=699
-  _globals['_DATASERVICE']._serialized_start=702
-  _globals['_DATASERVICE']._serialized_end=929
+  _globals['_TRANSFORMATIONRECORDBATCH']._serialized_start=449
+  _globals['_TRANSFORMATIONRECORDBATCH']._serialized_end=516
+  _globals['_GETTRANSFORMATIONOUTPUTCOUNTSREQUEST']._serialized_start=518
+  _globals['_GETTRANSFORMATIONOUTPUTCOUNTSREQUEST']._serialized_end=579
+  _globals['_TRANSFORMATIONOUTPUTCOUNT']._serialized_start=581
+  _globals['_TRANSFORMATIONOUTPUTCOUNT']._serialized_end=656
+  _globals['_GETTRANSFORMATIONOUTPUTCOUNTSRESPONSE']._serialized_start=658
+  _globals['_GETTRANSFORMATIONOUTPUTCOUNTSRESPONSE']._serialized_end=768
+  _globals['_DATASERVICE']._serialized_start=771
+  _globals['_DATASERVICE']._serialized_end=1092
 # @@protoc_insertion_point(module_scope)
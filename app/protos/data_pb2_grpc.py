@@ -49,6 +49,11 @@ class DataServiceStub(object):
                 request_serializer=protos_dot_data__pb2.GetTransformationOutputCountsRequest.SerializeToString,
                 response_deserializer=protos_dot_data__pb2.GetTransformationOutputCountsResponse.FromString,
                 _registered_method=True)
+        self.StreamTransformationOutput = channel.unary_stream(
+                '/data.DataService/StreamTransformationOutput',
+                request_serializer=protos_dot_data__pb2.TransformationRequest.SerializeToString,
+                response_deserializer=protos_dot_data__pb2.TransformationRecordBatch.FromString,
+                _registered_method=True)
 
 
 class DataServiceServicer(object):
@@ -66,6 +71,13 @@ class DataServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamTransformationOutput(self, request, context):
+        """Same page as GetTransformationOutput, sent as typed columnar record batches
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DataServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -79,11 +91,16 @@ def add_DataServiceServicer_to_server(servicer, server):
                     request_deserializer=protos_dot_data__pb2.GetTransformationOutputCountsRequest.FromString,
                     response_serializer=protos_dot_data__pb2.GetTransformationOutputCountsResponse.SerializeToString,
             ),
+            'StreamTransformationOutput': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamTransformationOutput,
+                    request_deserializer=protos_dot_data__pb2.TransformationRequest.FromString,
+                    response_serializer=protos_dot_data__pb2.TransformationRecordBatch.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'data.DataService', rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
-    # server.add_registered_method_handlers('data.DataService', rpc_method_handlers)
+    server.add_registered_method_handlers('data.DataService', rpc_method_handlers)
 
 
  # This class is part of an EXPERIMENTAL API.
@@ -143,3 +160,30 @@ class DataService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamTransformationOutput(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/data.DataService/StreamTransformationOutput',
+            protos_dot_data__pb2.TransformationRequest.SerializeToString,
+            protos_dot_data__pb2.TransformationRecordBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,7 +1,10 @@
+import asyncio
+import hashlib
 import os
 from app.core.config import Config
 from app.core.context import Context
 from app.exceptions.aws import AWSSecretsClientError, AwsSecretkeyNotFoundError
+from app.utils.request_metrics import instrument_boto3_client
 import boto3
 import time
 import logging
@@ -22,11 +25,13 @@ from app.models.aws import (
     DatabricksCredentials
 )
 from app.services.base import BaseService
+from app.utils.cache_utils import TTLCache
+from app.utils.secret_cache import forget_secret, get_cached_secret
 import snowflake.connector
 import json
 from google.cloud import bigquery
 from google.oauth2 import service_account
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 from botocore.exceptions import ClientError
 
 # Configure logging
@@ -38,12 +43,12 @@ class AthenaQueryService(BaseService):
     create_model: QueryResult = QueryResult
 
     def __init__(self, aws_access_key_id: str, aws_secret_access_key: str, region_name: str, database: str, output_bucket: str):
-        self.athena_client = boto3.client(
+        self.athena_client = instrument_boto3_client(boto3.client(
             'athena',
             region_name=region_name,
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key
-        )
+        ))
         self.database = database
         self.output_bucket = output_bucket
 
@@ -249,9 +254,45 @@ class AWSService(BaseService):
             self._buckets = AWSS3Service(self.context)
         return self._buckets
 
+
+_secrets_client = None
+
+
+def get_secrets_client():
+    """ Secrets Manager client shared by the process, boto3 clients are thread safe."""
+    global _secrets_client
+    if _secrets_client is None:
+        _secrets_client = instrument_boto3_client(boto3.client(
+            'secretsmanager',
+            aws_access_key_id=Config.AWS_ACCESS_KEY,
+            aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
+            region_name=Config.AWS_REGION
+        ))
+    return _secrets_client
+
+
+_s3_clients = TTLCache(maxsize=64, ttl=3600)
+
+
+def get_s3_client(aws_access_key_id: str, aws_secret_access_key: str, region_name: str):
+    """ S3 client per credentials shared by the process, rotated credentials get a new one."""
+    key = (aws_access_key_id, hashlib.sha256((aws_secret_access_key or '').encode()).hexdigest(), region_name)
+    client = _s3_clients.get(key)
+    if client is None:
+        client = instrument_boto3_client(boto3.client(
+            's3',
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            region_name=region_name
+        ))
+        _s3_clients.set(key, client)
+    return client
+
+
 class AWSSecretsService(BaseService):
     '''
     AWS Secrets Manager service.
+    Secret values are cached for SECRETS_CACHE_TTL seconds, boto3 calls run in a worker thread.
     '''
     def __init__(self, context: Context):
         super().__init__(context)
@@ -259,12 +300,11 @@ class AWSSecretsService(BaseService):
         if not Config.AWS_ACCESS_KEY or not Config.AWS_SECRET_ACCESS_KEY:
             raise AwsSecretkeyNotFoundError()
         
-        self._secrets_client = boto3.client(
-            'secretsmanager',
-            aws_access_key_id=Config.AWS_ACCESS_KEY,
-            aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
-            region_name=Config.AWS_REGION
-        )
+        self._secrets_client = get_secrets_client()
+
+    @staticmethod
+    def cache_key(secret_name: str) -> tuple:
+        return ('aws', secret_name)
 
     async def new_secret(
             self,
@@ -275,7 +315,7 @@ class AWSSecretsService(BaseService):
         try:
             # Check if the secret already exists
             try:
-                existing_secret = self._secrets_client.describe_secret(SecretId=secret_name)
+                existing_secret = await asyncio.to_thread(self._secrets_client.describe_secret, SecretId=secret_name)
                 version_ids_to_stages = existing_secret['VersionIdsToStages']
                 latest_version_id = next(iter(version_ids_to_stages.keys()))  # Get the first (latest) version ID
                 logger.info(f"Secret {secret_name} already exists. Current version ID: {latest_version_id}")
@@ -283,7 +323,8 @@ class AWSSecretsService(BaseService):
             except self._secrets_client.exceptions.ResourceNotFoundException:
                 # Create a new secret if it doesn't exist
                 logger.info(f"Creating new secret: {secret_name}")
-                response = self._secrets_client.create_secret(
+                response = await asyncio.to_thread(
+                    self._secrets_client.create_secret,
                     Name=secret_name,
                     SecretString=secret_data,
                     Tags=[
@@ -298,12 +339,17 @@ class AWSSecretsService(BaseService):
         except ClientError as e:
             logger.error(f"Failed to create or update secret: {e}")
             raise
+        finally:
+            # After the write, so a read in flight meanwhile doesn't cache the old value
+            forget_secret(self.cache_key(secret_name))
     
     async def get_secret(self, secret_name: str) -> dict:
-        try:
+        def fetch() -> dict:
             response = self._secrets_client.get_secret_value(SecretId=secret_name)
-            secret_data = response['SecretString']
-            return json.loads(secret_data)
+            return json.loads(response['SecretString'])
+
+        try:
+            return await get_cached_secret(self.cache_key(secret_name), fetch)
         except self._secrets_client.exceptions.ResourceNotFoundException as e:
             logger.error(f"Secret {secret_name} not found.")
             raise AWSSecretsClientError(
@@ -317,7 +363,8 @@ class AWSSecretsService(BaseService):
 
     async def delete_secret(self, secret_name: str) -> str:
         try:
-            response = self._secrets_client.delete_secret(
+            response = await asyncio.to_thread(
+                self._secrets_client.delete_secret,
                 SecretId=secret_name,
                 ForceDeleteWithoutRecovery=True
             )
@@ -335,6 +382,8 @@ class AWSSecretsService(BaseService):
             raise AWSSecretsClientError(
                 context={"message": str(e)}
             )
+        finally:
+            forget_secret(self.cache_key(secret_name))
 
 
 class AWSS3Service:
@@ -342,12 +391,7 @@ class AWSS3Service:
     AWS S3 service.
     '''
     def __init__(self, aws_access_key_id: str, aws_secret_access_key: str, region_name: str = Config.AWS_REGION):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=region_name
-        )
+        self.s3_client = get_s3_client(aws_access_key_id, aws_secret_access_key, region_name)
 
     def create_bucket(self, bucket_name: str) -> None:
         try:
@@ -384,14 +428,24 @@ class AWSS3Service:
         self.create_bucket(bucket_name)
         self.upload_json_to_bucket(bucket_name, file_name, json_data)
     
-    def upload_file_to_s3(self, bucket_name, key, file_content, content_type):
+    def upload_file_to_s3(self, bucket_name, key, file_content, content_type, metadata: Optional[dict] = None):
         self.s3_client.put_object(
             Bucket=bucket_name,
             Key=key,
             Body=file_content,
             ContentType=content_type,
+            Metadata=metadata or {},
         )
 
+    def get_object_metadata(self, bucket_name, key) -> Optional[dict]:
+        """User metadata of an object, None when it does not exist."""
+        try:
+            return self.s3_client.head_object(Bucket=bucket_name, Key=key).get('Metadata', {})
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
 
 class AWSMWAAService:
     """
@@ -402,12 +456,12 @@ class AWSMWAAService:
         """
         Initialize the MWAA client with AWS credentials and region.
         """
-        self.mwaa_client = boto3.client(
+        self.mwaa_client = instrument_boto3_client(boto3.client(
             'mwaa',
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
             region_name=region_name
-        )
+        ))
 
     def create_environment(self, environment_name: str, bucket_name: str) -> None:
         """
@@ -5,16 +5,22 @@ from abc import ABC
 from app.exceptions.base import CreateException
 from fastapi import HTTPException
 from fastapi import status as http_status
-from fastapi.encoders import jsonable_encoder
 from app.types import ModelType, SchemaType
-from sqlalchemy import delete, select, desc, or_, cast, String
+from sqlalchemy import delete, insert, select, desc, or_, and_, cast, func, text, String
 from sqlalchemy.types import BOOLEAN, INTEGER
 from sqlalchemy.ext.associationproxy import ColumnAssociationProxyInstance
 from sqlalchemy import inspect
+from sqlalchemy.orm import undefer_group, selectinload, joinedload
 
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Optional, List, Dict, Tuple
+from app.core.config import Config
 from app.core.context import Context
 from app.exceptions import ObjectNotFound
+from app.models.base import EMBEDDINGS_GROUP
+from app.enums.pagination import TotalCount
+from app.utils.json_utils import to_jsonable
+from app.utils.pagination import Page, decode_cursor, encode_cursor
+from app.utils.search_utils import search_document, search_query
 from datetime import datetime
 
 class BaseService(ABC):
@@ -25,6 +31,12 @@ class BaseService(ABC):
     return_full_schema: SchemaType = None
     name_field: str = None
     key_field: str = None
+    # Named sets of relationship paths to eager load, e.g. {"summary": ("bh_project",)}
+    load_profiles: Dict[str, Tuple[str, ...]] = {}
+    # Profile whose relationships `return_schema` reads, used by list/search and after writes
+    return_profile: Optional[str] = None
+    # Text columns covered by the full text and trigram search indexes
+    search_fields: Tuple[str, ...] = ()
 
     def __init__(self, context: Context):
         self.context: Context = context
@@ -37,6 +49,69 @@ class BaseService(ABC):
         # Assuming single-column primary key; adjust if your models use composite primary keys
         return primary_key_columns[0]
 
+    def select_columns(self, include_deferred: bool = False) -> list:
+        """ Table columns of the model in mapper order. Deferred columns (pgvector
+            embeddings) are left out unless `include_deferred` is set."""
+        return [
+            column_attr.columns[0]
+            for column_attr in inspect(self.model).column_attrs
+            if include_deferred or not column_attr.deferred
+        ]
+
+    def select_list(self) -> str:
+        """Comma separated non deferred column names, for raw SQL select lists."""
+        return ", ".join(column.name for column in self.select_columns())
+
+    def with_embeddings(self, query):
+        """Opt in to loading the deferred embedding columns of `self.model`."""
+        return query.options(undefer_group(EMBEDDINGS_GROUP))
+
+    def load_options(self, profile: Optional[str] = None) -> list:
+        """ Loader options of a named entry of `load_profiles`. Each entry lists
+            relationship paths like "flow_deployment.project_environment";
+            scalar relationships are joined, collections use a second SELECT."""
+        if profile is None:
+            return []
+        if profile not in self.load_profiles:
+            raise ValueError(f"Unknown load profile '{profile}' for {self.model.__name__}")
+
+        options = []
+        for path in self.load_profiles[profile]:
+            option, entity = None, self.model
+            for name in path.split("."):
+                attribute = getattr(entity, name)
+                if attribute.property.uselist:
+                    option = selectinload(attribute) if option is None else option.selectinload(attribute)
+                else:
+                    option = joinedload(attribute) if option is None else option.joinedload(attribute)
+                entity = attribute.property.mapper.class_
+            options.append(option)
+        return options
+
+    def with_profile(self, query, profile: Optional[str] = None):
+        """Apply the loader options of `profile` to a select on `self.model`."""
+        options = self.load_options(profile)
+        return query.options(*options) if options else query
+
+    async def refresh(self, obj, profile: Optional[str] = None):
+        """ Reload `obj` after a commit, together with the relationships of `profile`.
+            Relationships are not eager by default, so a plain session refresh
+            leaves them unloaded."""
+        options = self.load_options(profile)
+        if not options:
+            await self.context.db_session.refresh(obj)
+            return obj
+
+        primary_key_column = await self._get_primary_key_column()
+        statement = (
+            select(self.model)
+            .filter(primary_key_column == inspect(obj).identity[0])
+            .options(*options)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.context.db_session.execute(statement)
+        return result.scalar_one()
+
     def name_to_key_parser(self, name: str) -> str:
         """ To replace any special characters with underscore in field name
             and only allow alphanumeric characters & underscore.
@@ -45,12 +120,115 @@ class BaseService(ABC):
         name = re.sub('[^a-zA-Z0-9]', '_', name).lower()
         return name
 
+    def paginate(
+            self,
+            query,
+            offset: int = 0,
+            limit: int = 10,
+            order_by: Optional[str] = None,
+            order_desc: bool = False,
+            cursor: Optional[str] = None,
+        ):
+        """ Apply ordering and pagination to a select on `self.model`.
+            Without a cursor this is the plain OFFSET/LIMIT paging. With a cursor
+            (an empty string starts from the first row) rows are ordered by
+            (`order_by`, primary key) and fetched with a keyset condition, so
+            deep pages cost the same as the first one.
+        Args:
+            query: Select: Filtered select statement
+            cursor: str: Opaque cursor returned as `next_cursor` of the previous page"""
+        if cursor is None:
+            query = query.offset(offset).limit(limit)
+            if order_by:
+                order_expression = getattr(self.model, order_by)
+                if order_desc:
+                    order_expression = desc(order_expression)
+                query = query.order_by(order_expression)
+            return query
+
+        key_column = inspect(self.model).primary_key[0]
+        order_column = getattr(self.model, order_by) if order_by else key_column
+        by_key_only = order_column.key == key_column.key
+
+        if by_key_only:
+            query = query.order_by(desc(key_column) if order_desc else key_column)
+        else:
+            # NULLs go last in both directions so the keyset condition stays simple
+            order_expression = desc(order_column) if order_desc else order_column
+            query = query.order_by(order_expression.nulls_last(), desc(key_column) if order_desc else key_column)
+
+        if cursor:
+            last_value, last_key = decode_cursor(cursor, order_column, key_column)
+            after_key = key_column < last_key if order_desc else key_column > last_key
+            if by_key_only:
+                query = query.where(after_key)
+            elif last_value is None:
+                query = query.where(order_column.is_(None), after_key)
+            else:
+                after_value = order_column < last_value if order_desc else order_column > last_value
+                query = query.where(or_(
+                    after_value,
+                    and_(order_column == last_value, after_key),
+                    order_column.is_(None),
+                ))
+
+        return query.limit(limit)
+
+    async def count_total(self, query, mode: Optional[TotalCount] = None) -> Optional[int]:
+        """ Total number of rows for a list query.
+            `exact` counts the filtered rows, `estimate` reads the planner
+            statistics of the whole table (pg_class.reltuples, filters are not
+            applied) and falls back to an exact count outside PostgreSQL."""
+        if mode is None:
+            return None
+
+        session = self.context.db_session
+        if mode == TotalCount.ESTIMATE and session.bind.dialect.name == 'postgresql':
+            table = self.model.__table__
+            result = await session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                {'table_name': f'{table.schema}.{table.name}' if table.schema else table.name},
+            )
+            estimate = result.scalar_one_or_none()
+            # reltuples is -1 for tables which were never analyzed
+            if estimate is not None and estimate >= 0:
+                return estimate
+
+        count_query = select(func.count()).select_from(self.model)
+        if query.whereclause is not None:
+            count_query = count_query.where(query.whereclause)
+        result = await session.execute(count_query)
+        return result.scalar_one()
+
+    async def make_page(
+            self,
+            items: List,
+            rows: List,
+            query,
+            limit: int,
+            order_by: Optional[str] = None,
+            cursor: Optional[str] = None,
+            with_total: Optional[TotalCount] = None,
+        ) -> Page:
+        """ Wrap converted `items` into a `Page`. `rows` are the matching ORM
+            objects, the last one is used to build `next_cursor` when the page is full."""
+        next_cursor = None
+        if cursor is not None and rows and len(rows) >= limit:
+            key_column = inspect(self.model).primary_key[0]
+            last = rows[-1]
+            order_key = order_by or key_column.key
+            next_cursor = encode_cursor(getattr(last, order_key), getattr(last, key_column.key))
+
+        return Page(items, next_cursor=next_cursor, total=await self.count_total(query, with_total))
+
     async def list_full(
             self,
             offset: int = 0,
             limit: int = 10,
             order_by: Optional[str] = None,
             order_desc: bool = False,
+            cursor: Optional[str] = None,
+            with_total: Optional[TotalCount] = None,
             **kwargs,
             ) -> List[return_full_schema]:
         
@@ -62,17 +240,16 @@ class BaseService(ABC):
                 if kwargs[kw] is not None:
                     query = query.where(getattr(self.model, kw) == kwargs[kw])
 
-        query = query.offset(offset).limit(limit).where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
-        
-        if order_by:
-            order_expression = getattr(self.model, order_by)
-            if order_desc:
-                order_expression = desc(order_expression)
-            query = query.order_by(order_expression)
+        query = query.where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+        paged_query = self.paginate(query, offset, limit, order_by, order_desc, cursor)
 
-        results = await self.context.db_session.execute(query)
+        results = await self.context.db_session.execute(paged_query)
+        rows = results.scalars().all()
 
-        return [self.return_full_schema.from_orm(result) for result in results.scalars()]
+        return await self.make_page(
+            [self.return_full_schema.from_orm(result) for result in rows],
+            rows, query, limit, order_by, cursor, with_total,
+        )
 
     async def list(
             self,
@@ -80,6 +257,8 @@ class BaseService(ABC):
             limit: int = 10,
             order_by: Optional[str] = None,
             order_desc: bool = False,
+            cursor: Optional[str] = None,
+            with_total: Optional[TotalCount] = None,
             **kwargs,
             ) -> List[return_schema]:
         
@@ -91,17 +270,58 @@ class BaseService(ABC):
                 if kwargs[kw] is not None:
                     query = query.where(getattr(self.model, kw) == kwargs[kw])
 
-        query = query.offset(offset).limit(limit)
-        
-        if order_by:
-            order_expression = getattr(self.model, order_by)
-            if order_desc:
-                order_expression = desc(order_expression)
-            query = query.order_by(order_expression)
+        paged_query = self.paginate(query, offset, limit, order_by, order_desc, cursor)
 
-        results = await self.context.db_session.execute(query)
+        results = await self.context.db_session.execute(self.with_profile(paged_query, self.return_profile))
+        rows = results.scalars().all()
 
-        return [self.return_schema.from_orm(result) for result in results.scalars()]
+        return await self.make_page(
+            [self.return_schema.from_orm(result) for result in rows],
+            rows, query, limit, order_by, cursor, with_total,
+        )
+
+    async def stream_list(
+            self,
+            offset: int = 0,
+            limit: int = 10,
+            order_by: Optional[str] = None,
+            order_desc: bool = False,
+            cursor: Optional[str] = None,
+            **kwargs,
+            ) -> AsyncIterator[return_schema]:
+        """ Rows of `list` yielded as they are fetched, `Config.STREAM_BATCH_SIZE` at a
+            time over a server side cursor. There is no total or next cursor."""
+        paged_query = self.stream_list_query(offset, limit, order_by, order_desc, cursor, **kwargs)
+        async for result in self.stream_scalars(self.with_profile(paged_query, self.return_profile)):
+            yield self.return_schema.from_orm(result)
+
+    def stream_list_query(
+            self,
+            offset: int = 0,
+            limit: int = 10,
+            order_by: Optional[str] = None,
+            order_desc: bool = False,
+            cursor: Optional[str] = None,
+            **kwargs,
+            ):
+        """The paged select of `list`, without loader options."""
+        query = select(self.model).where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+
+        for kw in kwargs.keys():
+            if kwargs[kw] is not None:
+                query = query.where(getattr(self.model, kw) == kwargs[kw])
+
+        return self.paginate(query, offset, limit, order_by, order_desc, cursor)
+
+    async def stream_scalars(self, query) -> AsyncIterator:
+        """ ORM objects of `query` fetched `Config.STREAM_BATCH_SIZE` at a time. Each one
+            is expunged once the next is asked for, so convert it before."""
+        session = self.context.db_session
+        results = await session.stream(query.execution_options(yield_per=Config.STREAM_BATCH_SIZE))
+        async for result in results.scalars():
+            yield result
+            # Nothing references the row any more, keep the identity map small
+            session.expunge(result)
     
     async def search(self, params: Dict[str, str]) -> List[return_schema]:
         query = select(self.model).filter(or_(self.model.is_deleted == False, self.model.is_deleted == None))
@@ -119,14 +339,63 @@ class BaseService(ABC):
                 elif str(search_key[0]).lower() == 'false':
                     query = query.filter(model_field.is_(False))
             else:
-                # Cast as String in case of JSON
-                query = query.filter(or_(*[cast(model_field, String).ilike(f'%{key}%') for key in search_key]))
+                # Text columns are compared as they are so trigram indexes apply, JSON is cast to String
+                if not isinstance(model_field.type, String):
+                    model_field = cast(model_field, String)
+                query = query.filter(or_(*[model_field.ilike(f'%{key}%') for key in search_key]))
 
-        results = await self.context.db_session.exec(query)
+        results = await self.context.db_session.exec(self.with_profile(query, self.return_profile))
 
         return [self.return_schema.from_orm(result) for result in results.scalars()]
     
 
+    async def text_search(
+            self,
+            term: str,
+            offset: int = 0,
+            limit: int = 10,
+            with_total: Optional[TotalCount] = None,
+        ) -> Page:
+        """ Ranked search of `term` over `search_fields`.
+            On PostgreSQL rows match on the tsvector document, trigram similarity
+            or substring and are ordered by ts_rank plus the best similarity, all
+            served by the `ix_search_*` GIN indexes. Other databases (the SQLite
+            test setup) fall back to a substring scan ordered by primary key."""
+        if not self.search_fields:
+            raise ValueError(f"No search fields configured for {self.model.__name__}")
+
+        columns = [getattr(self.model, field) for field in self.search_fields]
+        primary_key_column = await self._get_primary_key_column()
+        pattern = f'%{term}%'
+
+        query = select(self.model)
+        if hasattr(self.model, "is_deleted"):
+            query = query.where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+
+        session = self.context.db_session
+        if session.bind.dialect.name == 'postgresql':
+            document, ts_query = search_document(columns), search_query(term)
+            query = query.where(or_(
+                document.op('@@')(ts_query),
+                *[column.op('%')(term) for column in columns],
+                *[column.ilike(pattern) for column in columns],
+            ))
+            rank = func.ts_rank_cd(document, ts_query) + func.greatest(
+                *[func.coalesce(func.similarity(column, term), 0) for column in columns]
+            )
+            paged_query = query.order_by(desc(rank), primary_key_column)
+        else:
+            query = query.where(or_(*[column.ilike(pattern) for column in columns]))
+            paged_query = query.order_by(primary_key_column)
+
+        paged_query = self.with_profile(paged_query.offset(offset).limit(limit), self.return_profile)
+        results = await session.execute(paged_query)
+
+        return Page(
+            [self.return_schema.from_orm(result) for result in results.scalars()],
+            total=await self.count_total(query, with_total),
+        )
+
     def insert_user_fields(
         self,
         obj: model, 
@@ -144,6 +413,35 @@ class BaseService(ABC):
             obj.is_deleted = True
         return obj
 
+    async def bulk_insert(
+            self,
+            rows: List[dict],
+            model: ModelType = None,
+            returning: Tuple[str, ...] = (),
+        ) -> list:
+        """ Insert `rows` (dicts with the same keys) into the table of `model`,
+            `self.model` by default, with multi-row INSERT statements. Primary keys
+            come from the table sequence, column defaults apply as for the ORM.
+            Nothing is committed. Returns the `returning` columns of the new rows.
+        Args:
+            rows: List[dict]: Column values of each row
+            returning: Tuple[str, ...]: Columns to return, e.g. the primary key and a natural key"""
+        if not rows:
+            return []
+        table = (model or self.model).__table__
+        statement = insert(table)
+        if returning:
+            statement = statement.returning(*(table.c[name] for name in returning))
+
+        # Stay below the 32767 bind parameters PostgreSQL accepts per statement
+        chunk_size = max(1, 30000 // max(len(table.columns), 1))
+        inserted = []
+        for start in range(0, len(rows), chunk_size):
+            result = await self.context.db_session.execute(statement.values(rows[start:start + chunk_size]))
+            if returning:
+                inserted.extend(tuple(row) for row in result)
+        return inserted
+
     async def create(self, obj: create_model, authorized: dict = None):
         new_obj = self.model.from_orm(obj)
         if authorized:
@@ -153,7 +451,7 @@ class BaseService(ABC):
         try:
             self.context.db_session.add(new_obj)
             await self.context.db_session.commit()
-            await self.context.db_session.refresh(new_obj)
+            new_obj = await self.refresh(new_obj, self.return_profile)
         except Exception as e:
             print('------Exception-----')
             print(e)
@@ -162,11 +460,14 @@ class BaseService(ABC):
                     'error': str(e),
                 }
             )
+        await self.after_write()
         return new_obj
     
-    async def get(self, id: int):
+    async def get(self, id: int, load_embeddings: bool = False, profile: Optional[str] = None):
         primary_key_column = await self._get_primary_key_column()
-        statement = select(self.model).filter(primary_key_column == id)
+        statement = self.with_profile(select(self.model).filter(primary_key_column == id), profile)
+        if load_embeddings:
+            statement = self.with_embeddings(statement)
         if hasattr(self.model, "is_deleted"):
             statement = statement.filter(or_(self.model.is_deleted == False, self.model.is_deleted == None))
         result = await self.context.db_session.execute(statement=statement)
@@ -192,9 +493,9 @@ class BaseService(ABC):
 
         self.context.db_session.add(existing_obj)
         await self.context.db_session.commit()
-        await self.context.db_session.refresh(existing_obj)
+        await self.after_write()
 
-        return existing_obj
+        return await self.refresh(existing_obj, self.return_profile)
 
     async def model_update(self, id: int, obj: update_model, avoid: list = []):
         existing_obj = await self.get(id=id)
@@ -207,9 +508,9 @@ class BaseService(ABC):
 
         self.context.db_session.add(existing_obj)
         await self.context.db_session.commit()
-        await self.context.db_session.refresh(existing_obj)
+        await self.after_write()
 
-        return existing_obj
+        return await self.refresh(existing_obj, self.return_profile)
 
 
     async def delete(self, id: int, authorized: dict = None):
@@ -231,9 +532,14 @@ class BaseService(ABC):
 
         return True
 
+    async def after_write(self) -> None:
+        """ Called once `create`, `update`, `model_update` or `delete` committed, e.g.
+            to invalidate cached copies of `self.model`."""
+
     async def encode(self, object: object) -> dict:
         try:
-            json_object = jsonable_encoder(object)
-        except RecursionError:
-            json_object = jsonable_encoder(self.return_schema.from_orm(object))
+            json_object = to_jsonable(object)
+        except TypeError:
+            # orjson raises JSONEncodeError (a TypeError) on circular relationships
+            json_object = to_jsonable(self.return_schema.from_orm(object))
         return json_object
\ No newline at end of file
@@ -16,6 +16,8 @@ from app.models.base import (
     UserDetailReturn
 )
 from app.services.base import BaseService
+from app.core.config import Config
+from app.utils.cache_utils import TTLCache
 
 
 class BHUserService(BaseService):
@@ -30,6 +32,12 @@ class UserDetailService(BaseService):
     update_model: UserDetailBase = UserDetailBase
     return_schema: UserDetailReturn = UserDetailReturn
 
+    # username -> user_detail_id, shared by every request of the process
+    identity_cache: TTLCache = TTLCache(
+        maxsize=Config.AUTH_IDENTITY_CACHE_SIZE,
+        ttl=Config.AUTH_IDENTITY_CACHE_TTL,
+    )
+
     async def list(
             self,
             offset: int = 0,
@@ -74,6 +82,7 @@ class UserDetailService(BaseService):
     
     async def update(self, id: int, obj: update_model):
         existing_obj = await self.get(id=id)
+        self.forget_identity(user_detail_id=id)
         for k, v in obj:
             if v is not None:
                 setattr(existing_obj, k, v)
@@ -96,8 +105,27 @@ class UserDetailService(BaseService):
 
         await self.context.db_session.execute(statement=statement)
         await self.context.db_session.commit()
+        self.forget_identity(user_detail_id=id)
 
         return True
+
+    @classmethod
+    def forget_identity(cls, username: str = None, user_detail_id: int = None):
+        """Drop cached identities by username and/or user_detail_id."""
+        if username is not None:
+            cls.identity_cache.pop(username)
+        if user_detail_id is not None:
+            cls.identity_cache.pop_where(lambda _, value: value == user_detail_id)
+
+    async def get_user_detail_id(self, username: str, email: str) -> int:
+        """ Resolve the user_detail_id for an authenticated user.
+            Served from `identity_cache` when warm, otherwise falls back to
+            `get_or_create_user_detail`."""
+        async def load():
+            user_detail = await self.get_or_create_user_detail(username, email)
+            return user_detail.user_detail_id
+
+        return await self.identity_cache.get_or_load(username, load)
     
     async def get_or_create_user_detail(
         self,
@@ -11,7 +11,10 @@ from app.models.codes_hdr import (
     CodesDtlUpdate,
     CodesDtlReturn,
 )
+from app.enums.pagination import TotalCount
 from app.services.base import BaseService
+from app.services.reference_data import CODES_DTL, CODES_HDR
+from app.utils.reference_cache import reference_cache
 from sqlalchemy import select, desc
 from typing import Optional, List
 
@@ -21,12 +24,17 @@ class CodesHdrService(BaseService):
     update_model: CodesHdrUpdate = CodesHdrUpdate
     return_schema: CodesHdrReturn = CodesHdrReturn
 
+    async def after_write(self) -> None:
+        await reference_cache.invalidate(CODES_HDR, CODES_DTL)
+
     async def list(
             self,
             offset: int = 0,
             limit: int = 10,
             order_by: Optional[str] = None,
             order_desc: bool = False,
+            cursor: Optional[str] = None,
+            with_total: Optional[TotalCount] = None,
             **kwargs,
             ) -> List[return_schema]:
         
@@ -38,17 +46,16 @@ class CodesHdrService(BaseService):
                 if kwargs[kw] is not None:
                     query = query.where(getattr(self.model, kw) == kwargs[kw])
 
-        query = query.offset(offset).limit(limit)
-        
-        if order_by:
-            order_expression = getattr(self.model, order_by)
-            if order_desc:
-                order_expression = desc(order_expression)
-            query = query.order_by(order_expression)
+        paged_query = self.paginate(query, offset, limit, order_by, order_desc, cursor)
 
-        results = await self.context.db_session.execute(query)
+        results = await self.context.db_session.execute(paged_query)
 
-        return [self.return_schema.from_orm(result) for result in results.scalars()]
+        rows = results.scalars().all()
+
+        return await self.make_page(
+            [self.return_schema.from_orm(result) for result in rows],
+            rows, query, limit, order_by, cursor, with_total,
+        )
     
 
 
@@ -58,6 +65,10 @@ class CodesDtlService(BaseService):
     update_model: CodesDtlUpdate = CodesDtlUpdate
     return_schema: CodesDtlReturn = CodesDtlReturn
 
+    async def after_write(self) -> None:
+        # Headers embed their details
+        await reference_cache.invalidate(CODES_DTL, CODES_HDR)
+
     async def list(
             self,
             offset: int = 0,
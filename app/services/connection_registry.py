@@ -17,20 +17,16 @@ from app.models.data_source import DataSource
 from app.models.data_source_layout import DataSourceLayout
 from app.models.layout_fields import LayoutFields
 from app.utils.data_source_utils import get_text_embedding
-import asyncpg
-import aiomysql
 import oracledb
 from random import choices
 from string import ascii_lowercase, digits
-from typing import List, Optional
+from typing import Dict, List, Optional
 from app.connections.destination.models.connection_local import DestinationLocal
 from app.connections.destination.models.postgres import DestinationPostgres
 from app.connections.source.models.connection_local import SourceLocal
 from app.exceptions.connection_registry import NotValidConnectionType
 from fastapi import HTTPException
 from google.api_core.exceptions import NotFound
-from sqlalchemy import select, func
-from google.oauth2 import service_account
 from app.models.connection_registry import (
     ConnectionRegistry,
     ConnectionRegistryCreate,
@@ -51,6 +47,7 @@ from app.services.base import BaseService
 from app.services.aes import decrypt_string, encrypt_string
 from app.core.config import Config
 from app.utils.normalization import normalise_key, normalise_name
+from app.utils.source_pool import source_pools
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -112,6 +109,7 @@ class ConnectionConfigService(BaseService):
             init_vector=item_body.init_vector,
         )
         await self.make_secret(secret_body, existing_obj)
+        await source_pools.invalidate(id)
         return existing_obj
 
     async def make_secret(self, item_body: ConnectionConfigCreate, existing_obj: Optional[ConnectionConfig] = None) -> None:
@@ -235,6 +233,7 @@ class ConnectionConfigService(BaseService):
             await self.context.aws_service.secrets.delete_secret(secret_name)
         except NotFound:
             pass
+        await source_pools.invalidate(id)
         response = await super().delete(id, authorized=authorized)
         return response
     
@@ -254,85 +253,38 @@ class ConnectionConfigService(BaseService):
         conn_type = credentials['conn_type']
 
         try:
-            if conn_type == "postgres":
-                db_host = db_config['host']
-                db_port = db_config['port']
-                db_name = db_config['database']
-                db_user = db_config['username']
-                db_password = db_config['password']
-
-                # Connect to PostgreSQL
-                conn = await asyncpg.connect(
-                    host=db_host, port=db_port, database=db_name,
-                    user=db_user, password=db_password
-                )
-
-                # Fetch schemas from PostgreSQL
-                rows = await conn.fetch("SELECT schema_name FROM information_schema.schemata;")
-                schemas = [row['schema_name'] for row in rows]
-
-                await conn.close()
-
-            elif conn_type == "mysql":
-                db_host = db_config['host']
-                db_port = db_config['port']
-                db_user = db_config['username']
-                db_password = db_config['password']
-
-                # Connect to MySQL
-                conn = await aiomysql.connect(
-                    host=db_host, port=db_port,
-                    user=db_user, password=db_password
-                )
-                # Fecth MySQL lists databases, not schemas (because mysql does not support schemas)
-                async with conn.cursor() as cur:
-                    await cur.execute("SHOW DATABASES;")  
-                    rows = await cur.fetchall()
-                    schemas = [row[0] for row in rows]
-
-                conn.close()
-
-            elif conn_type == "oracle":
-                db_host = db_config.get('host')
-                db_port = db_config.get('port')
-                service_name = db_config.get('service_name')
-                sid = db_config.get('sid')
-                db_user = db_config.get('username')
-                db_password = db_config.get('password')
-
-                dsn = f"{db_host}:{db_port}/" + (service_name if service_name else sid)
-
-                try:
-                   
-                    conn = await asyncio.to_thread(oracledb.connect, user=db_user, password=db_password, dsn=dsn)       
-                    cur = await asyncio.to_thread(conn.cursor)
-                    await asyncio.to_thread(cur.execute, "SELECT username FROM all_users")
-                    rows = await asyncio.to_thread(cur.fetchall)
-                    schemas = [row[0] for row in rows]
+            async with source_pools.connection(id, conn_type, db_config) as conn:
+                if conn_type == "postgres":
+                    # Fetch schemas from PostgreSQL
+                    rows = await conn.fetch("SELECT schema_name FROM information_schema.schemata;")
+                    schemas = [row['schema_name'] for row in rows]
 
-                    await asyncio.to_thread(cur.close)
-                    await asyncio.to_thread(conn.close)
+                elif conn_type == "mysql":
+                    # Fecth MySQL lists databases, not schemas (because mysql does not support schemas)
+                    async with conn.cursor() as cur:
+                        await cur.execute("SHOW DATABASES;")  
+                        rows = await cur.fetchall()
+                        schemas = [row[0] for row in rows]
 
-                except oracledb.DatabaseError as e:
-                    raise HTTPException(status_code=500, detail=f"Oracle Database connection error: {str(e)}")
-                
-            elif conn_type == "bigquery":
-                # Fetch dataset IDs from BigQuery
+                elif conn_type == "oracle":
+                    try:
+                        cur = await asyncio.to_thread(conn.cursor)
+                        await asyncio.to_thread(cur.execute, "SELECT username FROM all_users")
+                        rows = await asyncio.to_thread(cur.fetchall)
+                        schemas = [row[0] for row in rows]
 
-                project_id = db_config["project_id"]
-                cred_info = db_config["credentials_json"] 
+                        await asyncio.to_thread(cur.close)
 
-                creds = service_account.Credentials.from_service_account_info(cred_info)
-                client = bigquery.Client(credentials=creds, project=project_id)
+                    except oracledb.DatabaseError as e:
+                        raise HTTPException(status_code=500, detail=f"Oracle Database connection error: {str(e)}")
 
-                datasets = list(client.list_datasets())
-                if datasets:
+                elif conn_type == "bigquery":
+                    # Fetch dataset IDs from BigQuery
+                    datasets = await asyncio.to_thread(lambda: list(conn.list_datasets()))
                     schemas = [dataset.dataset_id for dataset in datasets]
-                else:
-                    schemas = []
 
-            else:
-                raise HTTPException(status_code=400, detail="Unsupported database type")
+                else:
+                    raise HTTPException(status_code=400, detail="Unsupported database type")
 
             return schemas
 
@@ -345,94 +297,57 @@ class ConnectionConfigService(BaseService):
         db_config = credentials['config']
         conn_type = credentials['conn_type']
         if conn_type == "postgres":
-            db_host = db_config['host']
-            db_port = db_config['port']
-            db_name = db_config['database']
-            db_user = db_config['username']
-            db_password = db_config['password']
             try:
-                # Connect to PostgreSQL
-                conn = await asyncpg.connect(
-                    host=db_host, port=db_port, database=db_name,
-                    user=db_user, password=db_password
-                )
+                async with source_pools.connection(id, conn_type, db_config) as conn:
+                    query = """
+                    SELECT table_name 
+                    FROM information_schema.tables 
+                    WHERE table_schema = $1;
+                    """
+                    rows = await conn.fetch(query, schema)
+                    tables = [row['table_name'] for row in rows]
 
-                query = """
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = $1;
-                """
-                rows = await conn.fetch(query, schema)
-                tables = [row['table_name'] for row in rows]
-
-                await conn.close()
                 return tables
 
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"PostgreSQL connection error: {str(e)}")
 
         elif conn_type == "mysql":
-            db_host = db_config['host']
-            db_port = db_config['port']
-            db_user = db_config['username']
-            db_password = db_config['password']
-            db_name = db_config['database']  # MySQL uses database, not schema
-
             try:
-                # Connect to MySQL
-                conn = await aiomysql.connect(
-                    host=db_host, port=db_port, user=db_user,
-                    password=db_password, db=db_name
-                )
-
-                async with conn.cursor() as cur:
-                    await cur.execute("SHOW TABLES;")
-                    rows = await cur.fetchall()
-                    tables = [row[0] for row in rows]
+                # MySQL uses database, not schema
+                async with source_pools.connection(id, conn_type, db_config) as conn:
+                    async with conn.cursor() as cur:
+                        await cur.execute("SHOW TABLES;")
+                        rows = await cur.fetchall()
+                        tables = [row[0] for row in rows]
 
-                conn.close()
                 return tables
 
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"MySQL connection error: {str(e)}")
 
         elif conn_type == "oracle":
-            db_host = db_config['host']
-            db_port = db_config['port']
-            service_name = db_config.get('service_name')
-            sid = db_config.get('sid')
-            db_user = db_config['username']
-            db_password = db_config['password']
-            
-            dsn = f"{db_host}:{db_port}/" + (service_name if service_name else sid)
-
             try:
-                # Connect to Oracle 
-                conn = await asyncio.to_thread(oracledb.connect, user=db_user, password=db_password, dsn=dsn)
-                conn = await asyncio.to_thread(oracledb.connect, user=db_user, password=db_password, dsn=dsn)       
-                cur = await asyncio.to_thread(conn.cursor)
-                query = "SELECT table_name FROM all_tables WHERE owner = :1"
-                await asyncio.to_thread(cur.execute, query, (schema,))
-                rows = await asyncio.to_thread(cur.fetchall)
-                tables = [row[0] for row in rows]
-                conn.close()
+                async with source_pools.connection(id, conn_type, db_config) as conn:
+                    cur = await asyncio.to_thread(conn.cursor)
+                    query = "SELECT table_name FROM all_tables WHERE owner = :1"
+                    await asyncio.to_thread(cur.execute, query, (schema,))
+                    rows = await asyncio.to_thread(cur.fetchall)
+                    tables = [row[0] for row in rows]
+                    await asyncio.to_thread(cur.close)
                 return tables
 
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Oracle connection error: {str(e)}")
 
         elif conn_type == "bigquery":
-            project_id = db_config["project_id"]
-            cred_info = db_config["credentials_json"]  
             try:
-                creds = service_account.Credentials.from_service_account_info(cred_info)
-                client = bigquery.Client(credentials=creds, project=project_id)
-
                 if not schema:
                     raise HTTPException(status_code=400, detail="Schema (dataset) is required for BigQuery")
 
-                dataset_ref = client.dataset(schema)  # schema is the dataset name
-                tables = list(client.list_tables(dataset_ref))  
+                async with source_pools.connection(id, conn_type, db_config) as client:
+                    dataset_ref = client.dataset(schema)  # schema is the dataset name
+                    tables = await asyncio.to_thread(lambda: list(client.list_tables(dataset_ref)))
                 table_names = [table.table_id for table in tables]
 
                 return table_names
@@ -444,130 +359,122 @@ class ConnectionConfigService(BaseService):
             raise HTTPException(status_code=500, detail="Unsupported database type")
 
 
-    async def get_table_metadata(self, conn, conn_type, schema, table):
+    async def get_tables_metadata(self, conn, conn_type, schema, tables: List[str]) -> Dict[str, List[dict]]:
         """
-        Fetch table metadata for PostgreSQL, MySQL, and Oracle etc.
+        Fetch column metadata of all `tables` with one information_schema query
+        (per 1000 tables on Oracle) for PostgreSQL, MySQL, Oracle and BigQuery.
+        Returns the columns of each table in ordinal order.
         """
+        columns: Dict[str, List[dict]] = {table: [] for table in tables}
+        if not tables:
+            return columns
+
         if conn_type == "postgres":
             query = """
-            SELECT 
+            WITH pk AS (
+                SELECT kcu.table_name, kcu.column_name
+                FROM information_schema.table_constraints tc
+                JOIN information_schema.key_column_usage kcu
+                    ON kcu.constraint_name = tc.constraint_name
+                    AND kcu.constraint_schema = tc.constraint_schema
+                    AND kcu.table_name = tc.table_name
+                WHERE tc.constraint_type = 'PRIMARY KEY'
+                    AND tc.table_schema = $1 AND tc.table_name = ANY($2::text[])
+            )
+            SELECT
+                c.table_name,
                 c.column_name AS name,
                 c.data_type,
                 c.ordinal_position,
                 c.is_nullable,
                 c.column_default AS default,
                 c.character_maximum_length AS max_length,
-                CASE 
-                    WHEN kcu.column_name IS NOT NULL THEN TRUE 
-                    ELSE FALSE 
-                END AS is_primary_key
+                pk.column_name IS NOT NULL AS is_primary_key
             FROM information_schema.columns c
-            LEFT JOIN information_schema.key_column_usage kcu
-                ON c.table_name = kcu.table_name 
-                AND c.column_name = kcu.column_name 
-                AND c.table_schema = kcu.table_schema
-            LEFT JOIN information_schema.table_constraints tc
-                ON kcu.constraint_name = tc.constraint_name 
-                AND kcu.table_schema = tc.table_schema
-                AND tc.constraint_type = 'PRIMARY KEY'
-            WHERE c.table_schema = $1 AND c.table_name = $2;
+            LEFT JOIN pk
+                ON pk.table_name = c.table_name AND pk.column_name = c.column_name
+            WHERE c.table_schema = $1 AND c.table_name = ANY($2::text[])
+            ORDER BY c.table_name, c.ordinal_position;
             """
-            rows = await conn.fetch(query, schema, table)
+            rows = [tuple(row) for row in await conn.fetch(query, schema, list(tables))]
 
         elif conn_type == "mysql":
-            query = """
-            SELECT 
+            placeholders = ", ".join(["%s"] * len(tables))
+            query = f"""
+            SELECT
+                TABLE_NAME AS table_name,
                 COLUMN_NAME AS name,
                 DATA_TYPE AS data_type,
                 ORDINAL_POSITION AS ordinal_position,
                 IS_NULLABLE AS is_nullable,
                 COLUMN_DEFAULT AS `default`,  -- Use backticks to avoid syntax error
                 CHARACTER_MAXIMUM_LENGTH AS max_length,
-                CASE 
-                    WHEN COLUMN_KEY = 'PRI' THEN TRUE 
-                    ELSE FALSE 
+                CASE
+                    WHEN COLUMN_KEY = 'PRI' THEN TRUE
+                    ELSE FALSE
                 END AS is_primary_key
             FROM information_schema.columns
-            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s;
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders})
+            ORDER BY TABLE_NAME, ORDINAL_POSITION;
             """
-
             async with conn.cursor() as cur:
-                await cur.execute(query, (schema, table))
+                await cur.execute(query, (schema, *tables))
                 rows = await cur.fetchall()
-                columns = []
-                for row in rows:
-                    columns.append({
-                        "name": row[0],
-                        "data_type": row[1],
-                        "ordinal_position": row[2],
-                        "is_nullable": row[3],
-                        "default": row[4],
-                        "max_length": row[5],
-                        "is_primary_key": row[6],
-                    })
-                return columns
 
         elif conn_type == "oracle":
-            query = """
-            SELECT 
-                c.column_name AS name,
-                c.data_type,
-                c.column_id AS ordinal_position,
-                c.nullable AS is_nullable,
-                c.data_default AS "default",
-                c.data_length AS max_length,
-                CASE 
-                    WHEN pk.constraint_type = 'P' THEN 1 ELSE 0
-                END AS is_primary_key
-            FROM all_tab_columns c
-            LEFT JOIN (
-                SELECT cols.column_name, cons.constraint_type
-                FROM all_cons_columns cols
-                JOIN all_constraints cons 
-                    ON cols.constraint_name = cons.constraint_name 
-                    AND cons.owner = :1  -- Ensure correct schema filter
-                WHERE cons.constraint_type = 'P' 
-                    AND cols.table_name = :2
-            ) pk ON c.column_name = pk.column_name
-            WHERE c.owner = :1 AND c.table_name = :2
-            """
-
-            cur = await asyncio.to_thread(conn.cursor)      
-            await asyncio.to_thread(cur.execute, query, (schema, table, schema, table)) 
-
-            rows = await asyncio.to_thread(cur.fetchall)
-            columns = []
-            for row in rows:
-                columns.append({
-                    "name": row[0],
-                    "data_type": row[1],
-                    "ordinal_position": row[2],
-                    "is_nullable": row[3],
-                    "default": row[4],
-                    "max_length": row[5],
-                    "is_primary_key": row[6],
-                })
-            return columns
+            rows = []
+            # Oracle allows at most 1000 expressions in an IN list
+            for start in range(0, len(tables), 1000):
+                chunk = list(tables)[start:start + 1000]
+                binds = {f"t{i}": table for i, table in enumerate(chunk)}
+                placeholders = ", ".join(f":{name}" for name in binds)
+                query = f"""
+                SELECT
+                    c.table_name,
+                    c.column_name AS name,
+                    c.data_type,
+                    c.column_id AS ordinal_position,
+                    c.nullable AS is_nullable,
+                    c.data_default AS "default",
+                    c.data_length AS max_length,
+                    CASE
+                        WHEN pk.column_name IS NOT NULL THEN 1 ELSE 0
+                    END AS is_primary_key
+                FROM all_tab_columns c
+                LEFT JOIN (
+                    SELECT cols.table_name, cols.column_name
+                    FROM all_cons_columns cols
+                    JOIN all_constraints cons
+                        ON cols.owner = cons.owner
+                        AND cols.constraint_name = cons.constraint_name
+                    WHERE cons.constraint_type = 'P'
+                        AND cons.owner = :owner
+                ) pk ON pk.table_name = c.table_name AND pk.column_name = c.column_name
+                WHERE c.owner = :owner AND c.table_name IN ({placeholders})
+                ORDER BY c.table_name, c.column_id
+                """
+                cur = await asyncio.to_thread(conn.cursor)
+                await asyncio.to_thread(cur.execute, query, {"owner": schema, **binds})
+                rows.extend(await asyncio.to_thread(cur.fetchall))
+                await asyncio.to_thread(cur.close)
 
         elif conn_type == "bigquery":
             try:
                 query = f"""
-                SELECT column_name AS name, data_type, ordinal_position, is_nullable
+                SELECT table_name, column_name AS name, data_type, ordinal_position, is_nullable
                 FROM `{schema}.INFORMATION_SCHEMA.COLUMNS`
-                WHERE table_name = '{table}'
-                ORDER BY ordinal_position;
+                WHERE table_name IN UNNEST(@tables)
+                ORDER BY table_name, ordinal_position;
                 """
-                query_job = conn.query(query)
-                rows = query_job.result()
-                return [{
-                    "name": row["name"],
-                    "data_type": row["data_type"],
-                    "ordinal_position": row["ordinal_position"],
-                    "is_nullable": row["is_nullable"] == "YES",
-                    "default": None,
-                    "max_length": None,
-                    "is_primary_key": False
-                } for row in rows]
+                job_config = bigquery.QueryJobConfig(
+                    query_parameters=[bigquery.ArrayQueryParameter("tables", "STRING", list(tables))]
+                )
+                result = await asyncio.to_thread(lambda: list(conn.query(query, job_config=job_config).result()))
+                rows = [
+                    (row["table_name"], row["name"], row["data_type"], row["ordinal_position"],
+                     row["is_nullable"] == "YES", None, None, False)
+                    for row in result
+                ]
 
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"BigQuery metadata error: {str(e)}")
@@ -575,158 +482,140 @@ class ConnectionConfigService(BaseService):
         else:
             raise HTTPException(status_code=500, detail="Unsupported database type")
 
-        return [dict(row) for row in rows]
-    
-    async def get_table_relationships(self, conn, conn_type, schema, table):
+        for row in rows:
+            table = row[0]
+            if table not in columns:
+                continue
+            columns[table].append({
+                "name": row[1],
+                "data_type": row[2],
+                "ordinal_position": row[3],
+                "is_nullable": row[4],
+                "default": row[5],
+                "max_length": row[6],
+                "is_primary_key": bool(row[7]),
+            })
+        return columns
+
+    async def get_tables_relationships(self, conn, conn_type, schema, tables: List[str]) -> Dict[str, str]:
         """
-        Fetch table relationships (one-to-one, one-to-many, many-to-one, many-to-many)
-        for PostgreSQL, MySQL, and Oracle.
+        Fetch the foreign keys of `schema` once for PostgreSQL, MySQL and Oracle
+        and return the related tables of each of `tables` as a comma separated string.
         """
         if conn_type == "postgres":
             query = """
-            SELECT DISTINCT ccu.table_name AS related_table
+            SELECT DISTINCT kcu.table_name AS child_table, ccu.table_name AS parent_table
             FROM information_schema.table_constraints tc
             JOIN information_schema.key_column_usage kcu
                 ON tc.constraint_name = kcu.constraint_name AND tc.table_schema = kcu.table_schema
             JOIN information_schema.constraint_column_usage ccu
                 ON ccu.constraint_name = tc.constraint_name AND ccu.table_schema = tc.table_schema
             WHERE tc.constraint_type = 'FOREIGN KEY'
-                AND (kcu.table_name = $1 OR ccu.table_name = $1)
-                AND tc.table_schema = $2;
+                AND tc.table_schema = $1;
             """
-            rows = await conn.fetch(query, table, schema)
-        
+            edges = [tuple(row) for row in await conn.fetch(query, schema)]
+
         elif conn_type == "mysql":
             query = """
-            SELECT DISTINCT REFERENCED_TABLE_NAME AS related_table
+            SELECT DISTINCT TABLE_NAME AS child_table, REFERENCED_TABLE_NAME AS parent_table
             FROM information_schema.KEY_COLUMN_USAGE
-            WHERE (TABLE_NAME = %s OR REFERENCED_TABLE_NAME = %s)
-                AND TABLE_SCHEMA = %s
+            WHERE TABLE_SCHEMA = %s
                 AND REFERENCED_TABLE_NAME IS NOT NULL;
             """
             async with conn.cursor() as cur:
-                await cur.execute(query, (table, table, schema))
-                rows = await cur.fetchall()
-        
+                await cur.execute(query, (schema,))
+                edges = await cur.fetchall()
+
         elif conn_type == "oracle":
             query = """
-            SELECT DISTINCT a.TABLE_NAME AS related_table
-            FROM all_cons_columns a
-            JOIN all_constraints c
-                ON a.constraint_name = c.constraint_name
+            SELECT DISTINCT c.table_name AS child_table, p.table_name AS parent_table
+            FROM all_constraints c
+            JOIN all_constraints p
+                ON p.owner = c.r_owner AND p.constraint_name = c.r_constraint_name
             WHERE c.constraint_type = 'R'
-                AND c.OWNER = :1
-                AND (a.table_name = :2 OR a.table_name IN (
-                    SELECT table_name FROM all_cons_columns WHERE constraint_name = c.r_constraint_name
-                ));
+                AND c.owner = :owner
             """
             cur = await asyncio.to_thread(conn.cursor)
-            await asyncio.to_thread(cur.execute, query, (schema, table))
-            rows = await asyncio.to_thread(cur.fetchall)
-        
-        elif conn_type == "bigquery":
-            # BigQuery does not explicitly store relationships in INFORMATION_SCHEMA
-            rows = []  # No direct query available
-        
-        else:
-            return ""
-        
-        related_tables = [row[0] for row in rows]
-        return ", ".join(related_tables) if related_tables else ""
+            await asyncio.to_thread(cur.execute, query, {"owner": schema})
+            edges = await asyncio.to_thread(cur.fetchall)
+            await asyncio.to_thread(cur.close)
 
+        else:
+            # BigQuery does not explicitly store relationships in INFORMATION_SCHEMA
+            edges = []
+
+        # Same result as the former per table lookup: the tables a table references,
+        # plus the table itself when other tables reference it
+        related: Dict[str, set] = {table: set() for table in tables}
+        for child_table, parent_table in edges:
+            if child_table in related:
+                related[child_table].add(parent_table)
+            if parent_table in related:
+                related[parent_table].add(parent_table)
+        return {table: ", ".join(sorted(names)) for table, names in related.items()}
 
     async def create_data_source_and_layout_for_each_table(self, connection_config_id: int, schema: str, tables: list, bh_project_id: int, authorized: dict = None):
         """
-        Create DataSource and Layout for tables in PostgreSQL, MySQL, and Oracle.
+        Create DataSource and Layout for tables in PostgreSQL, MySQL, Oracle and BigQuery.
+        Source metadata is read with one query per kind for all tables and the catalog
+        rows are written with multi-row INSERTs, ids come from the table sequences.
         """
+        tables = list(dict.fromkeys(tables))
+        created_by = authorized['user_detail_id'] if authorized else None
         created_data_sources = []
-        async with self.context.db_session as session:
-            try:
-                last_id_query = select(func.max(DataSource.data_src_id))
-                last_layout_field_id_query = select(func.max(LayoutFields.lyt_fld_id))
-                result = await session.execute(last_id_query)
-                field_result = await session.execute(last_layout_field_id_query)
-                last_id = result.scalar()  
-                field_last_id = field_result.scalar()
-                last_id = last_id if last_id is not None else 0 
-                field_last_id = field_last_id if field_last_id is not None else 0
-
-                field_last_id = field_last_id + 1
-                new_id = last_id + 1  
-                credentials = await self.get_credentials(connection_config_id)
-                db_config = credentials.get('config')
-                conn_type = credentials.get('conn_type')
-                db_host = db_config.get('host')
-                db_port = db_config.get('port')
-                db_user = db_config.get('username')
-                db_password = db_config.get('password')
-                db_name = db_config.get('database')  # MySQL/Oracle compatibility
-                service_name = db_config.get('service_name')
-                sid = db_config.get('sid')
-
-                if conn_type == "postgres":
-                    conn = await asyncpg.connect(
-                        host=db_host, port=db_port, database=db_name, 
-                        user=db_user, password=db_password
-                    )
+        data_source_ids = []
 
-                elif conn_type == "mysql":
-                    conn = await aiomysql.connect(
-                        host=db_host, port=db_port, user=db_user,
-                        password=db_password, db=db_name
-                    )
+        credentials = await self.get_credentials(connection_config_id)
+        db_config = credentials.get('config')
+        conn_type = credentials.get('conn_type')
+        async with source_pools.connection(connection_config_id, conn_type, db_config) as conn:
+            relationships = await self.get_tables_relationships(conn, conn_type, schema, tables)
+            columns = await self.get_tables_metadata(conn, conn_type, schema, tables)
 
-                elif conn_type == "oracle":
-                    dsn = f"{db_host}:{db_port}/" + (service_name if service_name else sid)
-                    conn = await asyncio.to_thread(oracledb.connect, user=db_user, password=db_password, dsn=dsn)
-                elif conn_type == "bigquery":
-                    project_id = db_config["project_id"]
-                    cred_info = db_config["credentials_json"]  
-                    creds = service_account.Credentials.from_service_account_info(cred_info)
-                    conn = bigquery.Client(credentials=creds, project=project_id)
+        async with self.context.db_session as session:
+            try:
+                data_source_rows = await self.bulk_insert(
+                    [
+                        dict(
+                            data_src_name=table,
+                            connection_config_id=connection_config_id,
+                            data_src_status_cd=1,
+                            data_src_status=Status.ACTIVE.value,
+                            created_by=created_by,
+                            bh_project_id=bh_project_id,
+                            data_src_key=f"{bh_project_id}_{table}",
+                            data_src_relationships=relationships[table],
+                        )
+                        for table in tables
+                    ],
+                    model=DataSource,
+                    returning=("data_src_id", "data_src_name"),
+                )
+                data_source_id_by_table = {name: data_src_id for data_src_id, name in data_source_rows}
+
+                layout_rows = await self.bulk_insert(
+                    [
+                        dict(
+                            data_src_id=data_source_id_by_table[table],
+                            data_src_lyt_name=table,
+                            data_src_lyt_fmt_cd=1,
+                            data_src_lyt_type_cd=1,
+                            data_src_lyt_is_mandatory=True,
+                            data_src_lyt_key=f"{bh_project_id}_{table}",
+                            created_by=created_by,
+                        )
+                        for table in tables
+                    ],
+                    model=DataSourceLayout,
+                    returning=("data_src_lyt_id", "data_src_id"),
+                )
+                layout_id_by_data_source = {data_src_id: lyt_id for lyt_id, data_src_id in layout_rows}
 
-                else:
-                    raise HTTPException(status_code=500, detail="Unsupported database type")
-                data_source_ids = []
+                field_rows = []
                 for table in tables:
-                    relationships = await self.get_table_relationships(conn, conn_type, schema, table)
-                    data_source = DataSource(
-                        data_src_id=new_id,
-                        data_src_name=table,
-                        connection_config_id=connection_config_id,
-                        data_src_status_cd=1,
-                        data_src_status=Status.ACTIVE.value,
-                        created_by=authorized['user_detail_id'] if authorized else None,
-                        bh_project_id=bh_project_id,
-                        data_src_key=f"{bh_project_id}_{table}",
-                        data_src_relationships=relationships
-                    )
-                    if authorized:
-                        data_source = self.insert_user_fields(data_source, authorized, type="create")
-
-                    session.add(data_source)
-                    await session.flush()
-
-                    data_layout = DataSourceLayout(
-                        data_src_id=data_source.data_src_id,
-                        data_src_lyt_name=table,
-                        data_src_lyt_fmt_cd=1,
-                        data_src_lyt_type_cd=1,
-                        data_src_lyt_is_mandatory=True,
-                        data_src_lyt_key=f"{bh_project_id}_{table}",
-                        created_by=authorized['user_detail_id'] if authorized else None,
-                    )
-                    session.add(data_layout)
-                    await session.flush()
-                    created_data_sources.append({
-                        "data_src_id": data_source.data_src_id,
-                        "table": table
-                    })
-
-                    columns = await self.get_table_metadata(conn, conn_type, schema, table)
-                    for column in columns:
-                        layout_field = LayoutFields(
-                            lyt_fld_id=field_last_id,
+                    data_src_id = data_source_id_by_table[table]
+                    for column in columns[table]:
+                        field_rows.append(dict(
                             lyt_fld_name=column['name'],
                             lyt_fld_order=column['ordinal_position'],
                             lyt_fld_is_pk=column['is_primary_key'],
@@ -734,17 +623,16 @@ class ConnectionConfigService(BaseService):
                             lyt_fld_data_type=self.map_column_data_type(column['data_type']),
                             lyt_fld_source_data_type=column['data_type'],
                             lyt_fld_key=normalise_name(column['name']),
-                            lyt_id=data_layout.data_src_lyt_id,
-                            created_by=authorized['user_detail_id'] if authorized else None,
+                            lyt_id=layout_id_by_data_source[data_src_id],
+                            created_by=created_by,
                             lyt_fld_length=column['max_length'],
-                        )
-                        session.add(layout_field)
-                        field_last_id += 1
-                    data_source_ids.append(new_id)
-                    new_id += 1        
+                        ))
+                    created_data_sources.append({"data_src_id": data_src_id, "table": table})
+                    data_source_ids.append(data_src_id)
+                await self.bulk_insert(field_rows, model=LayoutFields)
+
                 await session.commit()
-                conn.close()
-                
+
             except Exception as e:
                 await session.rollback()
                 raise Exception(f"Error creating data source and layout: {str(e)}")
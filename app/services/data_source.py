@@ -1,16 +1,19 @@
+import asyncio
 import json
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, List, Optional
 from app.core.config import Config
+from app.enums.pagination import TotalCount
 from app.models.data_source_layout import DataSourceLayout
 from app.models.layout_fields import LayoutFields
+from app.utils.agent_client import agent_client
 from app.utils.data_source_utils import get_query_embedding, get_text_embedding
-from sqlalchemy import select, join, and_, desc, or_, String, cast, func, text
-from sqlalchemy.orm import joinedload
+from app.utils.embedding_client import embedding_client
+from app.utils.vector_utils import fit_dimensions, tune_vector_search
+from sqlalchemy import select, join, and_, desc, or_, String, cast, func, text, bindparam, update
 from app.models.bh_project import BHProject, LakeZone
 import pgvector
 from typing import Dict
 from sqlalchemy.dialects.postgresql import ARRAY
-import httpx
 from app.models.data_source import (
     DataSource,
     DataSourceCreate,
@@ -24,7 +27,6 @@ from app.models.data_source import (
 from app.services.base import BaseService
 from app.core.context import Context
 from fastapi import HTTPException
-import numpy as np
 
 class DataSourceService(BaseService):
     model: DataSource = DataSource
@@ -33,6 +35,15 @@ class DataSourceService(BaseService):
     return_schema: DataSourceReturn = DataSourceReturn
     name_field: str = 'data_src_name'
     key_field: str = 'data_src_key'
+    search_fields = ('data_src_name', 'data_src_desc')
+    load_profiles = {
+        "detail": ("data_source_metadata", "data_source_layout", "connection_config"),
+        "list": ("bh_project", "data_source_metadata", "data_source_layout", "connection_config"),
+    }
+    return_profile = "detail"
+    # Similarity floor and per leg percentile cut of the semantic searches
+    SEMANTIC_MIN_SIMILARITY = 0.4
+    SEMANTIC_PERCENTILE = 0.7
 
     def __init__(self, context: Context):
         super().__init__(context)
@@ -41,46 +52,56 @@ class DataSourceService(BaseService):
         query = select(DataSource).filter(or_(DataSource.is_deleted == False, DataSource.is_deleted == None))
 
         vector_search_fields = ['data_src_name', 'data_src_desc']
-        embedding_field = None
+        embedding = None
         for field, search_key in params.items():
             model_field = getattr(DataSource, field)
 
-            if model_field.type == String:
-                query = query.filter(or_(*[model_field.ilike(f'%{key}%') for key in search_key]))
-
-            elif field in vector_search_fields:
+            if field in vector_search_fields:
                 embedding = await get_text_embedding(search_key[0], "")
 
-        if embedding:
-            # Add the cosine similarity filtering and ordering to the query
-
-            # embed_query = "SELECT data_src_embeddings <-> ${embedding}::vector AS distance FROM catalogdb.data_source LIMIT 10; "
-            embedding_str = f'{embedding}'  # Ensure it's a properly formatted string for SQL
-
-            # Use the embedding string in the query directly
-            threshold = 0.8  # Set threshold for meaningful matches
-            embed_query = f"""
-                SELECT *, data_src_embeddings <-> '{embedding_str}'::vector AS distance
-                FROM catalogdb.data_source
-                WHERE data_src_embeddings <-> '{embedding_str}'::vector < '{threshold}'  -- Filter by distance threshold
-                ORDER BY distance ASC
-                LIMIT 10;
-            """
-        
-            # results = await self.context.db_session.execute(text(embed_query), {"embedding": embedding_str})
-            results = await self.context.db_session.execute(text(embed_query))
-
-            # Retrieve all rows
-            rows =  results.fetchall()
-
+            elif isinstance(model_field.type, String):
+                query = query.filter(or_(*[model_field.ilike(f'%{key}%') for key in search_key]))
 
-            data = [row for row in rows]
+        if embedding:
+            return await self.nearest(
+                DataSource.data_src_embeddings, embedding, limit=10, max_distance=Config.VECTOR_MAX_DISTANCE
+            )
 
-        # Return results as DataSourceReturn
-        return data
-        # return [DataSourceReturn.from_orm(result) for result in results.scalars()]
+        results = await self.context.db_session.execute(self.with_profile(query, self.return_profile))
+        return [DataSourceReturn.from_orm(result) for result in results.scalars()]
 
-    
+    async def nearest(
+            self,
+            column,
+            embedding: List[float],
+            limit: Optional[int] = None,
+            max_distance: Optional[float] = None,
+            connection_config_id: Optional[int] = None,
+            bh_project_id: Optional[int] = None,
+        ) -> list:
+        """ Data sources closest to `embedding` on an embedding column by cosine distance.
+            The ORDER BY is the bare distance so the HNSW index can serve it,
+            `connection_config_id` and `bh_project_id` are applied as filters
+            in the same scan.
+        Args:
+            column: InstrumentedAttribute: DataSource.data_src_embeddings or data_src_relationships_embeddings
+            max_distance: float: Drop rows further away than this"""
+        distance = column.cosine_distance(fit_dimensions(embedding, column.type.dim)).label('distance')
+        query = (
+            select(*self.select_columns(), distance)
+            .where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+        )
+        if connection_config_id is not None:
+            query = query.where(self.model.connection_config_id == connection_config_id)
+        if bh_project_id is not None:
+            query = query.where(self.model.bh_project_id == bh_project_id)
+        if max_distance is not None:
+            query = query.where(distance < max_distance)
+        query = query.order_by(distance).limit(limit or Config.VECTOR_SEARCH_CANDIDATES)
+
+        await tune_vector_search(self.context.db_session, Config.VECTOR_EF_SEARCH, Config.VECTOR_ITERATIVE_SCAN)
+        results = await self.context.db_session.execute(query)
+        return results.fetchall()
 
     async def check_source_exists(
             self,
@@ -254,10 +275,12 @@ class DataSourceService(BaseService):
             limit: int = 10,
             order_by: Optional[str] = None,
             order_desc: bool = False,
+            cursor: Optional[str] = None,
+            with_total: Optional[TotalCount] = None,
             **kwargs,
             ) -> List[return_schema]:
         
-        query = select(self.model).options(joinedload(self.model.bh_project)).where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+        query = select(self.model).where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
 
         # To provide filter on input fields
         for kw in kwargs.keys():
@@ -265,23 +288,36 @@ class DataSourceService(BaseService):
                 if kwargs[kw] is not None:
                     query = query.where(getattr(self.model, kw) == kwargs[kw])
 
-        query = query.offset(offset).limit(limit)
-        
-        if order_by:
-            order_expression = getattr(self.model, order_by)
-            if order_desc:
-                order_expression = desc(order_expression)
-            query = query.order_by(order_expression)
+        paged_query = self.paginate(query, offset, limit, order_by, order_desc, cursor)
 
-        results = await self.context.db_session.execute(query)
+        results = await self.context.db_session.execute(self.with_profile(paged_query, "list"))
 
-        return [
-            self.return_schema(
-                **vars(result),  
-                bh_project_name=result.bh_project.bh_project_name if result.bh_project else None
-            )
-            for result in results.scalars()
-        ]
+        rows = results.scalars().all()
+
+        return await self.make_page(
+            [self.list_item(result) for result in rows],
+            rows, query, limit, order_by, cursor, with_total,
+        )
+
+    async def stream_list(
+            self,
+            offset: int = 0,
+            limit: int = 10,
+            order_by: Optional[str] = None,
+            order_desc: bool = False,
+            cursor: Optional[str] = None,
+            **kwargs,
+            ) -> AsyncIterator[DataSourceReturn]:
+        """ Rows of `list`, with the same "list" profile and `bh_project_name`, yielded as they are fetched."""
+        paged_query = self.stream_list_query(offset, limit, order_by, order_desc, cursor, **kwargs)
+        async for result in self.stream_scalars(self.with_profile(paged_query, "list")):
+            yield self.list_item(result)
+
+    def list_item(self, result: DataSource) -> DataSourceReturn:
+        return self.return_schema(
+            **vars(result),
+            bh_project_name=result.bh_project.bh_project_name if result.bh_project else None
+        )
     
     async def list_by_fields(
             self,
@@ -293,7 +329,26 @@ class DataSourceService(BaseService):
             **kwargs,
         ) -> List[dict]:  # Return a list of dictionaries instead of schema objects
 
-        query = select(self.model).options(joinedload(self.model.bh_project)).where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+        # Convert `fields` from string to list, ensuring it's never None
+        selected_fields = fields.split(",") if fields else []
+
+        # Only real columns of the model can be projected. Without a valid
+        # selection every column is returned except the deferred embeddings,
+        # which are only sent when asked for explicitly.
+        table_columns = self.model.__table__.columns
+        valid_selected_fields = [field for field in selected_fields if field in table_columns]
+        columns = [table_columns[field] for field in valid_selected_fields] or self.select_columns()
+
+        # Include `bh_project_name` only if requested
+        include_project_name = "bh_project_name" in selected_fields or not selected_fields
+        if include_project_name:
+            query = select(*columns, BHProject.bh_project_name).select_from(self.model).outerjoin(
+                BHProject, self.model.bh_project_id == BHProject.bh_project_id
+            )
+        else:
+            query = select(*columns)
+
+        query = query.where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
 
         # Apply filters based on input fields
         for kw in kwargs.keys():
@@ -311,40 +366,10 @@ class DataSourceService(BaseService):
             query = query.order_by(order_expression)
 
         results = await self.context.db_session.execute(query)
-        results = results.scalars().all()
 
-        # Debug: Print what we are getting in `fields`
-        print(f"Received fields: {fields}")
-
-        # Convert `fields` from string to list, ensuring it's never None
-        selected_fields = fields.split(",") if fields else []
-        print(f"Parsed selected fields: {selected_fields}")
-
-        # Ensure fields exist in the model
-        model_columns = {column.name for column in self.model.__table__.columns}
-
-        # Filter only valid fields
-        valid_selected_fields = [field for field in selected_fields if field in model_columns]
-        print(f"Valid selected fields: {valid_selected_fields}")
-
-        response = []
-        for result in results:
-            if valid_selected_fields:
-                formatted_data = {field: getattr(result, field, None) for field in valid_selected_fields}
-            else:
-                formatted_data = {column: getattr(result, column, None) for column in model_columns}
-
-            # Include `bh_project_name` only if requested
-            if "bh_project_name" in selected_fields or not selected_fields:
-                formatted_data["bh_project_name"] = result.bh_project.bh_project_name if result.bh_project else None
-
-            response.append(formatted_data)
-
-        return response
+        return [dict(row) for row in results.mappings()]
     
     async def vector_search(self, params: Dict[str, str]) -> List[DataSourceReturn]:
-        query = select(DataSource).filter(or_(DataSource.is_deleted == False, DataSource.is_deleted == None))
-
         parts = params.split(',')
     
         result_params = {
@@ -353,35 +378,18 @@ class DataSourceService(BaseService):
         }
 
         embedding = await get_text_embedding(result_params["data_src_name"], result_params["data_src_desc"])
+        if not embedding:
+            return []
 
-        if embedding:
-            # Add the cosine similarity filtering and ordering to the query
-
-            # embed_query = "SELECT data_src_embeddings <-> ${embedding}::vector AS distance FROM catalogdb.data_source LIMIT 10; "
-            embedding_str = f'{embedding}'  # Ensure it's a properly formatted string for SQL
-
-            # Use the embedding string in the query directly
-            threshold = 0.8 
-            embed_query = f"""
-                SELECT *, data_src_embeddings <-> '{embedding_str}'::vector AS distance
-                FROM catalogdb.data_source
-                WHERE data_src_embeddings <-> '{embedding_str}'::vector < '{threshold}'  -- Filter by distance threshold
-                ORDER BY distance ASC
-                LIMIT 10;
-            """
-        
-            results = await self.context.db_session.execute(text(embed_query))
-
-            # Retrieve all rows
-            rows =  results.fetchall()
-
-
-            data = [row for row in rows]
-        return data
+        return await self.nearest(
+            DataSource.data_src_embeddings, embedding, limit=10, max_distance=Config.VECTOR_MAX_DISTANCE
+        )
     
     async def create_description(self, request: List[int]) -> dict:
         """
         Generate descriptions for multiple data sources and their columns using LLM.
+        The agent calls of all data sources run concurrently (AI_AGENT_MAX_CONCURRENCY
+        at a time) and the descriptions are written with one UPDATE per table.
 
         Args:
             request (List[int]): List of data source IDs.
@@ -390,71 +398,83 @@ class DataSourceService(BaseService):
             dict: Generated descriptions without updating embeddings.
         """
         try:
-            cfg = Config()
             stmt = select(DataSource).where(DataSource.data_src_id.in_(request))
             data_sources = (await self.context.db_session.execute(stmt)).scalars().all()
 
             if not data_sources:
                 raise HTTPException(status_code=404, detail="No matching data sources found")
 
-            results = {}
-
-            async with httpx.AsyncClient() as client:
-                for ds in data_sources:
-                    
-                    stmt = select(LayoutFields).join(DataSourceLayout).where(DataSourceLayout.data_src_id == ds.data_src_id)
-                    layout_fields = (await self.context.db_session.execute(stmt)).scalars().all()
-
-                    ds_payload = {
-                        "operation_type": "datasource_description",
-                        "params": {
+            # Layout fields of every data source in one query
+            fields_by_source = {ds.data_src_id: [] for ds in data_sources}
+            stmt = (
+                select(DataSourceLayout.data_src_id, LayoutFields)
+                .join(DataSourceLayout)
+                .where(DataSourceLayout.data_src_id.in_(list(fields_by_source)))
+                .order_by(LayoutFields.lyt_fld_id)
+            )
+            for data_src_id, lf in (await self.context.db_session.execute(stmt)).all():
+                fields_by_source[data_src_id].append(lf)
+
+            async def describe(ds: DataSource):
+                layout_fields = fields_by_source[ds.data_src_id]
+                return await asyncio.gather(
+                    agent_client.run(
+                        "datasource_description",
+                        {
                             "schema": ", ".join(
                                 [f"{lf.lyt_fld_name}: {lf.lyt_fld_data_type}" for lf in layout_fields]
                             ),
                             "target_column": ds.data_src_name
                         },
-                        "thread_id": f"ds_{ds.data_src_id}"
-                    }
-
-                    response = await client.post(cfg.BH_AI_AGENT_URL, json=ds_payload)
-
-                    if response.status_code != 200:
-                        continue
-
-                    ds_data = response.json()
-                    ds_data = json.loads(ds_data.get("result", {}))
-
-                    generated_description = ds_data.get("description")
-
-                    if generated_description:
-                        ds.data_src_desc = generated_description
-                        results[ds.data_src_id] = {"data_source_description": generated_description}
-
-                    column_payload = {
-                        "operation_type": "column_description",
-                        "params": {
+                        thread_id=f"ds_{ds.data_src_id}",
+                    ),
+                    agent_client.run(
+                        "column_description",
+                        {
                             "source_name": ds.data_src_name,
                             "columns": [
                                 {"name": lf.lyt_fld_name, "data_type": lf.lyt_fld_data_type}
                                 for lf in layout_fields
                             ]
                         },
-                        "thread_id": f"columns_ds_{ds.data_src_id}"
-                    }
-                    column_response = await client.post(cfg.BH_AI_AGENT_URL, json=column_payload)
-
-                    if column_response.status_code != 200:
-                        continue
-
-                    column_data = column_response.json()
-                    column_data = json.loads(column_data.get("result", "{}"))
-                    column_descriptions = column_data.get("descriptions", [])
-                    for col_desc in column_descriptions:
-                        for lf in layout_fields:
-                            if lf.lyt_fld_name == col_desc.get("column_name"):
-                                lf.lyt_fld_desc = col_desc.get("description")
-                    
-                    results[ds.data_src_id]["column_descriptions"] = column_descriptions
+                        thread_id=f"columns_ds_{ds.data_src_id}",
+                    ),
+                )
+
+            described = await asyncio.gather(*(describe(ds) for ds in data_sources))
+
+            results = {}
+            source_updates, field_updates = [], []
+            for ds, (ds_data, column_data) in zip(data_sources, described):
+                generated_description = (ds_data or {}).get("description")
+                if generated_description:
+                    source_updates.append({"b_id": ds.data_src_id, "b_desc": generated_description})
+                    results[ds.data_src_id] = {"data_source_description": generated_description}
+
+                if column_data is None:
+                    continue
+                column_descriptions = column_data.get("descriptions", [])
+                for col_desc in column_descriptions:
+                    for lf in fields_by_source[ds.data_src_id]:
+                        if lf.lyt_fld_name == col_desc.get("column_name"):
+                            field_updates.append({"b_id": lf.lyt_fld_id, "b_desc": col_desc.get("description")})
+                results.setdefault(ds.data_src_id, {})["column_descriptions"] = column_descriptions
+
+            data_source_table, layout_fields_table = DataSource.__table__, LayoutFields.__table__
+            if source_updates:
+                await self.context.db_session.execute(
+                    update(data_source_table)
+                    .where(data_source_table.c.data_src_id == bindparam("b_id"))
+                    .values(data_src_desc=bindparam("b_desc")),
+                    source_updates,
+                )
+            if field_updates:
+                await self.context.db_session.execute(
+                    update(layout_fields_table)
+                    .where(layout_fields_table.c.lyt_fld_id == bindparam("b_id"))
+                    .values(lyt_fld_desc=bindparam("b_desc")),
+                    field_updates,
+                )
             await self.context.db_session.commit()
             return {"message": "Data source and column descriptions updated successfully", "results": results}
 
@@ -470,31 +490,39 @@ class DataSourceService(BaseService):
             if not data_sources:
                 raise HTTPException(status_code=404, detail="No matching data sources found")
 
+            data_sources = [ds for ds in data_sources if ds.data_src_desc and ds.data_src_relationships]
+
+            # Layout fields of every data source in one query
+            fields_by_source = {ds.data_src_id: [] for ds in data_sources}
+            if fields_by_source:
+                stmt = (
+                    select(DataSourceLayout.data_src_id, LayoutFields)
+                    .join(DataSourceLayout)
+                    .where(DataSourceLayout.data_src_id.in_(list(fields_by_source)))
+                    .order_by(LayoutFields.lyt_fld_id)
+                )
+                for data_src_id, lf in (await self.context.db_session.execute(stmt)).all():
+                    if lf.lyt_fld_desc:  # Skip if no description exists
+                        fields_by_source[data_src_id].append(lf)
+
+            # All texts go to the embedding client at once, it batches them and
+            # skips the ones embedded before
+            texts = []
+            for ds in data_sources:
+                texts += [ds.data_src_name, ds.data_src_desc, ds.data_src_relationships]
+                for lf in fields_by_source[ds.data_src_id]:
+                    texts += [lf.lyt_fld_name, lf.lyt_fld_desc]
+            embeddings = iter(await embedding_client.embed(texts))
+
             results = {}
             for ds in data_sources:
-                if not ds.data_src_desc:  
-                    continue
-                if not ds.data_src_relationships:
-                    continue
-                
-                # get embedding for data source description
-                ds_embedding = await get_text_embedding(ds.data_src_name, ds.data_src_desc, ds.data_src_relationships)
-                ds.data_src_embeddings = ds_embedding[0] + ds_embedding[1]
-                ds.data_src_relationships_embeddings = ds_embedding[2]
-                # Fetch layout fields
-                stmt = select(LayoutFields).join(DataSourceLayout).where(DataSourceLayout.data_src_id == ds.data_src_id)
-                layout_fields = (await self.context.db_session.execute(stmt)).scalars().all()
+                name_embedding, desc_embedding, relationships_embedding = next(embeddings), next(embeddings), next(embeddings)
+                ds.data_src_embeddings = name_embedding + desc_embedding
+                ds.data_src_relationships_embeddings = relationships_embedding
 
                 column_results = []
-
-                for lf in layout_fields:
-                    if not lf.lyt_fld_desc:  # Skip if no description exists
-                        continue
-
-                    # get embedding for column description
-                    col_embedding = await get_text_embedding(lf.lyt_fld_name, lf.lyt_fld_desc)
-                    lf.lyt_fld_embedding = col_embedding 
-
+                for lf in fields_by_source[ds.data_src_id]:
+                    lf.lyt_fld_embedding = next(embeddings) + next(embeddings)
                     column_results.append({"column_name": lf.lyt_fld_name, "embedding_updated": True})
 
                 results[ds.data_src_id] = {
@@ -508,45 +536,88 @@ class DataSourceService(BaseService):
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
         
-    async def semantic_search(self, user_query: str, connection_config_id: int) -> List[DataSourceReturn]:
+    async def _semantic_hits(
+            self,
+            legs: List[tuple],
+            connection_config_id: Optional[int] = None,
+            bh_project_id: Optional[int] = None,
+        ) -> list:
+        """ Semantic search over one or more (embedding column, query embedding) legs
+            in a single round trip. Each leg takes the nearest candidates through
+            its HNSW index and keeps those with a similarity of at least
+            max(SEMANTIC_MIN_SIMILARITY, SEMANTIC_PERCENTILE of the leg). Legs are
+            returned in order, a data source already found by an earlier leg is
+            not repeated."""
+        filters = ["is_deleted IS NOT TRUE"]
+        params = {
+            'candidates': Config.VECTOR_SEARCH_CANDIDATES,
+            'min_similarity': self.SEMANTIC_MIN_SIMILARITY,
+            'percentile': self.SEMANTIC_PERCENTILE,
+        }
+        if connection_config_id is not None:
+            filters.append("connection_config_id = :connection_config_id")
+            params['connection_config_id'] = connection_config_id
+        if bh_project_id is not None:
+            filters.append("bh_project_id = :bh_project_id")
+            params['bh_project_id'] = bh_project_id
+
+        table = f"{Config.DB_SCHEMA}.{self.model.__tablename__}"
+        where = " AND ".join(filters)
+        vector_params, ctes, selects = [], [], []
+        for index, (column, embedding) in enumerate(legs):
+            params[f'embedding_{index}'] = fit_dimensions(embedding, column.type.dim)
+            vector_params.append(bindparam(f'embedding_{index}', type_=column.type))
+            ctes.append(f"""
+            leg_{index} AS (
+                SELECT {self.select_list()}, {column.key} <=> :embedding_{index} AS distance
+                FROM {table}
+                WHERE {where}
+                ORDER BY distance
+                LIMIT :candidates
+            ),
+            leg_{index}_hits AS (
+                SELECT leg_{index}.*, 1 - distance AS similarity, {index} AS leg
+                FROM leg_{index}
+                WHERE 1 - distance >= (
+                    SELECT greatest(:min_similarity, percentile_cont(:percentile) WITHIN GROUP (ORDER BY coalesce(1 - distance, 0)))
+                    FROM leg_{index}
+                )
+            )""")
+            seen = "".join(f" AND data_src_id NOT IN (SELECT data_src_id FROM leg_{earlier}_hits)" for earlier in range(index))
+            selects.append(f"SELECT * FROM leg_{index}_hits WHERE TRUE{seen}")
+
+        statement = text(
+            "WITH" + ",".join(ctes) + "\n" + "\nUNION ALL\n".join(selects) + "\nORDER BY leg, similarity DESC"
+        ).bindparams(*vector_params)
+
+        await tune_vector_search(self.context.db_session, Config.VECTOR_EF_SEARCH, Config.VECTOR_ITERATIVE_SCAN)
+        results = await self.context.db_session.execute(statement, params)
+        return results.fetchall()
+
+    async def semantic_search(
+            self,
+            user_query: str,
+            connection_config_id: int,
+            bh_project_id: Optional[int] = None,
+        ) -> List[DataSourceReturn]:
         query_embedding, embedding = await get_query_embedding(user_query)
 
-        embedding_str = f"'[{','.join(map(str, query_embedding))}]'"
-
-       
-        embed_query = f"""
-            SELECT *, 
-                1 - (data_src_embeddings <=> {embedding_str}::vector) AS similarity
-            FROM catalogdb.data_source
-            WHERE connection_config_id = :connection_config_id
-            ORDER BY similarity DESC NULLS LAST
-            LIMIT 50;  -- Increase the limit to 50 results
-        """
-
-        results = await self.context.db_session.execute(
-            text(embed_query), {"connection_config_id": connection_config_id}
+        rows = await self._semantic_hits(
+            [(DataSource.data_src_embeddings, query_embedding)],
+            connection_config_id=connection_config_id,
+            bh_project_id=bh_project_id,
         )
-        rows = results.fetchall()
-
-        if not rows:
-            return []
-
-        similarities = np.array([row.similarity if row.similarity is not None else 0 for row in rows])
-
-        # Lowering the threshold to include more results
-        min_similarity_threshold = max(0.4, np.percentile(similarities,70))
-
-
-        filtered_results = [
-            row for row in rows if row.similarity is not None and row.similarity >= min_similarity_threshold
-        ]
-
-        return [DataSourceReturn.from_orm(row) for row in filtered_results]
+        return [DataSourceReturn.from_orm(row) for row in rows]
 
     #TODO will remove after testing
-    async def semantic_search2(self, user_query: str, connection_config_id: int) -> List[DataSourceReturn]:
+    async def semantic_search2(
+            self,
+            user_query: str,
+            connection_config_id: int,
+            bh_project_id: Optional[int] = None,
+        ) -> List[DataSourceReturn]:
         """
-        Performs a two-step semantic search:
+        Performs a two-step semantic search in one query:
         1. Searches by data source name & description embeddings (1536-dim).
         2. Searches by relationship embeddings (768-dim).
         3. Merges and returns unique results.
@@ -554,6 +625,7 @@ class DataSourceService(BaseService):
         Args:
             user_query (str): The user's search query.
             connection_config_id (int): The ID of the connection configuration.
+            bh_project_id (int): Optional project to restrict the search to.
 
         Returns:
             List[DataSourceReturn]: A list of relevant data sources.
@@ -561,61 +633,15 @@ class DataSourceService(BaseService):
 
         query_embedding, embedding = await get_query_embedding(user_query)
 
-        embedding_str = f"'[{','.join(map(str, query_embedding))}]'"
-
-
-        # Step 1: Search by data source description (1536-dim)
-        desc_query = f"""
-            SELECT *, 
-                1 - (data_src_embeddings <=> {embedding_str}::vector) AS similarity
-            FROM catalogdb.data_source
-            WHERE connection_config_id = :connection_config_id
-            ORDER BY similarity DESC NULLS LAST
-            LIMIT 50;
-        """
-
-        # Step 2: Search by relationships (768-dim)
-        relationship_embedding = embedding
-        embedding_rel_str = f"'[{','.join(map(str, relationship_embedding))}]'"
-
-        rel_query = f"""
-            SELECT *, 
-                1 - (data_src_relationships_embeddings <=> {embedding_rel_str}::vector) AS similarity
-            FROM catalogdb.data_source
-            WHERE connection_config_id = :connection_config_id
-            ORDER BY similarity DESC NULLS LAST
-            LIMIT 50;
-        """
-
-        # Execute both queries asynchronously
-        results_desc = await self.context.db_session.execute(text(desc_query), {"connection_config_id": connection_config_id})
-        results_rel = await self.context.db_session.execute(text(rel_query), {"connection_config_id": connection_config_id})
-
-        desc_rows = results_desc.fetchall()
-        rel_rows = results_rel.fetchall()
-
-        if not desc_rows and not rel_rows:
-            return []
-
-        # Extract similarities
-        desc_similarities = np.array([row.similarity if row.similarity is not None else 0 for row in desc_rows])
-        rel_similarities = np.array([row.similarity if row.similarity is not None else 0 for row in rel_rows])
-
-        # Apply similarity thresholds
-        min_desc_similarity = max(0.4, np.percentile(desc_similarities, 70)) if len(desc_similarities) > 0 else 0.4
-        min_rel_similarity = max(0.4, np.percentile(rel_similarities, 70)) if len(rel_similarities) > 0 else 0.4
-
-        # Filter results
-        filtered_desc_results = [row for row in desc_rows if row.similarity is not None and row.similarity >= min_desc_similarity]
-        filtered_rel_results = [row for row in rel_rows if row.similarity is not None and row.similarity >= min_rel_similarity]
-
-        # Merge results while ensuring uniqueness
-        unique_results = {row[5]: row for row in filtered_desc_results}
-        for row in filtered_rel_results:
-            if row[5] not in unique_results:
-                unique_results[row[5]] = row
-
-        return [DataSourceReturn.from_orm(row) for row in unique_results.values()]
+        rows = await self._semantic_hits(
+            [
+                (DataSource.data_src_embeddings, query_embedding),
+                (DataSource.data_src_relationships_embeddings, embedding),
+            ],
+            connection_config_id=connection_config_id,
+            bh_project_id=bh_project_id,
+        )
+        return [DataSourceReturn.from_orm(row) for row in rows]
 
 
 
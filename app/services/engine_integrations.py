@@ -1,6 +1,12 @@
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List
+
+from app.core.config import Config
+
+from app.exceptions import ObjectNotFound
 from app.services.base import BaseService
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 
 from app.models import (
     BHProject,
@@ -10,7 +16,11 @@ from app.models import (
     LayoutFields,
     LayoutFieldsDQ,
     Pipeline,
+    CodesDtl,
 )
+from app.models.data_source_layout import DataSourceLayoutReturn
+from app.models.layout_fields import LayoutFieldsReturn
+from app.models.layout_fields_dq import LayoutFieldsDQReturn
 
 model_to_export = {
     "bh_project": BHProject,
@@ -35,18 +45,45 @@ class EngineConfigurationsService(BaseService):
         
         return engine_config
 
-    async def _get_cd_id_to_desc(self, id):
-        code_object = await self.context.codes_dtl_service.get(id=id)
-        code_dict = code_object.dict()
-        return code_dict['dtl_desc']
+    async def stream_export_tables(self, models_to_export=model_to_export) -> AsyncIterator[dict]:
+        """ Rows of `export_tables` as `{"table": ..., "row": ...}`, yielded while they
+            are fetched instead of loading every table first."""
+        session = self.context.db_session
+        for table, model in models_to_export.items():
+            stmt = select(model).execution_options(yield_per=Config.STREAM_BATCH_SIZE)
+            response = await session.stream(stmt)
+            async for row in response.scalars():
+                yield {"table": table, "row": row}
+                session.expunge(row)
+
+    @staticmethod
+    def _not_deleted(model):
+        return or_(model.is_deleted == False, model.is_deleted == None)
+
+    async def _load_code_values(self, *cd_dicts: dict) -> Dict[int, str]:
+        """ `dtl_desc` of the codes the `_cd` keys of `cd_dicts` reference, in one query.
+            Read from the table with the rules of `codes_dtl_service.get`, so a code
+            it would reject is not exported from a cached snapshot."""
+        code_ids = {
+            value for cd_dict in cd_dicts for key, value in cd_dict.items()
+            if '_cd' in key and value is not None
+        }
+        if not code_ids:
+            return {}
+        statement = select(CodesDtl.id, CodesDtl.dtl_desc).where(CodesDtl.id.in_(code_ids))
+        if hasattr(CodesDtl, 'is_deleted'):
+            statement = statement.where(self._not_deleted(CodesDtl))
+        return dict((await self.context.db_session.execute(statement)).all())
 
-    async def _convert_cd_to_value(self, cd_dict):
+    def _convert_cd_to_value(self, cd_dict: dict, code_values: Dict[int, str]) -> dict:
         new_cd_dict = cd_dict.copy()
         for key in cd_dict.keys():
             if '_cd' in key:
-                code_value = await self._get_cd_id_to_desc(id=cd_dict[key])
+                code_id = cd_dict[key]
+                if code_id is not None and code_id not in code_values:
+                    raise ObjectNotFound(context={'column_name': 'id', 'id': code_id, 'type': CodesDtl.__name__})
                 new_key = key.replace('_cd', '_val')    
-                new_cd_dict[new_key] = code_value
+                new_cd_dict[new_key] = code_values.get(code_id)
         return new_cd_dict
 
     async def engine_config_export(
@@ -55,30 +92,60 @@ class EngineConfigurationsService(BaseService):
             data_source_name = None,
             data_source_key = None,
         ):
-        engine_config = {}
+        """ Data source with its layouts, fields and field validations for the engine.
+            Loaded with one query per level whatever the number of layouts and fields,
+            plus one for the code values; DQ type names come from the reference data cache."""
+        session = self.context.db_session
         data_source = await self.context.data_source_service.get(id=data_source_id)
-        engine_config['data_source'] = data_source.dict()
-        engine_config['data_source'] = await self._convert_cd_to_value(engine_config['data_source'])
-        data_source_layouts = await self.context.data_source_layout_service.list(data_src_id=data_source_id)
+
+        layouts = (await session.execute(
+            select(DataSourceLayout)
+            .where(DataSourceLayout.data_src_id == data_source_id)
+            .where(self._not_deleted(DataSourceLayout))
+            .order_by(DataSourceLayout.data_src_lyt_id)
+        )).scalars().all()
+        layout_ids = [layout.data_src_lyt_id for layout in layouts]
+
+        fields = (await session.execute(
+            select(LayoutFields)
+            .where(LayoutFields.lyt_id.in_(layout_ids))
+            .where(self._not_deleted(LayoutFields))
+            .order_by(LayoutFields.lyt_fld_id)
+        )).scalars().all() if layout_ids else []
+        field_ids = [field.lyt_fld_id for field in fields]
+
+        validations = (await session.execute(
+            select(LayoutFieldsDQ)
+            .where(LayoutFieldsDQ.lyt_fld_id.in_(field_ids))
+            .where(self._not_deleted(LayoutFieldsDQ))
+            .order_by(LayoutFieldsDQ.fld_dq_id)
+        )).scalars().all() if field_ids else []
+
+        data_source_dict = data_source.dict()
+        layout_dicts = [DataSourceLayoutReturn.from_orm(layout).dict() for layout in layouts]
+        field_dicts = [LayoutFieldsReturn.from_orm(field).dict() for field in fields]
+        code_values = await self._load_code_values(data_source_dict, *layout_dicts, *field_dicts)
+
+        validations_by_field: Dict[int, List[dict]] = defaultdict(list)
+        for validation in validations:
+            dq_type = await self.context.reference_data_service.get_dq_type(id=validation.fld_dq_type_id)
+            validation_dict = LayoutFieldsDQReturn.from_orm(validation).dict()
+            validation_dict['dq_name'] = dq_type.dq_name
+            validations_by_field[validation.lyt_fld_id].append(validation_dict)
+
+        fields_by_layout: Dict[int, List[dict]] = defaultdict(list)
+        for field, field_dict in zip(fields, field_dicts):
+            lyt_field_dict = self._convert_cd_to_value(field_dict, code_values)
+            lyt_field_dict['field_validations'] = validations_by_field[field.lyt_fld_id]
+            fields_by_layout[field.lyt_id].append(lyt_field_dict)
+
         layouts_list = []
-        for layout in data_source_layouts:
-            layout_dict = layout.dict()
-            layout_dict = await self._convert_cd_to_value(layout_dict)
-            layout_fields = await self.context.layout_fields_service.list(lyt_id=layout.data_src_lyt_id)
-            layout_fields_list = []
-            for lyt_field in layout_fields:
-                lyt_field_dict = lyt_field.dict()
-                lyt_field_dict = await self._convert_cd_to_value(lyt_field_dict)
-                lyt_field_validations = await self.context.layout_fields_dq_service.list(lyt_fld_id=lyt_field.lyt_fld_id)
-                validation_list = []
-                for validation in lyt_field_validations:
-                    validation_dict = validation.dict()
-                    dq_response  = await self.context.fields_dq_types_service.get(id=validation_dict['fld_dq_type_id'])
-                    validation_dict['dq_name'] = dq_response.dq_name
-                    validation_list.append(validation_dict)
-                lyt_field_dict['field_validations'] = validation_list
-                layout_fields_list.append(lyt_field_dict)
-            layout_dict['layout_fields'] = layout_fields_list
+        for layout, layout_dict in zip(layouts, layout_dicts):
+            layout_dict = self._convert_cd_to_value(layout_dict, code_values)
+            layout_dict['layout_fields'] = fields_by_layout[layout.data_src_lyt_id]
             layouts_list.append(layout_dict)
+
+        engine_config = {}
+        engine_config['data_source'] = self._convert_cd_to_value(data_source_dict, code_values)
         engine_config['data_source_layout'] = layouts_list
         return engine_config
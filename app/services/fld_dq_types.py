@@ -6,9 +6,14 @@ from app.models.fld_dq_types import (
 )
 
 from app.services.base import BaseService
+from app.services.reference_data import FLD_DQ_TYPES
+from app.utils.reference_cache import reference_cache
 
 class FieldDQTypesService(BaseService):
     model: FieldDQTypes = FieldDQTypes
     create_model: FieldDQTypesCreate = FieldDQTypesCreate
     update_model: FieldDQTypesUpdate = FieldDQTypesUpdate
-    return_schema: FieldDQReturn = FieldDQReturn
\ No newline at end of file
+    return_schema: FieldDQReturn = FieldDQReturn
+
+    async def after_write(self) -> None:
+        await reference_cache.invalidate(FLD_DQ_TYPES)
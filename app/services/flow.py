@@ -1,4 +1,5 @@
 import json
+from app.enums.pagination import TotalCount
 from app.exceptions.base import ObjectNotFound
 from app.models.bh_project import BHProject
 from app.models.flow import (
@@ -26,7 +27,6 @@ from app.models.flow import (
 from app.services.base import BaseService
 from app.utils.flow_utils import create_flow_release_version
 from app.utils.git_utils.git_utils import create_git_branch, initialize_git_provider
-from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy import or_, select, desc, delete
 from typing import Optional, List , Dict
 from sqlalchemy.future import select
@@ -39,6 +39,20 @@ class FlowService(BaseService):
     create_model: FlowCreate = FlowCreate
     update_model: FlowUpdate = FlowUpdate
     return_schema: FlowReturn = FlowReturn
+    search_fields = ('flow_name', 'notes')
+    load_profiles = {
+        "detail": ("flow_deployment", "flow_config", "flow_definition"),
+        "list": (
+            "bh_project",
+            "flow_deployment.project_environment",
+            "flow_config",
+            "flow_definition",
+            "created_by_user",
+            "updated_by_user",
+        ),
+        "deployments": ("flow_deployment",),
+    }
+    return_profile = "detail"
 
     async def list(
         self,
@@ -46,36 +60,23 @@ class FlowService(BaseService):
         limit: int = 10,
         order_by: Optional[str] = None,
         order_desc: bool = False,
+        cursor: Optional[str] = None,
+        with_total: Optional[TotalCount] = None,
         **kwargs,
     ) -> List[return_schema]:
-        query = (
-            select(self.model)
-            .where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
-            .options(
-                joinedload(self.model.bh_project),
-                joinedload(self.model.flow_deployment).joinedload(FlowDeployment.project_environment),
-                joinedload(self.model.created_by_user),  
-                joinedload(self.model.updated_by_user),   
-            )
-        )
+        query = select(self.model).where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
 
         for kw in kwargs.keys():
             if kwargs[kw] is not None:
                 query = query.where(getattr(self.model, kw) == kwargs[kw])
 
-        query = query.offset(offset).limit(limit)
-        
-        if order_by:
-            order_expression = getattr(self.model, order_by)
-            if order_desc:
-                order_expression = desc(order_expression)
-            query = query.order_by(order_expression)
-        
-        results = await self.context.db_session.execute(query)
+        paged_query = self.paginate(query, offset, limit, order_by, order_desc, cursor)
 
-        unique_results = results.unique().scalars()
+        results = await self.context.db_session.execute(self.with_profile(paged_query, "list"))
 
-        return [
+        unique_results = results.scalars().all()
+
+        return await self.make_page([
             self.return_schema.from_orm(result).copy(
                 update={
                     "bh_project_name": result.bh_project.bh_project_name,
@@ -90,7 +91,7 @@ class FlowService(BaseService):
                 }
             )
             for result in unique_results
-        ]
+        ], unique_results, query, limit, order_by, cursor, with_total)
 
 
     async def search(self, params: Dict[str, str]) -> List[return_schema]:
@@ -117,7 +118,7 @@ class FlowService(BaseService):
                 # Exact match for strings
                 query = query.filter(model_field.in_(search_key))
 
-        results = await self.context.db_session.exec(query)
+        results = await self.context.db_session.exec(self.with_profile(query, self.return_profile))
         return [self.return_schema.from_orm(result) for result in results.scalars()]
 
 
@@ -131,9 +132,10 @@ class FlowService(BaseService):
         return response
 
     
-    async def get(self, id: int):
+    async def get(self, id: int, profile: Optional[str] = None):
         primary_key_column = await self._get_primary_key_column()
         statement = select(self.model).filter(primary_key_column == id).filter(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+        statement = self.with_profile(statement, profile)
         result = await self.context.db_session.execute(statement=statement)
         response = result.scalar_one_or_none()
 
@@ -149,14 +151,7 @@ class FlowService(BaseService):
     async def get_flow(self, id: int):
         primary_key_column = await self._get_primary_key_column()
         
-        # Modify the select query to load both schedule_interval and flow_deployment relationships
-        statement = (
-            select(self.model)
-            .filter(primary_key_column == id)
-            .options(
-                selectinload(self.model.flow_deployment)
-            )
-        )
+        statement = self.with_profile(select(self.model).filter(primary_key_column == id), "deployments")
         
         result = await self.context.db_session.execute(statement=statement)
         response = result.scalar_one_or_none()
@@ -186,17 +181,17 @@ class FlowDeploymentService(BaseService):
     create_model: FlowDeploymentCreate = FlowDeploymentCreate
     update_model: FlowDeploymentUpdate = FlowDeploymentUpdate
     return_schema: FlowDeploymentReturn = FlowDeploymentReturn
+    load_profiles = {
+        "list": ("flow", "project_environment"),
+        "with_flow": ("flow.bh_project", "flow.flow_definition", "project_environment"),
+    }
 
     async def get_flow_deployment_with_flow(self, id: int):
         primary_key_column = await self._get_primary_key_column()
-        statement = (
+        statement = self.with_profile(
             select(self.model)
-                .filter(primary_key_column == id, or_(self.model.is_deleted == False, self.model.is_deleted == None))
-                .options(
-                    joinedload(self.model.flow).joinedload(Flow.bh_project),  
-                    joinedload(self.model.flow).joinedload(Flow.flow_definition),  
-                    joinedload(self.model.project_environment), 
-            )
+                .filter(primary_key_column == id, or_(self.model.is_deleted == False, self.model.is_deleted == None)),
+            "with_flow",
         )
         result = await self.context.db_session.execute(statement=statement)
         response = result.scalar_one_or_none()
@@ -243,7 +238,7 @@ class FlowDeploymentService(BaseService):
     ) -> List[return_schema]:
         
         # Join the Flow table to retrieve flow_name
-        query = select(self.model).options(joinedload(self.model.flow), joinedload(self.model.project_environment)).filter(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+        query = self.with_profile(select(self.model), "list").filter(or_(self.model.is_deleted == False, self.model.is_deleted == None))
 
         for kw in kwargs.keys():
             if kwargs[kw] is not None:
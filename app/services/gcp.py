@@ -1,6 +1,6 @@
+import asyncio
 import json
 import os
-from time import sleep
 from typing import Any, Tuple
 
 from google.api_core.exceptions import NotFound, RetryError, ServiceUnavailable
@@ -10,6 +10,7 @@ from app.core.context import Context
 from app.exceptions import BHGCPClientError
 from app.services.base import BaseService
 from app.core.config import Config
+from app.utils.secret_cache import forget_secret, get_cached_secret
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,10 +29,14 @@ class GCPService(BaseService):
         return self._secrets
 
 
-class GCPSecretsService(BaseService):
-    def __init__(self, context: Context):
-        super().__init__(context)
-        
+_secrets_client = None
+
+
+def get_secrets_client() -> secretmanager.SecretManagerServiceClient:
+    """ Secret Manager client shared by the process, built from the first JSON
+        credentials file in /etc/gcp/."""
+    global _secrets_client
+    if _secrets_client is None:
         secrets_dir = '/etc/gcp/'
         # This will read the first file that ends with .json in the directory
         credentials_file = None
@@ -46,7 +51,20 @@ class GCPSecretsService(BaseService):
             raise FileNotFoundError("No JSON credentials file found in the secrets directory.")
    
         credentials = service_account.Credentials.from_service_account_file(credentials_file)
-        self._secrets_client = secretmanager.SecretManagerServiceClient(credentials=credentials)
+        _secrets_client = secretmanager.SecretManagerServiceClient(credentials=credentials)
+    return _secrets_client
+
+
+class GCPSecretsService(BaseService):
+    """ GCP Secret Manager service.
+        Secret values are cached for SECRETS_CACHE_TTL seconds, client calls run in a worker thread."""
+    def __init__(self, context: Context):
+        super().__init__(context)
+        self._secrets_client = get_secrets_client()
+
+    @staticmethod
+    def cache_key(project_id: str, secret_name: str) -> tuple:
+        return ('gcp', project_id, secret_name)
 
     async def get_secret(
             self,
@@ -54,8 +72,7 @@ class GCPSecretsService(BaseService):
             project_id: str = Config.GOOGLE_CLOUD_PROJECT,
             retry: int = 3,
     ) -> dict | str:
-        try:
-            logger.info(f"Getting secret: {secret_name}")
+        def fetch() -> dict | str:
             secret_path = self._secrets_client.secret_path(project_id, secret_name)
             version_path = secret_path + '/versions/latest'
             secret_version = self._secrets_client.access_secret_version(request={'name': version_path})
@@ -65,9 +82,13 @@ class GCPSecretsService(BaseService):
             except json.JSONDecodeError:
                 pass
             return secret_value
+
+        try:
+            logger.info(f"Getting secret: {secret_name}")
+            return await get_cached_secret(self.cache_key(project_id, secret_name), fetch)
         except (ServiceUnavailable, RetryError) as e:
             if retry > 0:
-                sleep(10)
+                await asyncio.sleep(10)
                 return await self.get_secret(secret_name, project_id, retry - 1)
             else:
                 logger.error(f"Failed to get secret: {secret_name}")
@@ -83,6 +104,12 @@ class GCPSecretsService(BaseService):
             data: str,
             project_id: str = Config.GOOGLE_CLOUD_PROJECT,
     ) -> Tuple[Any, Any]:
+        try:
+            return await asyncio.to_thread(self._new_secret, secret_name, data, project_id)
+        finally:
+            forget_secret(self.cache_key(project_id, secret_name))
+
+    def _new_secret(self, secret_name: str, data: str, project_id: str) -> Tuple[Any, Any]:
         logger.info(f"Creating new secret: {secret_name}")
         project_path = f'projects/{project_id}'
         # Check if secret exists else create new one
@@ -120,4 +147,7 @@ class GCPSecretsService(BaseService):
     ) -> None:
         logger.info(f"Deleting secret: {secret_name}")
         secret_path = self._secrets_client.secret_path(project_id, secret_name)
-        self._secrets_client.delete_secret(request={'name': secret_path})
+        try:
+            await asyncio.to_thread(self._secrets_client.delete_secret, request={'name': secret_path})
+        finally:
+            forget_secret(self.cache_key(project_id, secret_name))
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+
+from app.core.config import Config
+from app.core.context import Context
+from app.enums.job import JobItemStatus, JobStatus, JobType
+from app.exceptions.job import JobNotFound, JobStateConflict
+from app.models.job import BHJob, BHJobReturn
+from app.services.base import BaseService
+
+logger = logging.getLogger(__name__)
+
+# Processes one chunk of items and returns the progress entry of each item it finished,
+# items with nothing to do are reported as skipped
+JobHandler = Callable[[Context, BHJob, List[str]], Awaitable[Dict[str, dict]]]
+
+TERMINAL_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobService(BaseService):
+    model: BHJob = BHJob
+    return_schema: BHJobReturn = BHJobReturn
+
+    # JobType -> handler, filled by app.celery_conf.tasks
+    handlers: Dict[JobType, JobHandler] = {}
+
+    async def submit(
+            self,
+            job_type: JobType,
+            items: List[Any],
+            params: Optional[dict] = None,
+            authorized: Optional[dict] = None,
+        ) -> BHJob:
+        """ Record a queued job and hand it to the configured worker backend."""
+        items = [str(item) for item in dict.fromkeys(items)]
+        job = BHJob(
+            job_type=job_type,
+            status=JobStatus.QUEUED,
+            params=params or {},
+            items=items,
+            progress={},
+            total_items=len(items),
+        )
+        if authorized:
+            job = self.insert_user_fields(job, authorized, type="create")
+        self.context.db_session.add(job)
+        await self.context.db_session.commit()
+        await self.context.db_session.refresh(job)
+
+        await self.dispatch(job.job_id)
+        return job
+
+    async def dispatch(self, job_id: int) -> None:
+        from app.utils.job_utils import get_job_backend
+        await get_job_backend().dispatch(job_id)
+
+    async def get_job(self, job_id: int) -> BHJob:
+        job = await self.context.db_session.get(BHJob, job_id, populate_existing=True)
+        if job is None:
+            raise JobNotFound(context={'job_id': job_id})
+        return job
+
+    async def cancel(self, job_id: int) -> BHJob:
+        """ Stop a queued or running job. A running job stops after its current chunk."""
+        job = await self.get_job(job_id)
+        if job.status in TERMINAL_STATUSES:
+            raise JobStateConflict(context={'job_id': job_id, 'status': JobStatus(job.status).value, 'action': 'cancelled'})
+        job.status = JobStatus.CANCELLED
+        job.finished_at = datetime.now(timezone.utc)
+        await self.context.db_session.commit()
+        return await self.get_job(job_id)
+
+    async def resume(self, job_id: int) -> BHJob:
+        """ Queue a failed or cancelled job again. Items already done are skipped,
+            failed items are retried."""
+        job = await self.get_job(job_id)
+        if job.status not in (JobStatus.FAILED, JobStatus.CANCELLED):
+            raise JobStateConflict(context={'job_id': job_id, 'status': JobStatus(job.status).value, 'action': 'resumed'})
+        progress = {
+            item: state for item, state in job.progress.items()
+            if state.get('status') != JobItemStatus.FAILED.value
+        }
+        job.progress = progress
+        job.failed_items = 0
+        job.completed_items = sum(1 for state in progress.values() if state.get('status') == JobItemStatus.DONE.value)
+        job.skipped_items = len(progress) - job.completed_items
+        job.status = JobStatus.QUEUED
+        job.error = None
+        job.finished_at = None
+        await self.context.db_session.commit()
+
+        await self.dispatch(job_id)
+        return await self.get_job(job_id)
+
+    async def resumable_job_ids(self, stale_only: bool = False) -> List[int]:
+        """ Ids of queued jobs and of running jobs whose worker stopped sending heartbeats.
+            With `stale_only`, queued jobs are only returned once untouched for
+            JOB_STALE_AFTER, e.g. released by a worker which shut down or whose
+            dispatch was lost."""
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=Config.JOB_STALE_AFTER)
+        queued = BHJob.status == JobStatus.QUEUED
+        if stale_only:
+            queued = and_(queued, func.coalesce(BHJob.heartbeat_at, BHJob.created_at) < stale_before)
+        result = await self.context.db_session.execute(
+            select(BHJob.job_id)
+            .where(or_(
+                queued,
+                (BHJob.status == JobStatus.RUNNING) & (BHJob.heartbeat_at < stale_before),
+            ))
+            .order_by(BHJob.job_id)
+        )
+        return list(result.scalars().all())
+
+    async def claim(self, job_id: int) -> bool:
+        """ Atomically mark the job as running on this worker. Fails when another
+            worker holds it (fresh heartbeat) or when it is finished."""
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=Config.JOB_STALE_AFTER)
+        result = await self.context.db_session.execute(
+            update(BHJob)
+            .where(BHJob.job_id == job_id)
+            .where(or_(
+                BHJob.status == JobStatus.QUEUED,
+                (BHJob.status == JobStatus.RUNNING) & (BHJob.heartbeat_at < stale_before),
+            ))
+            .values(
+                status=JobStatus.RUNNING,
+                worker_id=WORKER_ID,
+                attempts=BHJob.attempts + 1,
+                started_at=func.coalesce(BHJob.started_at, func.now()),
+                heartbeat_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.context.db_session.commit()
+        return result.rowcount == 1
+
+    async def heartbeat(self, job_id: int) -> bool:
+        """Mark a job this worker is running as alive, False when it no longer holds it."""
+        result = await self.context.db_session.execute(
+            update(BHJob)
+            .where(BHJob.job_id == job_id)
+            .where(BHJob.status == JobStatus.RUNNING)
+            .where(BHJob.worker_id == WORKER_ID)
+            .values(heartbeat_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await self.context.db_session.commit()
+        return result.rowcount == 1
+
+    async def release(self, job_id: int) -> None:
+        """Put a job this worker was running back in the queue, e.g. on shutdown."""
+        await self.context.db_session.execute(
+            update(BHJob)
+            .where(BHJob.job_id == job_id)
+            .where(BHJob.status == JobStatus.RUNNING)
+            .where(BHJob.worker_id == WORKER_ID)
+            .values(status=JobStatus.QUEUED, worker_id=None, heartbeat_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await self.context.db_session.commit()
+
+    async def run(self, job_id: int) -> None:
+        """ Process the pending items of a job in chunks of JOB_CHUNK_SIZE. Progress
+            is committed after every chunk, so a job picked up again after a crash
+            continues where it stopped."""
+        if not await self.claim(job_id):
+            logger.info(f"Job {job_id} is finished or held by another worker, skipping")
+            return
+
+        job = await self.get_job(job_id)
+        handler = self.handlers.get(job.job_type)
+        if handler is None:
+            await self._finish(job, error=f"No handler for job type {JobType(job.job_type).value}")
+            return
+
+        pending = [item for item in job.items if item not in job.progress]
+        chunk_size = max(1, Config.JOB_CHUNK_SIZE)
+        for start in range(0, len(pending), chunk_size):
+            job = await self.get_job(job_id)
+            if job.status != JobStatus.RUNNING or job.worker_id != WORKER_ID:
+                logger.info(f"Job {job_id} is {JobStatus(job.status).value}, stopping")
+                return
+
+            chunk = pending[start:start + chunk_size]
+            try:
+                finished = await self._run_chunk(handler, job, chunk)
+                error = None
+            except Exception as e:
+                logger.exception(f"Job {job_id} failed on items {chunk}")
+                await self.context.db_session.rollback()
+                finished = {}
+                error = str(getattr(e, 'detail', None) or e)
+            for item in chunk:
+                finished.setdefault(item, {'status': JobItemStatus.FAILED.value, 'error': error or 'Not processed'})
+            await self._record_progress(job_id, finished, error)
+
+        job = await self.get_job(job_id)
+        if job.status == JobStatus.RUNNING and job.worker_id == WORKER_ID:
+            await self._finish(job)
+
+    async def _run_chunk(self, handler: JobHandler, job: BHJob, chunk: List[str]) -> Dict[str, dict]:
+        """ Run `handler` on a chunk while its heartbeat is refreshed every
+            JOB_HEARTBEAT_INTERVAL, so a long chunk is not taken for a crashed worker."""
+        keep_alive = asyncio.create_task(self._keep_alive(job.job_id), name=f"job-{job.job_id}-heartbeat")
+        try:
+            return await handler(self.context, job, chunk)
+        finally:
+            keep_alive.cancel()
+            await asyncio.gather(keep_alive, return_exceptions=True)
+
+    async def _keep_alive(self, job_id: int) -> None:
+        # The handler owns the session of this context, heartbeats use short sessions of their own
+        while True:
+            await asyncio.sleep(Config.JOB_HEARTBEAT_INTERVAL)
+            try:
+                async with Context() as ctx:
+                    await ctx.job_service.heartbeat(job_id)
+            except Exception:
+                logger.warning(f"Could not refresh the heartbeat of job {job_id}", exc_info=True)
+
+    async def _record_progress(self, job_id: int, finished: Dict[str, dict], error: Optional[str]) -> None:
+        job = await self.get_job(job_id)
+        progress = {**job.progress, **finished}
+        job.progress = progress
+        job.completed_items = sum(1 for state in progress.values() if state.get('status') == JobItemStatus.DONE.value)
+        job.skipped_items = sum(1 for state in progress.values() if state.get('status') == JobItemStatus.SKIPPED.value)
+        job.failed_items = len(progress) - job.completed_items - job.skipped_items
+        job.heartbeat_at = datetime.now(timezone.utc)
+        if error:
+            job.error = error
+        await self.context.db_session.commit()
+
+    async def _finish(self, job: BHJob, error: Optional[str] = None) -> None:
+        if error:
+            job.error = error
+        job.status = JobStatus.FAILED if (error or job.failed_items) else JobStatus.SUCCEEDED
+        job.finished_at = datetime.now(timezone.utc)
+        job.result = {
+            'total_items': job.total_items,
+            'completed_items': job.completed_items,
+            'skipped_items': job.skipped_items,
+            'failed_items': job.failed_items,
+        }
+        await self.context.db_session.commit()
+
+    def snapshot(self, job: BHJob, with_progress: bool = True) -> dict:
+        """JSON-ready state of a job, for the polling and event stream endpoints."""
+        job_return = BHJobReturn.from_orm(job)
+        if not with_progress:
+            job_return.progress = None
+        return job_return.dict()
@@ -16,6 +16,7 @@ class LayoutFieldsService(BaseService):
     return_schema: LayoutFieldsReturn = LayoutFieldsReturn
     name_field: str = 'lyt_fld_name'
     key_field: str = 'lyt_fld_key'
+    search_fields = ('lyt_fld_name', 'lyt_fld_desc')
 
     async def create_bulk_fields(self, layout_fields_list: List[LayoutFieldsCreate]) -> List[LayoutFieldsReturn]:
         new_list = [self.model.from_orm(obj) for obj in layout_fields_list]
@@ -1,8 +1,16 @@
+import asyncio
 import json
+
+import grpc
+from fastapi import HTTPException
+
 from app.core.config import Config
 from app.utils.data_source_utils import get_text_embedding
-import grpc
-from typing import List, Optional, Dict
+from app.utils.arrow_stream import decode_batches
+from app.utils.grpc_channels import grpc_channels
+from typing import AsyncIterator, List, Optional, Dict, Tuple
+from app.enums.pagination import TotalCount
+from app.enums.flow import SchemaTypes
 from app.enums.pipeline import ParameterType
 from app.exceptions.base import ObjectNotFound
 from app.models.bh_project import BHProject
@@ -40,11 +48,12 @@ from app.protos import (
     pipeline_operations_pb2,
     pipeline_operations_pb2_grpc,
 )
-from sqlalchemy.orm import joinedload
+from app.models.schema import SchemaValidationResult
 from app.services.base import BaseService
 from app.utils.constants import PIPELINE_DIR
 from app.utils.git_utils.git_utils import create_git_branch, initialize_git_provider
 from google.protobuf.json_format import MessageToDict
+import pyarrow as pa
 from sqlalchemy import or_, select, desc, text
 from sqlalchemy.types import BOOLEAN, INTEGER
 from sqlalchemy.ext.associationproxy import ColumnAssociationProxyInstance
@@ -55,6 +64,12 @@ class PipelinesService(BaseService):
     update_model: PipelineUpdate = PipelineUpdate
     return_schema: PipelineReturn = PipelineReturn
     # name_field: str = 'pipeline_name'
+    search_fields = ('pipeline_name', 'notes')
+    load_profiles = {
+        "summary": ("bh_project", "created_by_user", "updated_by_user"),
+        "definition": ("pipeline_definitions",),
+        "with_definition": ("bh_project", "pipeline_definitions"),
+    }
 
     async def check_pipeline_exists(
         self,
@@ -71,32 +86,22 @@ class PipelinesService(BaseService):
         limit: int = 10,
         order_by: Optional[str] = None,
         order_desc: bool = False,
+        cursor: Optional[str] = None,
+        with_total: Optional[TotalCount] = None,
         **kwargs,
     ) -> List[PipelineReturn]:
-        query = select(self.model).options(
-            joinedload(self.model.bh_project),
-            joinedload(self.model.created_by_user),  # Load created_by user details
-            joinedload(self.model.updated_by_user),  # Load updated_by user details
-        )
-
-        query = query.where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
+        query = select(self.model).where(or_(self.model.is_deleted == False, self.model.is_deleted == None))
 
         for kw, value in kwargs.items():
             if value is not None:
                 query = query.where(getattr(self.model, kw) == value)
         
-        query = query.offset(offset).limit(limit)
+        paged_query = self.paginate(query, offset, limit, order_by, order_desc, cursor)
 
-        if order_by:
-            order_expression = getattr(self.model, order_by)
-            if order_desc:
-                order_expression = desc(order_expression)
-            query = query.order_by(order_expression)
-
-        results = await self.context.db_session.execute(query)
+        results = await self.context.db_session.execute(self.with_profile(paged_query, "summary"))
         pipelines = results.scalars().all()
 
-        return [
+        return await self.make_page([
             PipelineReturn(
                 pipeline_id=pipeline.pipeline_id,
                 pipeline_name=pipeline.pipeline_name,
@@ -112,7 +117,7 @@ class PipelinesService(BaseService):
                 created_by_username=pipeline.created_by_user.username if pipeline.created_by_user else None,
                 updated_by_username=pipeline.updated_by_user.username if pipeline.updated_by_user else None,
             ) for pipeline in pipelines
-        ]
+        ], pipelines, query, limit, order_by, cursor, with_total)
 
         
     async def get(self, id: int):
@@ -132,11 +137,11 @@ class PipelinesService(BaseService):
     
     async def get_definition_by_pipeline_name(self, pipeline_name: str):
         # query to select Pipeline by name
-        statement = (
+        statement = self.with_profile(
             select(Pipeline)
-            .options(joinedload(Pipeline.pipeline_definitions)) 
             .filter(Pipeline.pipeline_name == pipeline_name)
-            .filter(Pipeline.is_deleted == False) 
+            .filter(Pipeline.is_deleted == False),
+            "definition",
         )
 
         result = await self.context.db_session.execute(statement)
@@ -156,13 +161,10 @@ class PipelinesService(BaseService):
 
     async def get_pipeline(self, id: int):
         primary_key_column = await self._get_primary_key_column()
-        statement = (
+        statement = self.with_profile(
             select(self.model)
-                .filter(primary_key_column == id, or_(self.model.is_deleted == False, self.model.is_deleted == None))
-                .options(
-                    joinedload(self.model.pipeline_definitions),
-                    joinedload(self.model.bh_project)
-            )
+                .filter(primary_key_column == id, or_(self.model.is_deleted == False, self.model.is_deleted == None)),
+            "with_definition",
         )
         result = await self.context.db_session.execute(statement=statement)
         response = result.scalar_one_or_none()
@@ -201,7 +203,7 @@ class PipelinesService(BaseService):
                     threshold = 0.8 
                  
                     embed_query = f"""
-                        SELECT *, pipeline_name_embedding <-> '{embedding_str}'::vector AS distance
+                        SELECT {self.select_list()}, pipeline_name_embedding <-> '{embedding_str}'::vector AS distance
                         FROM {Config.DB_SCHEMA}.pipeline
                         WHERE pipeline_name_embedding <-> '{embedding_str}'::vector < '{threshold}'
                         ORDER BY distance ASC
@@ -232,11 +234,13 @@ class PipelinesService(BaseService):
         )
         return last_pipeline.scalar_one_or_none()
 
-    # async def validate_pipeline(self, pipeline_id: int):
-    #     pipeline = await self.get(pipeline_id)
-    #     if not pipeline:
-    #         raise ObjectNotFound
-    #     return pipeline
+    async def validate_pipeline(self, pipeline_id: int, schema_id: Optional[int] = None) -> SchemaValidationResult:
+        """Validate the pipeline definition against the pipeline schema, the latest one by default."""
+        definition = await self.context.pipeline_definition_service.get_pipeline_definition_by_pipeline_id(pipeline_id)
+        results = await self.context.schema_validation_service.validate(
+            [definition.pipeline_json or {}], SchemaTypes.PIPELINE, schema_id=schema_id
+        )
+        return results[0]
 
 
     async def get_pipeline_by_id(self, pipeline_id: int) -> Pipeline:
@@ -279,9 +283,8 @@ class PipelinesService(BaseService):
         content_json = json.dumps(pipeline_json)
         file_path = f"pipeline/{pipeline.pipeline_id}/schema/pipeline.json"
 
-        commit_result = await git_provider.update_file(file_path, commit, content_json, branch)
-        if commit_result['status'] != 200:
-            commit_result = await git_provider.create_initial_commit(file_path, commit, content_json, branch)
+        # Tree based, creates the file as well when it is not in the branch yet
+        commit_result = await git_provider.commit_multiple_files({file_path: content_json}, commit, branch)
 
         return commit_result
     
@@ -389,10 +392,24 @@ class PipelineVersionService(BaseService):
 
 
 class PipelineDebugService:
+    """ Pipeline debug server client, calls go over the shared `grpc_channels`
+        with a GRPC_CALL_TIMEOUT deadline."""
     def __init__(self, host='host.docker.internal', port=15003):
-        self.channel = grpc.insecure_channel(f'{host}:{port}')
-        self.operations_stub = pipeline_operations_pb2_grpc.PipelineOperationsServiceStub(self.channel)
-        self.data_stub = data_pb2_grpc.DataServiceStub(self.channel)
+        self.host = host
+        self.port = port
+
+    async def _operations_stub(self) -> pipeline_operations_pb2_grpc.PipelineOperationsServiceStub:
+        return pipeline_operations_pb2_grpc.PipelineOperationsServiceStub(await grpc_channels.get(self.host, self.port))
+
+    async def _data_stub(self) -> data_pb2_grpc.DataServiceStub:
+        return data_pb2_grpc.DataServiceStub(await grpc_channels.get(self.host, self.port))
+
+    async def is_healthy(self) -> bool:
+        return await grpc_channels.is_healthy(self.host, self.port)
+
+    async def connect(self) -> None:
+        """Fail before a streamed response starts when the debug server can't be reached."""
+        await grpc_channels.get(self.host, self.port)
 
     async def start_pipeline(self, pipeline_name, pipeline_json, mode, checkpoints=None):
         # submit the pipeline
@@ -402,14 +419,16 @@ class PipelineDebugService:
             mode=mode,
             checkpoints=checkpoints,
         )
-        response = MessageToDict(self.operations_stub.StartPipeline(request))
+        stub = await self._operations_stub()
+        response = MessageToDict(await stub.StartPipeline(request, timeout=Config.GRPC_CALL_TIMEOUT))
         return response.get('message')
 
     async def stop_pipeline(self, pipeline_name):
         request = pipeline_operations_pb2.StopPipelineRequest(
             pipeline_name=pipeline_name
         )
-        response = MessageToDict(self.operations_stub.StopPipeline(request))
+        stub = await self._operations_stub()
+        response = MessageToDict(await stub.StopPipeline(request, timeout=Config.GRPC_CALL_TIMEOUT))
         return response.get('message')
 
     async def get_transformation_output(self, pipeline_name, transformation_name, page, page_size, sort_columns):
@@ -420,7 +439,8 @@ class PipelineDebugService:
             page_size=page_size,
             sort_columns=[data_pb2.SortColumn(name=col, order='asc') for col in sort_columns]
         )
-        response = MessageToDict(self.data_stub.GetTransformationOutput(request))
+        stub = await self._data_stub()
+        response = MessageToDict(await stub.GetTransformationOutput(request, timeout=Config.GRPC_CALL_TIMEOUT))
 
         # Transform the response to the desired format
         for output in response.get('outputs', []):
@@ -428,30 +448,74 @@ class PipelineDebugService:
 
         return response
 
+    async def stream_transformation_output(
+            self, pipeline_name, transformation_name, page, page_size, sort_columns
+        ) -> AsyncIterator[Tuple[str, pa.RecordBatch]]:
+        """ Same page as `get_transformation_output`, yielded as `(output_name, RecordBatch)`
+            while the server streams it, so the page is never held as a whole.
+            GRPC_CALL_TIMEOUT bounds the wait for the first message (504 when it
+            runs out), GRPC_STREAM_TIMEOUT the whole stream."""
+        request = data_pb2.TransformationRequest(
+            pipeline_name=pipeline_name,
+            transformation_name=transformation_name,
+            page=page,
+            page_size=page_size,
+            sort_columns=[data_pb2.SortColumn(name=col, order='asc') for col in sort_columns]
+        )
+        stub = await self._data_stub()
+        call = stub.StreamTransformationOutput(request, timeout=Config.GRPC_STREAM_TIMEOUT or None)
+        try:
+            try:
+                message = await asyncio.wait_for(call.read(), timeout=Config.GRPC_CALL_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise HTTPException(
+                    status_code=504,
+                    detail=f"No transformation output within {Config.GRPC_CALL_TIMEOUT}s",
+                )
+            while message is not grpc.aio.EOF:
+                for batch in decode_batches(message.arrow_ipc):
+                    yield message.output_name, batch
+                message = await call.read()
+        finally:
+            call.cancel()
+
     async def get_transformation_count(self, pipeline_name):
         request = data_pb2.GetTransformationOutputCountsRequest(
             pipeline_name=pipeline_name
         )
-        response = MessageToDict(self.data_stub.GetTransformationOutputCounts(request))
+        stub = await self._data_stub()
+        response = MessageToDict(await stub.GetTransformationOutputCounts(request, timeout=Config.GRPC_CALL_TIMEOUT))
         return response
 
     async def run_next_checkpoint(self, pipeline_name):
         request = pipeline_operations_pb2.NextCheckpointRequest(
             pipeline_name=pipeline_name
         )
-        response = MessageToDict(self.operations_stub.NextCheckpoint(request))
+        stub = await self._operations_stub()
+        response = MessageToDict(await stub.NextCheckpoint(request, timeout=Config.GRPC_CALL_TIMEOUT))
         return response.get('message')
 
 
 class PipelineLogService:
     def __init__(self, host='host.docker.internal', port=15003):
-        self.channel = grpc.aio.insecure_channel(f'{host}:{port}')
-        self.log_stub = log_pb2_grpc.LogServiceStub(self.channel)
+        self.host = host
+        self.port = port
+
+    async def connect(self) -> None:
+        """Fail before the response starts when the log server can't be reached."""
+        await grpc_channels.get(self.host, self.port)
 
     async def stream_logs(self, pipeline_name: str):
+        # Log streams stay open as long as the pipeline runs, no deadline here
+        log_stub = log_pb2_grpc.LogServiceStub(grpc_channels.channel(self.host, self.port))
         request = log_pb2.LogRequest(pipeline_name=pipeline_name)
-        async for response in self.log_stub.StreamLogs(request):
-            yield response.log_line
+        call = log_stub.StreamLogs(request)
+        try:
+            async for response in call:
+                yield response.log_line
+        finally:
+            # The client went away, stop the server side stream too
+            call.cancel()
 
 
 class PipelineConnectionService(BaseService):
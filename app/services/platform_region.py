@@ -6,6 +6,8 @@ from app.models.platform_region import (
     PlatformRegionReturn
 )
 from app.services.base import BaseService
+from app.services.reference_data import PLATFORM_REGION
+from app.utils.reference_cache import reference_cache
 
 
 class PlatformRegionService(BaseService):
@@ -13,4 +15,6 @@ class PlatformRegionService(BaseService):
     create_model: PlatformRegionCreate = PlatformRegionCreate
     update_model: PlatformRegionUpdate = PlatformRegionUpdate
     return_schema: PlatformRegionReturn = PlatformRegionReturn
-    
+
+    async def after_write(self) -> None:
+        await reference_cache.invalidate(PLATFORM_REGION)
@@ -0,0 +1,100 @@
+from typing import Dict
+
+from sqlalchemy import func, or_, select
+
+from app.enums.flow import SchemaTypes
+from app.exceptions.base import ObjectNotFound
+from app.models.codes_hdr import CodesDtl, CodesDtlReturn, CodesHdr, CodesHdrReturn
+from app.models.fld_dq_types import FieldDQReturn, FieldDQTypes
+from app.models.platform_region import PlatformRegion, PlatformRegionReturn
+from app.models.schema import Schema
+from app.services.base import BaseService
+from app.utils.reference_cache import reference_cache
+
+# Names of the cached tables, services writing them pass these to `reference_cache.invalidate`
+CODES_HDR = 'codes_hdr'
+CODES_DTL = 'codes_dtl'
+FLD_DQ_TYPES = 'fld_dq_types'
+PLATFORM_REGION = 'platform_region'
+LATEST_SCHEMA = 'latest_schema'
+
+
+def _schema_type_key(schema_type) -> str:
+    # Loaded rows hold the plain value, callers pass the enum or its value
+    return getattr(schema_type, 'value', schema_type)
+
+
+class ReferenceDataService(BaseService):
+    """ Lookups of codes, DQ types, platform regions and the latest schema per
+        type, served from the process-wide `reference_cache`. Each table is read
+        with a single query when its snapshot is missing.
+        Returned objects are copies, not attached to the session."""
+
+    async def codes_hdr(self) -> Dict[int, CodesHdrReturn]:
+        async def load():
+            rows = (await self.context.db_session.execute(select(CodesHdr))).scalars().all()
+            return {row.id: CodesHdrReturn.from_orm(row) for row in rows}
+        return await reference_cache.get_table(CODES_HDR, load)
+
+    async def codes_dtl(self) -> Dict[int, CodesDtlReturn]:
+        async def load():
+            rows = (await self.context.db_session.execute(select(CodesDtl))).scalars().all()
+            return {row.id: CodesDtlReturn.from_orm(row) for row in rows}
+        return await reference_cache.get_table(CODES_DTL, load)
+
+    async def dq_types(self) -> Dict[int, FieldDQReturn]:
+        async def load():
+            rows = (await self.context.db_session.execute(
+                select(FieldDQTypes).where(or_(FieldDQTypes.is_deleted == False, FieldDQTypes.is_deleted == None))
+            )).scalars().all()
+            return {row.dq_id: FieldDQReturn.from_orm(row) for row in rows}
+        return await reference_cache.get_table(FLD_DQ_TYPES, load)
+
+    async def platform_regions(self) -> Dict[int, PlatformRegionReturn]:
+        async def load():
+            rows = (await self.context.db_session.execute(select(PlatformRegion))).scalars().all()
+            return {row.id: PlatformRegionReturn.from_orm(row) for row in rows}
+        return await reference_cache.get_table(PLATFORM_REGION, load)
+
+    async def latest_schema_ids(self) -> Dict[str, int]:
+        async def load():
+            rows = await self.context.db_session.execute(
+                select(Schema.schema_type, func.max(Schema.schema_id)).group_by(Schema.schema_type)
+            )
+            return {_schema_type_key(schema_type): schema_id for schema_type, schema_id in rows.all()}
+        return await reference_cache.get_table(LATEST_SCHEMA, load)
+
+    async def get_code(self, id: int) -> CodesDtlReturn:
+        code = (await self.codes_dtl()).get(id)
+        if code is None:
+            raise ObjectNotFound(context={'column_name': 'id', 'id': id, 'type': CodesDtl.__name__})
+        return code.copy()
+
+    async def get_dq_type(self, id: int) -> FieldDQReturn:
+        dq_type = (await self.dq_types()).get(id)
+        if dq_type is None:
+            raise ObjectNotFound(context={'column_name': 'dq_id', 'id': id, 'type': FieldDQTypes.__name__})
+        return dq_type.copy()
+
+    async def get_platform_region(self, id: int) -> PlatformRegionReturn:
+        region = (await self.platform_regions()).get(id)
+        if region is None:
+            raise ObjectNotFound(context={'column_name': 'id', 'id': id, 'type': PlatformRegion.__name__})
+        return region.copy()
+
+    async def get_latest_schema_id(self, schema_type: SchemaTypes) -> int:
+        schema_id = (await self.latest_schema_ids()).get(_schema_type_key(schema_type))
+        if schema_id is None:
+            raise ObjectNotFound(context={
+                'schema_type': schema_type,
+                'type': Schema.__name__,
+            })
+        return schema_id
+
+    async def warm(self) -> None:
+        """Load every cached table, called at startup."""
+        await self.codes_hdr()
+        await self.codes_dtl()
+        await self.dq_types()
+        await self.platform_regions()
+        await self.latest_schema_ids()
@@ -13,4 +13,9 @@ class BHReleaseBundleService(BaseService):
     create_model: BHReleaseBundleCreate = BHReleaseBundleCreate
     update_model: BHReleaseBundleUpdate = BHReleaseBundleUpdate
     return_schema: BHReleaseBundleReturn = BHReleaseBundleReturn
+    # BHReleaseBundleReturn renders every flow as a FlowReturn
+    load_profiles = {
+        "detail": ("flow.flow_deployment", "flow.flow_config", "flow.flow_definition"),
+    }
+    return_profile = "detail"
     
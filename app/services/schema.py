@@ -1,13 +1,29 @@
+import asyncio
+import json
+from typing import List, Optional
+
+from app.core.config import Config
 from app.enums.flow import SchemaTypes
-from app.exceptions.base import ObjectNotFound
+from app.exceptions.flow import SchemaDoesNotExist
 from app.models.schema import (
     Schema,
     SchemaCreate,
     SchemaUpdate,
-    SchemaReturn
+    SchemaReturn,
+    SchemaValidationResult,
 )
 from app.services.base import BaseService
-from sqlalchemy import select, func
+from app.services.reference_data import LATEST_SCHEMA
+from app.utils.git_utils.git_wrapper import GitWrapper
+from app.utils.reference_cache import reference_cache
+from app.utils.schema_validation import collect_errors, compile_schema, schema_validators
+
+# Schema file of each type in the schema repository, unless the schema row has a path
+SCHEMA_FILE_PATHS = {
+    SchemaTypes.PIPELINE.value: "pipeline/pipeline.json",
+    SchemaTypes.FLOW.value: "flows/flows.json",
+}
+
 
 class SchemaService(BaseService):
     model: Schema = Schema
@@ -15,19 +31,65 @@ class SchemaService(BaseService):
     update_model: SchemaUpdate = SchemaUpdate
     return_schema: SchemaReturn = SchemaReturn
 
-    async def get_latest_by_type(self, schema_type: SchemaTypes):
-        
-        statement = (
-            select(func.max(self.model.schema_id))
-            .where(self.model.schema_type == schema_type)
-        )
-        result = await self.context.db_session.execute(statement=statement)
-        response = result.scalar_one_or_none()
-
-        if response is None:
-            raise ObjectNotFound(context={
-                'schema_type': schema_type,
-                'type': self.model.__name__,
-            })
-
-        return response
+    async def after_write(self) -> None:
+        await reference_cache.invalidate(LATEST_SCHEMA)
+
+    async def get_latest_by_type(self, schema_type: SchemaTypes) -> int:
+        """Id of the newest schema of `schema_type`, from the reference data cache."""
+        return await self.context.reference_data_service.get_latest_schema_id(schema_type)
+
+
+class SchemaValidationService(BaseService):
+    """ Validates pipeline / flow JSONs against the schemas of the schema repository.
+        Validators are compiled once per (commit, schema file) and shared by the
+        process, every error of a document is reported."""
+
+    async def get_validator(
+            self,
+            schema_type: SchemaTypes,
+            schema_id: Optional[int] = None,
+            version_tag: Optional[str] = None,
+        ):
+        path = SCHEMA_FILE_PATHS.get(SchemaTypes(schema_type).value)
+        ref = version_tag
+        if version_tag is None:
+            if schema_id is None:
+                schema_id = await self.context.schema_service.get_latest_by_type(schema_type)
+            schema = await self.context.schema_service.get(id=schema_id)
+            ref = schema.commit_id or schema.version_tag
+            path = schema.schema_path or path
+        if not ref or not path:
+            raise SchemaDoesNotExist()
+
+        git_provider = GitWrapper(Config.TOKEN, Config.OWNER, Config.REPO, 4100)
+        sha = await git_provider.resolve_commit_sha(ref)
+        if sha is None:
+            raise SchemaDoesNotExist()
+
+        async def load():
+            result = await git_provider.get_file_content_by_version_tag(file_path=path, ref=sha)
+            if result["status"] != 200:
+                raise SchemaDoesNotExist()
+            return compile_schema(json.loads(result["content"]))
+
+        return await schema_validators.get_or_load((sha, path), load)
+
+    async def validate(
+            self,
+            documents: List[dict],
+            schema_type: SchemaTypes,
+            schema_id: Optional[int] = None,
+            version_tag: Optional[str] = None,
+        ) -> List[SchemaValidationResult]:
+        """Validate every document against one schema, results are in the order of `documents`."""
+        validator = await self.get_validator(schema_type, schema_id, version_tag)
+
+        def validate_all():
+            return [collect_errors(validator, document) for document in documents]
+
+        # Large batches would hold the event loop for a while
+        errors = await asyncio.to_thread(validate_all)
+        return [
+            SchemaValidationResult(index=index, valid=not doc_errors, errors=doc_errors)
+            for index, doc_errors in enumerate(errors)
+        ]
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.config import Config
+from app.utils.request_metrics import http_event_hooks
+
+logger = logging.getLogger(__name__)
+
+# Worth another try, anything else in 4xx is our request's fault
+_RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class AgentClient:
+    """ Client of the BH AI agent shared by the whole process.
+
+        - One pooled `httpx.AsyncClient`, created on first use.
+        - At most `max_concurrency` requests are in flight, callers can fan out freely.
+        - Timeouts, connection errors and retryable statuses are retried `retries`
+          times with exponential backoff.
+
+    Args:
+        url: str: Agent endpoint taking `{"operation_type", "params", "thread_id"}`
+        max_concurrency: int: Maximum number of concurrent requests
+        timeout: float: Request timeout in seconds
+        retries: int: Retries after the first attempt
+        retry_backoff: float: Seconds before the first retry, doubled on every next one"""
+
+    def __init__(
+            self,
+            url: str,
+            max_concurrency: int = 8,
+            timeout: float = 120,
+            retries: int = 2,
+            retry_backoff: float = 1.0,
+        ):
+        self.url = url
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.retry_backoff = retry_backoff
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "AgentClient":
+        return cls(
+            url=cfg.BH_AI_AGENT_URL,
+            max_concurrency=cfg.AI_AGENT_MAX_CONCURRENCY,
+            timeout=cfg.AI_AGENT_TIMEOUT,
+            retries=cfg.AI_AGENT_RETRIES,
+            retry_backoff=cfg.AI_AGENT_RETRY_BACKOFF,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                event_hooks=http_event_hooks(),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def run(self, operation_type: str, params: dict, thread_id: str) -> Optional[dict]:
+        """ Run an agent operation and return its decoded `result`, None when the
+            agent did not answer successfully after all retries or its `result` is
+            not a JSON object."""
+        client = self.client
+        payload = {"operation_type": operation_type, "params": params, "thread_id": thread_id}
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            async with self._semaphore:
+                try:
+                    response = await client.post(self.url, json=payload)
+                except httpx.TransportError as e:
+                    logger.warning(f"Agent {operation_type} for {thread_id} failed (attempt {attempt + 1}): {e!r}")
+                    continue
+            if response.status_code == 200:
+                return self._decode_result(response, operation_type, thread_id)
+            logger.warning(f"Agent {operation_type} for {thread_id} returned {response.status_code} (attempt {attempt + 1})")
+            if response.status_code not in _RETRY_STATUS:
+                return None
+        return None
+
+    @staticmethod
+    def _decode_result(response: httpx.Response, operation_type: str, thread_id: str) -> Optional[dict]:
+        try:
+            result = json.loads(response.json().get("result") or "{}")
+        except (ValueError, TypeError, AttributeError) as e:
+            # ValueError covers JSONDecodeError, the others a body / result of the wrong shape
+            logger.warning(f"Agent {operation_type} for {thread_id} returned a malformed result: {e!r}")
+            return None
+        if not isinstance(result, dict):
+            logger.warning(f"Agent {operation_type} for {thread_id} returned a {type(result).__name__} result")
+            return None
+        return result
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+agent_client = AgentClient.from_config(Config)
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Hashable, List, Optional, Tuple
+
+from app.core.config import Config
+from app.exceptions import BaseHTTPException
+from app.utils.cache_utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Dag run states after which nothing changes any more
+TERMINAL_STATES = {'success', 'failed'}
+
+
+class AirflowGateway:
+    """ Dag run status reads shared by every request of the process.
+
+        - Statuses are cached for `status_ttl` seconds per (environment, dag, run),
+          finished runs for `terminal_ttl`; concurrent readers share one call.
+        - Batches go out concurrently, at most `max_concurrency` calls at a time.
+        - `watch` polls a set of runs and yields only state changes, so one
+          subscription replaces the per-DAG polling of every client. A run
+          Airflow answers 404 for, or that failed `max_failures` polls in a
+          row, is reported with its error and no longer polled.
+
+    Args:
+        status_ttl: float: Seconds a running dag run status is reused
+        terminal_ttl: float: Seconds a finished dag run status is reused
+        max_concurrency: int: Maximum number of concurrent Airflow calls per batch
+        cache_size: int: Maximum number of cached statuses
+        max_failures: int: Consecutive failed polls after which `watch` gives a run up"""
+
+    def __init__(
+            self,
+            status_ttl: float = 5,
+            terminal_ttl: float = 3600,
+            max_concurrency: int = 8,
+            cache_size: int = 4096,
+            max_failures: int = 3,
+        ):
+        self.status_ttl = status_ttl
+        self.terminal_ttl = terminal_ttl
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_failures = max(1, max_failures)
+        self._statuses = TTLCache(maxsize=cache_size, ttl=status_ttl)
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "AirflowGateway":
+        return cls(
+            status_ttl=cfg.AIRFLOW_STATUS_TTL,
+            terminal_ttl=cfg.AIRFLOW_TERMINAL_STATUS_TTL,
+            max_concurrency=cfg.AIRFLOW_MAX_CONCURRENCY,
+            cache_size=cfg.AIRFLOW_STATUS_CACHE_SIZE,
+            max_failures=cfg.AIRFLOW_WATCH_MAX_FAILURES,
+        )
+
+    async def get_status(self, airflow_service, env_key: Hashable, dag_id: str, dag_run_id: str) -> dict:
+        """ `get_dag_status` response of a dag run, from the cache when recent enough."""
+        key = (env_key, dag_id, dag_run_id)
+
+        async def load():
+            return await airflow_service.get_dag_status(dag_id=dag_id, dag_run_id=dag_run_id)
+
+        response = await self._statuses.get_or_load(key, load)
+        if run_state(response) in TERMINAL_STATES:
+            self._statuses.set(key, response, ttl=self.terminal_ttl)
+        return response
+
+    async def get_statuses(self, airflow_service, env_key: Hashable, runs: List[Tuple[str, str]]) -> List[dict]:
+        """ Status of every `(dag_id, dag_run_id)` in `runs`, in the same order. A failed
+            lookup is reported in its item instead of failing the batch."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def one(dag_id: str, dag_run_id: str) -> dict:
+            item = {'dag_id': dag_id, 'dag_run_id': dag_run_id}
+            try:
+                async with semaphore:
+                    response = await self.get_status(airflow_service, env_key, dag_id, dag_run_id)
+            except BaseHTTPException as e:
+                return {**item, 'state': None, 'error': e.formatted_message, 'status_code': e.status_code}
+            except Exception as e:
+                return {**item, 'state': None, 'error': str(e)}
+            return {
+                **item,
+                'state': run_state(response),
+                'status_code': (response or {}).get('RestApiStatusCode'),
+                'run': (response or {}).get('RestApiResponse'),
+            }
+
+        return list(await asyncio.gather(*(one(dag_id, dag_run_id) for dag_id, dag_run_id in runs)))
+
+    async def watch(
+            self,
+            airflow_service,
+            env_key: Hashable,
+            runs: List[Tuple[str, str]],
+            interval: Optional[float] = None,
+        ) -> AsyncIterator[dict]:
+        """ Yield the status of each run first, then every state change. Items of runs
+            that can't be read carry an `error`, with `done` set once the run is given
+            up. Ends once every run has finished or was given up."""
+        interval = self.status_ttl if interval is None else max(interval, self.status_ttl)
+        runs = list(dict.fromkeys(runs))
+        last_seen = {}
+        failures = {}
+        finished = set()
+        while True:
+            polled = [run for run in runs if run not in finished]
+            for item in await self.get_statuses(airflow_service, env_key, polled):
+                run = (item['dag_id'], item['dag_run_id'])
+                if item['state'] is None:
+                    item['error'] = item.get('error') or f"Airflow answered {item.get('status_code')}"
+                    failures[run] = failures.get(run, 0) + 1
+                    if item.get('status_code') == 404 or failures[run] >= self.max_failures:
+                        finished.add(run)
+                        yield {**item, 'done': True}
+                        continue
+                else:
+                    failures[run] = 0
+                    if item['state'] in TERMINAL_STATES:
+                        finished.add(run)
+                seen = (item['state'], item.get('error'))
+                if last_seen.get(run) != seen:
+                    last_seen[run] = seen
+                    yield item
+            if len(finished) == len(runs):
+                return
+            await asyncio.sleep(interval)
+
+
+def run_state(response: Optional[dict]) -> Optional[str]:
+    if not response or response.get('RestApiStatusCode') != 200:
+        return None
+    return (response.get('RestApiResponse') or {}).get('state')
+
+
+airflow_gateway = AirflowGateway.from_config(Config)
@@ -1,7 +1,11 @@
+import asyncio
 import boto3
+import hashlib
 import logging
 import time
 from app.utils.airflow_utils.airflow_services import AirflowService
+from app.utils.cache_utils import TTLCache
+from app.utils.request_metrics import instrument_boto3_client
 
 from botocore.exceptions import ClientError
 import requests
@@ -13,6 +17,23 @@ from app.exceptions.airflow import AirflowException
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_mwaa_clients = TTLCache(maxsize=64, ttl=3600)
+
+
+def get_mwaa_client(access_key, secret_access_key, region_name):
+    """ MWAA client per credentials and region shared by the process, boto3 clients are thread safe."""
+    key = (access_key, hashlib.sha256((secret_access_key or '').encode()).hexdigest(), region_name)
+    client = _mwaa_clients.get(key)
+    if client is None:
+        session = boto3.Session(
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_access_key,
+            region_name=region_name,
+        )
+        client = instrument_boto3_client(session.client("mwaa"))
+        _mwaa_clients.set(key, client)
+    return client
+
 
 class AWSAirflowService(AirflowService):
 
@@ -24,15 +45,12 @@ class AWSAirflowService(AirflowService):
         self.region_name = region_name
         self.environment_name = environment_name
 
-        # Create a boto3 session
-        self.session = boto3.Session(
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_access_key,
-            region_name=region_name,
-        )
+        # Shared MWAA client, building one per request costs more than the call itself
+        self.airflow_session = get_mwaa_client(access_key, secret_access_key, region_name)
 
-        # Create an Airflow session
-        self.airflow_session = self.session.client("mwaa")
+    async def invoke_rest_api(self, **request_params) -> dict:
+        """Airflow REST API call through MWAA, run in a worker thread."""
+        return await asyncio.to_thread(self.airflow_session.invoke_rest_api, **request_params)
 
 
     async def list_environments(self) -> list[str]:
@@ -42,7 +60,7 @@ class AWSAirflowService(AirflowService):
         :return: List of environment names.
         """
         try:
-            response = self.airflow_session.list_environments()
+            response = await asyncio.to_thread(self.airflow_session.list_environments)
             environments = response.get("Environments", [])
             logger.info(f"Retrieved MWAA environments: {environments}")
             return environments
@@ -58,7 +76,7 @@ class AWSAirflowService(AirflowService):
         :return: Dictionary containing environment details.
         """
         try:
-            response = self.airflow_session.get_environment(Name=environment_name)
+            response = await asyncio.to_thread(self.airflow_session.get_environment, Name=environment_name)
             environment_details = response.get("Environment", {})
             logger.info(
                 f"Retrieved details for environment '{environment_name}': {environment_details}"
@@ -79,7 +97,7 @@ class AWSAirflowService(AirflowService):
                     "Method": "GET",
                     "QueryParameters": {"paused": "false"},
                 }
-                response = self.airflow_session.invoke_rest_api(**request_params)
+                response = await self.invoke_rest_api(**request_params)
                 return response
         except Exception as e:
             logger.error(f"Failed to make API call: {e}")
@@ -98,7 +116,7 @@ class AWSAirflowService(AirflowService):
                     "Method": "POST",
                     "Body": {"conf": conf, "dag_run_id": dag_run_id},
                 }
-                response = self.airflow_session.invoke_rest_api(**request_params)
+                response = await self.invoke_rest_api(**request_params)
                 if response["RestApiStatusCode"] == 200:
                     return response["RestApiResponse"]
                 return response
@@ -114,7 +132,7 @@ class AWSAirflowService(AirflowService):
                     "Path": f"/dags/{dag_id}/dagRuns/{dag_run_id}",
                     "Method": "GET",
                 }
-                response = self.airflow_session.invoke_rest_api(**request_params)
+                response = await self.invoke_rest_api(**request_params)
                 return response
         except Exception as e:
             logger.error(f"Failed to make API call: {e}")
@@ -128,7 +146,7 @@ class AWSAirflowService(AirflowService):
                     "Path": f"/dags/{dag_id}",
                     "Method": "GET",
                 }
-                response = self.airflow_session.invoke_rest_api(**request_params)
+                response = await self.invoke_rest_api(**request_params)
                 return response["RestApiResponse"]["last_parsed_time"]
         except Exception as e:
             logger.error(f"Failed to make API call: {e}")
@@ -143,7 +161,7 @@ class AWSAirflowService(AirflowService):
                     "Path": f"/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances/{task_id}/logs/1?full_content=false",
                     "Method": "GET",
                 }
-                response = self.airflow_session.invoke_rest_api(**request_params)
+                response = await self.invoke_rest_api(**request_params)
                 if response["RestApiStatusCode"] == 200:
                     return response["RestApiResponse"]
                 return response
@@ -159,7 +177,7 @@ class AWSAirflowService(AirflowService):
                     "Path": f"/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances",
                     "Method": "GET",
                 }
-                response = self.airflow_session.invoke_rest_api(**request_params)
+                response = await self.invoke_rest_api(**request_params)
                 if response["RestApiStatusCode"] == 200:
                     return response["RestApiResponse"]
                 return response
@@ -175,7 +193,7 @@ class AWSAirflowService(AirflowService):
                     "Path": f"/connections",
                     "Method": "GET",
                 }
-                response = self.airflow_session.invoke_rest_api(**request_params)
+                response = await self.invoke_rest_api(**request_params)
                 if response["RestApiStatusCode"] == 200:
                     return response["RestApiResponse"]
                 return response
@@ -191,7 +209,7 @@ class AWSAirflowService(AirflowService):
                     "Path": f"/connections/{connection_id}",
                     "Method": "GET",
                 }
-                response = self.airflow_session.invoke_rest_api(**request_params)
+                response = await self.invoke_rest_api(**request_params)
                 if response["RestApiStatusCode"] == 200:
                     return response["RestApiResponse"]
                 return response
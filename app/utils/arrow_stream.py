@@ -0,0 +1,88 @@
+from typing import AsyncIterator, List, Optional, Tuple, TypeVar
+
+import pyarrow as pa
+
+from app.utils.json_utils import NDJSON_MEDIA_TYPE, dumps
+
+# Media type of the streamed transformation output in Arrow format
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+T = TypeVar('T')
+_EXHAUSTED = object()
+
+
+async def prefetch(iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+    """ Wait for the first item of `iterator` now and return an iterator over all of
+        its items, so errors before the first one surface before a response starts."""
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        first = _EXHAUSTED
+
+    async def items() -> AsyncIterator[T]:
+        try:
+            if first is _EXHAUSTED:
+                return
+            yield first
+            async for item in iterator:
+                yield item
+        finally:
+            await iterator.aclose()
+    return items()
+
+
+def decode_batches(arrow_ipc: bytes) -> List[pa.RecordBatch]:
+    """Record batches of one Arrow IPC stream message, buffers are not copied."""
+    return list(pa.ipc.open_stream(pa.py_buffer(arrow_ipc)))
+
+
+class _ChunkSink:
+    """Write-only file collecting what the IPC writer emits until it is drained."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def to_ndjson(batches: AsyncIterator[Tuple[str, pa.RecordBatch]]) -> AsyncIterator[bytes]:
+    """ One JSON line per record batch, columns as arrays:
+        `{"output": ..., "num_rows": ..., "columns": {"col": [...]}}`"""
+    async for output_name, batch in batches:
+        line = {'output': output_name, 'num_rows': batch.num_rows, 'columns': batch.to_pydict()}
+        yield dumps(line) + b'\n'
+
+
+async def to_arrow_stream(
+        batches: AsyncIterator[Tuple[str, pa.RecordBatch]],
+        output_name: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+    """ A single Arrow IPC stream with the batches of `output_name` (the first
+        output received when not given), re-chunked as they arrive."""
+    sink = _ChunkSink()
+    writer = None
+    async for name, batch in batches:
+        if output_name is None:
+            output_name = name
+        if name != output_name:
+            continue
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, batch.schema)
+        writer.write_batch(batch)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
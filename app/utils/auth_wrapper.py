@@ -1,3 +1,5 @@
+import hashlib
+import time
 from datetime import datetime, timezone
 from typing import Dict, Optional
 from fastapi import Depends, HTTPException, Header
@@ -6,7 +8,9 @@ import logging
 from fastapi.security import APIKeyHeader
 
 from app.api.deps import get_context
+from app.core.config import Config
 from app.core.context import Context
+from app.utils.cache_utils import TTLCache
 
 api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 logger = logging.getLogger(__name__)
@@ -37,6 +41,9 @@ ROLE_MATRIX = {
 
 ALGORITHM = "HS256"
 
+# sha256(token) -> decoded claims, each entry lives until the token's `exp`
+_token_cache = TTLCache(maxsize=Config.AUTH_TOKEN_CACHE_SIZE, ttl=0)
+
 
 def decode_jwt_token(token: str) -> Optional[Dict]:
     """
@@ -63,6 +70,29 @@ def decode_jwt_token(token: str) -> Optional[Dict]:
     return None
 
 
+def decode_jwt_token_cached(token: str) -> Optional[Dict]:
+    """
+    Same as `decode_jwt_token` but keeps the decoded claims of a token until
+    the token expires, so repeated requests with one token decode it once.
+
+    Args:
+        token (str): The JWT token to decode
+
+    Returns:
+        Optional[Dict]: The decoded payload or None if the decoding fails
+    """
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    decoded = _token_cache.get(token_hash)
+    if decoded is not None:
+        return decoded
+
+    decoded = decode_jwt_token(token)
+    exp = decoded.get("exp") if decoded else None
+    if isinstance(exp, (int, float)):
+        _token_cache.set(token_hash, decoded, ttl=exp - time.time())
+    return decoded
+
+
 # Check if token is expired
 def is_token_expired(decoded_token: Dict) -> bool:
     """
@@ -153,7 +183,7 @@ async def get_current_user(
         raise HTTPException(status_code=403, detail="Token is missing")
 
     token = token.replace("Bearer ", "")
-    decoded = decode_jwt_token(token)
+    decoded = decode_jwt_token_cached(token)
 
     if not decoded:
         # Raise an exception if the token is invalid
@@ -207,9 +237,6 @@ def authorize(api_module: str, action: str) -> Optional[Dict]:
         # Extract user roles from the realm_access part of the user data
         user_roles = set(user.get("realm_access", {}).get("roles", []))
 
-        user_detail = await ctx.user_detail_service.get_or_create_user_detail(
-            user.get("preferred_username"), user.get("email")
-        )
         # Check if any of the user's roles grants the required access to the specified API module
         if any(
             # The walrus operator (:=) assigns the role's access level in the module to 'access' and
@@ -218,12 +245,16 @@ def authorize(api_module: str, action: str) -> Optional[Dict]:
             or (action == "view" and access == "edit")
             for role in user_roles
         ):
-            # if user is authorized then check if user present in user detail model
+            # if user is authorized then check if user present in user detail model,
+            # warm identities are served from the process cache without a DB query
+            user_detail_id = await ctx.user_detail_service.get_user_detail_id(
+                user.get("preferred_username"), user.get("email")
+            )
             # If the user has the required permission, return authorized status and the username
             return {
                 "authorized": True,
                 "username": user.get("preferred_username"),
-                "user_detail_id": user_detail.user_detail_id,
+                "user_detail_id": user_detail_id,
             }
 
         # Raise an exception if the user does not have the required permissions
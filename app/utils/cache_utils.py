@@ -0,0 +1,106 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+# Answer of an in-flight load whose caller was cancelled, its waiters load again
+_RETRY = object()
+
+
+class TTLCache:
+    """ Process local cache bounded by size (LRU) with a time-to-live per entry.
+        Meant to be used from the event loop, so no locking is done here.
+
+    Args:
+        maxsize: int: Maximum number of entries kept, the least recently used entry is evicted first
+        ttl: float: Default time-to-live of an entry in seconds"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def pop_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """ Drop every entry for which `predicate(key, value)` is true and return how many were dropped."""
+        keys = [key for key, (value, _) in self._data.items() if predicate(key, value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def get_or_load(
+            self,
+            key: Hashable,
+            loader: Callable[[], Awaitable[Any]],
+            ttl: Optional[float] = None,
+        ) -> Any:
+        """ Return the cached value for `key` or await `loader()` to fill it.
+            Concurrent callers for the same missing key share a single load. The
+            load runs in the task of the first caller; when that caller is
+            cancelled, one of the waiters loads again instead of being cancelled.
+        """
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            value = await asyncio.shield(inflight)
+            if value is not _RETRY:
+                return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            self.set(key, value, ttl=ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import Config
+from app.utils.cache_utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Metadata key of the uploaded DAG object holding its fingerprint
+FINGERPRINT_METADATA_KEY = 'flow-fingerprint'
+
+# Response headers of a flow definition save: unchanged / scheduled / validated, and the fingerprint
+DAG_DEPLOYMENT_HEADER = 'X-DAG-Deployment'
+DAG_FINGERPRINT_HEADER = 'X-DAG-Fingerprint'
+
+
+def dag_fingerprint(flow_json: Any, generator_inputs: dict) -> str:
+    """Hash of the normalised flow JSON and of everything else the DAG generator reads."""
+    payload = json.dumps(
+        {'flow': flow_json, 'inputs': generator_inputs},
+        sort_keys=True, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DagDeployer:
+    """ Uploads DAG artefacts to their targets (e.g. `(bucket, key)`) in the background.
+
+        - `needs_upload` compares the fingerprint with the one the target holds,
+          read from the target itself: another worker may have deployed a
+          different artefact since this one last did.
+        - One upload per target runs at a time. Artefacts scheduled meanwhile
+          replace each other, only the latest one is uploaded next.
+        - A failed upload is kept as the `failed` status of its target until the
+          next upload of that target succeeds.
+
+    Args:
+        max_targets: int: Maximum number of failed uploads remembered"""
+
+    def __init__(self, max_targets: int = 1024):
+        self._failures = TTLCache(maxsize=max(1, max_targets), ttl=24 * 3600)
+        self._pending: Dict[Hashable, Tuple[str, Callable[[], None]]] = {}
+        self._uploading: Dict[Hashable, str] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "DagDeployer":
+        return cls(max_targets=cfg.DAG_DEPLOY_MAX_TARGETS)
+
+    def in_flight(self, target: Hashable) -> Optional[str]:
+        """Fingerprint this worker is about to upload to `target`, None when idle."""
+        pending = self._pending.get(target)
+        if pending is not None:
+            return pending[0]
+        return self._uploading.get(target)
+
+    async def needs_upload(
+            self,
+            target: Hashable,
+            fingerprint: str,
+            deployed_fingerprint: Callable[[], Optional[str]],
+        ) -> bool:
+        """ False when `fingerprint` is on its way to `target` or already there.
+            `deployed_fingerprint()` reads the fingerprint of the target (e.g. with
+            an S3 HEAD), it runs in a worker thread."""
+        in_flight = self.in_flight(target)
+        if in_flight is not None:
+            # A newer or older artefact queued meanwhile still needs this one after it
+            return in_flight != fingerprint
+        return await asyncio.to_thread(deployed_fingerprint) != fingerprint
+
+    def status(self, target: Hashable) -> Optional[dict]:
+        """ `{"state": "pending" | "uploading" | "failed", "fingerprint", "error"}` of
+            `target` on this worker, None when nothing is known."""
+        pending = self._pending.get(target)
+        if pending is not None:
+            return {'state': 'pending', 'fingerprint': pending[0], 'error': None}
+        if target in self._uploading:
+            return {'state': 'uploading', 'fingerprint': self._uploading[target], 'error': None}
+        return self._failures.get(target)
+
+    def schedule(self, target: Hashable, fingerprint: str, upload: Callable[[], None]) -> None:
+        """Run the blocking `upload()` of `fingerprint` to `target` in a worker thread, in the background."""
+        self._pending[target] = (fingerprint, upload)
+        if target not in self._tasks:
+            self._tasks[target] = asyncio.create_task(self._run(target), name=f"dag-deploy-{target}")
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Wait for the scheduled uploads, called at shutdown."""
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    async def _run(self, target: Hashable) -> None:
+        try:
+            while target in self._pending:
+                fingerprint, upload = self._pending.pop(target)
+                self._uploading[target] = fingerprint
+                try:
+                    await asyncio.to_thread(upload)
+                except Exception as e:
+                    logger.exception(f"Could not deploy DAG to {target}")
+                    self._failures.set(target, {'state': 'failed', 'fingerprint': fingerprint, 'error': str(e)})
+                else:
+                    self._failures.pop(target)
+                finally:
+                    self._uploading.pop(target, None)
+        finally:
+            self._tasks.pop(target, None)
+
+
+dag_deployer = DagDeployer.from_config(Config)
@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import Config
+from app.db.base import AsyncSessionLocal
+from app.models.embedding_cache import EmbeddingCache
+from app.utils.cache_utils import TTLCache
+from app.utils.request_metrics import http_event_hooks
+
+logger = logging.getLogger(__name__)
+
+# Rows per statement against `embedding_cache`, keeps well under the bind parameter limit
+_STORE_CHUNK = 1000
+
+
+def _chunks(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class EmbeddingClient:
+    """ Client of the embedding service shared by the whole process.
+
+        - One pooled `httpx.AsyncClient`, created on first use.
+        - Texts are de-duplicated and sent in batches of `batch_size`, at most
+          `max_concurrency` requests are in flight.
+        - Results are cached by `text_hash` in process (LRU) and in the
+          `embedding_cache` table, so an unchanged text is embedded only once.
+
+    Args:
+        url: str: Endpoint taking `{"texts": [...]}` and returning `{"embeddings": [...]}`
+        model: str: Name of the embedding model, part of the cache key
+        batch_size: int: Maximum number of texts per request
+        max_concurrency: int: Maximum number of concurrent requests
+        timeout: float: Request timeout in seconds
+        cache_size: int: Entries of the in-process cache
+        cache_ttl: float: Time-to-live of the in-process entries in seconds"""
+
+    def __init__(
+            self,
+            url: str,
+            model: str = 'default',
+            batch_size: int = 64,
+            max_concurrency: int = 4,
+            timeout: float = 60,
+            cache_size: int = 4096,
+            cache_ttl: float = 3600,
+        ):
+        self.url = url
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._memory = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "EmbeddingClient":
+        return cls(
+            url=cfg.EMBEDDING_SERVICE_URL,
+            model=cfg.EMBEDDING_MODEL,
+            batch_size=cfg.EMBEDDING_BATCH_SIZE,
+            max_concurrency=cfg.EMBEDDING_MAX_CONCURRENCY,
+            timeout=cfg.EMBEDDING_TIMEOUT,
+            cache_size=cfg.EMBEDDING_CACHE_SIZE,
+            cache_ttl=cfg.EMBEDDING_CACHE_TTL,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                event_hooks=http_event_hooks(),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def text_hash(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\x00{text}".encode('utf-8')).hexdigest()
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """ Embeddings of `texts`, in the same order."""
+        keys = [self.text_hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        for key in keys:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                found[key] = embedding
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            stored = await self._load_stored(missing.keys())
+            found.update(stored)
+            for key in stored:
+                del missing[key]
+
+        if missing:
+            fetched = await self._fetch(missing)
+            await self._store(fetched)
+            found.update(fetched)
+
+        for key, embedding in found.items():
+            self._memory.set(key, embedding)
+        return [found[key] for key in keys]
+
+    async def _fetch(self, texts: Dict[str, str]) -> Dict[str, List[float]]:
+        batches = _chunks(list(texts), self.batch_size)
+        results = await asyncio.gather(*(self._post([texts[key] for key in batch]) for batch in batches))
+        fetched = {}
+        for batch, embeddings in zip(batches, results):
+            fetched.update(zip(batch, embeddings))
+        return fetched
+
+    async def _post(self, texts: List[str]) -> List[List[float]]:
+        client = self.client
+        async with self._semaphore:
+            try:
+                response = await client.post(self.url, json={"texts": texts})
+                response.raise_for_status()
+                embeddings = response.json()["embeddings"]
+            except httpx.HTTPError as e:
+                raise HTTPException(status_code=500, detail=f"Failed to get embeddings: {str(e)}")
+        if len(embeddings) != len(texts):
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to get embeddings: expected {len(texts)}, got {len(embeddings)}",
+            )
+        return embeddings
+
+    async def _load_stored(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        # The cache only saves work, it never fails the caller
+        try:
+            stored = {}
+            async with AsyncSessionLocal() as session:
+                for chunk in _chunks(list(keys), _STORE_CHUNK):
+                    rows = await session.execute(
+                        select(EmbeddingCache.text_hash, EmbeddingCache.embedding)
+                        .where(EmbeddingCache.text_hash.in_(chunk))
+                    )
+                    stored.update((key, [float(value) for value in embedding]) for key, embedding in rows)
+            return stored
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return {}
+
+    async def _store(self, embeddings: Dict[str, List[float]]) -> None:
+        if not embeddings:
+            return
+        try:
+            rows = [{'text_hash': key, 'embedding': value} for key, value in embeddings.items()]
+            async with AsyncSessionLocal() as session:
+                for chunk in _chunks(rows, _STORE_CHUNK):
+                    await session.execute(
+                        insert(EmbeddingCache).values(chunk).on_conflict_do_nothing(index_elements=['text_hash'])
+                    )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+embedding_client = EmbeddingClient.from_config(Config)
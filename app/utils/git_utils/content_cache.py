@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Hashable, Optional, Tuple
+
+from app.core.config import Config
+from app.utils.cache_utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Content at a commit / tag object SHA never changes, keep it until evicted
+_IMMUTABLE_TTL = 30 * 24 * 3600
+# Seconds between two prunes of the on-disk copy, sooner when a tenth of its cap was written since
+_PRUNE_INTERVAL = 300
+
+
+def credential_scope(secret: Optional[str]) -> str:
+    """ Short digest of the token / credentials a read is made with. It is part of
+        every cache key, so content is only served to callers using the same credentials."""
+    return hashlib.sha256((secret or '').encode('utf-8')).hexdigest()[:16]
+
+
+class GitContentCache:
+    """ Cache of git provider reads shared by the process.
+
+        - `get_or_load` serves content that is immutable for its key, e.g.
+          `(repo, credential scope, commit sha, path)`, from memory, then
+          from `directory`, and loads it once otherwise. The on-disk copy is
+          kept under `max_bytes`, least recently read files are removed
+          first, and files older than `max_age` are not served.
+        - `refs` maps refs (tags, branches) to commit SHAs for `ref_ttl` seconds.
+        - `validators` keeps the ETag and body of the last answer per URL, for
+          conditional requests.
+
+    Args:
+        directory: str: Directory of the on-disk copy, memory only when empty
+        memory_size: int: Maximum number of entries kept in memory (per kind)
+        ref_ttl: float: Seconds a resolved ref is trusted without asking the provider
+        max_bytes: int: Maximum size of the on-disk copy
+        max_age: float: Seconds a file of the on-disk copy is kept"""
+
+    def __init__(
+            self,
+            directory: Optional[str] = None,
+            memory_size: int = 1024,
+            ref_ttl: float = 60,
+            max_bytes: int = 512 * 1024 * 1024,
+            max_age: float = 7 * 24 * 3600,
+        ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._last_prune = None
+        self._written = 0
+        self._contents = TTLCache(maxsize=memory_size, ttl=_IMMUTABLE_TTL)
+        self.refs = TTLCache(maxsize=memory_size, ttl=ref_ttl)
+        self.validators = TTLCache(maxsize=memory_size, ttl=_IMMUTABLE_TTL)
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "GitContentCache":
+        return cls(
+            directory=cfg.GIT_CONTENT_CACHE_DIR,
+            memory_size=cfg.GIT_CONTENT_CACHE_SIZE,
+            ref_ttl=cfg.GIT_REF_CACHE_TTL,
+            max_bytes=cfg.GIT_CONTENT_CACHE_MAX_MB * 1024 * 1024,
+            max_age=cfg.GIT_CONTENT_CACHE_MAX_AGE,
+        )
+
+    async def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[str]]) -> str:
+        """Content of `key`, `loader()` is awaited once when neither memory nor disk has it."""
+        async def load() -> str:
+            content = await asyncio.to_thread(self._read, key)
+            if content is None:
+                content = await loader()
+                await asyncio.to_thread(self._write, key, content)
+                if self._prune_due():
+                    await asyncio.to_thread(self.prune)
+            return content
+        return await self._contents.get_or_load(key, load)
+
+    def clear(self) -> None:
+        self._contents.clear()
+        self.refs.clear()
+        self.validators.clear()
+
+    def _path(self, key: Tuple[Hashable, ...]) -> str:
+        digest = hashlib.sha256('\0'.join(map(str, key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _read(self, key: Tuple[Hashable, ...]) -> Optional[str]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - os.stat(path).st_mtime > self.max_age:
+                return None
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            # The modification time is the last read, least recently read files are pruned first
+            os.utime(path)
+            return content
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read git cache entry {key}: {e}")
+            return None
+
+    def _write(self, key: Tuple[Hashable, ...], content: str) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Readers never see a partial file
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+            self._written += len(content)
+        except OSError as e:
+            logger.warning(f"Could not write git cache entry {key}: {e}")
+
+    def _prune_due(self) -> bool:
+        if not self.directory:
+            return False
+        return (
+            self._last_prune is None
+            or time.monotonic() - self._last_prune >= _PRUNE_INTERVAL
+            or self._written >= self.max_bytes // 10
+        )
+
+    def prune(self) -> None:
+        """ Remove the on-disk files older than `max_age`, then the least recently
+            read ones until the copy fits in `max_bytes`. Other workers sharing
+            the directory may remove the same files."""
+        self._last_prune = time.monotonic()
+        self._written = 0
+        if not self.directory:
+            return
+        now = time.time()
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                # Leftover temporary files of interrupted writes are aged out too
+                if now - stat.st_mtime > self.max_age:
+                    self._remove(path)
+                else:
+                    files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove git cache file {path}: {e}")
+
+
+git_content_cache = GitContentCache.from_config(Config)
@@ -61,3 +61,7 @@ class GitWrapper:
     async def get_tags(self):
         return await self.provider.get_tags()
 
+    async def resolve_commit_sha(self, ref):
+        """Commit SHA of a tag, branch or SHA, None when it can't be resolved."""
+        return await self.provider.resolve_commit_sha(ref)
+
@@ -1,12 +1,28 @@
+import asyncio
 import base64
-import requests
+import json
+import re
+import httpx
 from app.core.config import Config
 import logging
 
 from app.exceptions.git import GitUsernameNotAuthorized
+from app.utils.git_utils.content_cache import credential_scope, git_content_cache
+from app.utils.git_utils.http_client import git_http_client
 
 logger = logging.getLogger(__name__)
 
+_COMMIT_SHA = re.compile(r'^[0-9a-f]{40}$')
+
+
+class _GitReadError(Exception):
+    """A cached read failed with `status`, nothing is cached then."""
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
 class GitHubProvider:
     def __init__(self, token, owner, repo):
         self.token = token
@@ -17,12 +33,21 @@ class GitHubProvider:
             'Authorization': f'token {self.token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        # Every cached read is keyed by the token, a token that can't read the repo
+        # is never served what another one fetched
+        self._cache_scope = credential_scope(self.token)
+        # Head commit of the branches read or written through this provider,
+        # a commit right after `create_branch` doesn't look the branch up again
+        self._heads = {}
+
+    async def _request(self, method, url, **kwargs) -> httpx.Response:
+        return await git_http_client.request(method, url, headers=self.headers, **kwargs)
 
     async def validate_token(self):
         """Validate the GitHub Token."""
         user_url = f'{Config.GITHUB_PROVIDER_BASE_URL}/user'
         try:
-            response = requests.get(user_url, headers=self.headers)
+            response = await self._request('GET', user_url)
             if response.status_code == 200:
                 logger.info("Token is valid.")
                 return {"status": 200, "message": "Token is valid."}
@@ -38,9 +63,10 @@ class GitHubProvider:
         """Get the SHA of the branch."""
         branch_url = f'{self.base_url}/git/ref/heads/{branch_name}'
         try:
-            response = requests.get(branch_url, headers=self.headers)
+            response = await self._request('GET', branch_url)
             if response.status_code == 200:
                 sha = response.json()['object']['sha']
+                self._heads[branch_name] = sha
                 logger.info(f"Branch '{branch_name}' SHA retrieved successfully.")
                 return {"status": 200, "sha": sha, "message": f"Branch '{branch_name}' SHA retrieved successfully."}
             else:
@@ -53,10 +79,15 @@ class GitHubProvider:
 
     async def create_branch(self, new_branch='main'):
         """Create a new branch from the base branch."""
-        # Get the default branch     
-        
+        # Commits go to existing branches most of the time, one lookup is enough then
+        existing = await self.get_branch_sha(new_branch)
+        if existing['status'] == 200:
+            logger.info(f"Branch '{new_branch}' already exists.")
+            return {"status": 201, "message": f"branch already exists.: {new_branch}"}
+
+        # Get the default branch
         try:
-            repo_info = requests.get(self.base_url, headers=self.headers).json()        
+            repo_info = (await self._request('GET', self.base_url)).json()        
             default_branch = repo_info['default_branch']
         except Exception as e:
             logger.error(f"Repository does not exist.")
@@ -90,8 +121,9 @@ class GitHubProvider:
             "sha": base_sha
         }
         try:
-            response = requests.post(create_branch_url, json=payload, headers=self.headers)
+            response = await self._request('POST', create_branch_url, json=payload)
             if response.status_code == 201:
+                self._heads[new_branch] = base_sha
                 logger.info(f"Branch '{new_branch}' created successfully.")
                 return {"status": 201, "message": f"Branch '{new_branch}' created successfully."}
             elif response.status_code == 409:
@@ -120,10 +152,11 @@ class GitHubProvider:
             "branch": branch_name
         }
         try:
-            response = requests.put(create_file_url, json=payload, headers=self.headers)
+            response = await self._request('PUT', create_file_url, json=payload)
             if response.status_code == 201:
                 response_data = response.json()
                 commit_id = response_data["commit"]["sha"]  # Extract commit ID (SHA)
+                self._heads[branch_name] = commit_id
                 logger.info(f"Initial commit created successfully in branch '{branch_name}'. Commit ID: {commit_id}")
                 return {
                     "status": 201,
@@ -147,7 +180,7 @@ class GitHubProvider:
 
     async def check_repo_exists(self):
         try:
-            repo_info = requests.get(self.base_url, headers=self.headers).json() 
+            repo_info = (await self._request('GET', self.base_url)).json() 
             if repo_info.get('status') == 404:
                 return {"status": 404, "message": f"Repository does not exist. Url: {self.base_url}"}
             return {"status": 200, "message": f"Repository exists. Url: {self.base_url}"}
@@ -162,132 +195,76 @@ class GitHubProvider:
         content: str,
         branch_name: str,
     ):
-        """Update an existing file in the repository."""
-        # Encode the new content to Base64
-        encoded_content = base64.b64encode(content.encode()).decode()
-
-        # Construct the URL for the file to update
-        file_url = f'{self.base_url}/contents/{file_path}'
-
-        try:
-            # Fetch the current file to retrieve the SHA
-            get_response = requests.get(file_url, headers=self.headers, params={"ref": branch_name})
-            if get_response.status_code != 200:
-                logger.error(f"Failed to fetch the file. Status code: {get_response.status_code}")
-                logger.error(f"Response: {get_response.json()}")
-                return {"status": get_response.status_code, "message": "Failed to fetch the file."}
-
-            file_data = get_response.json()
-            current_sha = file_data["sha"]
-
-            # Prepare payload for updating the file
-            payload = {
-                "message": commit_message,
-                "content": encoded_content,
-                "branch": branch_name,
-                "sha": current_sha,
-            }
-
-            # Send the update request
-            update_response = requests.put(file_url, json=payload, headers=self.headers)
-            if update_response.status_code == 200:
-                response_data = update_response.json()
-                commit_id = response_data["commit"]["sha"]  # Extract commit ID (SHA)
-                logger.info(f"File updated successfully in branch '{branch_name}'. Commit ID: {commit_id}")
-                return {
-                    "status": 200,
-                    "message": f"File updated successfully in branch '{branch_name}'.",
-                    "commit_id": commit_id,
-                }
-            else:
-                logger.error(f"Failed to update the file. Status code: {update_response.status_code}")
-                logger.error(f"Response: {update_response.json()}")
-                return {"status": update_response.status_code, "message": "Failed to update the file."}
-
-        except Exception as e:
-            logger.error(f"Exception occurred while updating the file: {str(e)}")
-            return {"status": 500, "message": f"Exception occurred while updating the file. Url: {file_url}"}
-        
+        """Create or update a file in the repository, as a single file tree commit."""
+        result = await self.commit_multiple_files({file_path: content}, commit_message, branch_name)
+        if result["status"] != 201:
+            return result
+        logger.info(f"File updated successfully in branch '{branch_name}'. Commit ID: {result['commit_id']}")
+        return {
+            "status": 200,
+            "message": f"File updated successfully in branch '{branch_name}'.",
+            "commit_id": result["commit_id"],
+        }
 
     async def commit_multiple_files(self, files_to_commit, commit, branch):
+        """ Commit `files_to_commit` (path -> content) in one commit: a tree with the
+            contents inlined on top of the branch head, the commit and the ref update.
+            The head is looked up only when this provider doesn't know it already."""
+        ref_url = f"{self.base_url}/git/refs/heads/{branch}"
         try:
-            # Step 1: Fetch the latest commit on the branch (or handle empty branch)
-            ref_url = f"{self.base_url}/git/refs/heads/{branch}"
-            ref_response = requests.get(ref_url, headers=self.headers)
-
-            if ref_response.status_code == 200:
-                ref_data = ref_response.json()
-                base_tree_sha = ref_data["object"]["sha"]
-            elif ref_response.status_code == 404:
-                # Branch doesn't exist, create it later
-                base_tree_sha = None
-            else:
-                return {"status": 500, "message": "Failed to fetch branch reference."}
-
-            # Step 2: Prepare files for the tree
-            commit_payload = []
-            for file_path, content in files_to_commit.items():
-                file_url = f"{self.base_url}/contents/{file_path}"
-                encoded_content = base64.b64encode(content.encode()).decode()
-
-                try:
-                    # Fetch the file's SHA if it exists
-                    get_response = requests.get(file_url, headers=self.headers, params={"ref": branch})
-                    sha = get_response.json().get("sha") if get_response.status_code == 200 else None
+            # Step 1: The latest commit on the branch (None for a branch to create)
+            head_sha = self._heads.get(branch)
+            if head_sha is None:
+                ref_response = await self._request('GET', ref_url)
+                if ref_response.status_code == 200:
+                    head_sha = ref_response.json()["object"]["sha"]
+                elif ref_response.status_code != 404:
+                    return {"status": 500, "message": "Failed to fetch branch reference."}
 
-                    commit_payload.append({
-                        "path": file_path,
-                        "mode": "100644",
-                        "type": "blob",
-                        "content": content,
-                        "sha": sha,
-                    })
-                except Exception as e:
-                    logger.error(f"Failed to fetch file {file_path}. Exception: {str(e)}")
-                    return {"status": 500, "message": f"Error while preparing commit for {file_path}"}
-
-            # Step 3: Create a tree with all the files
-            tree_url = f"{self.base_url}/git/trees"
+            # Step 2: A tree with all the files, blobs are created from the inlined content
             tree_payload = {
-                "base_tree": base_tree_sha,
                 "tree": [
                     {
-                        "path": file["path"],
+                        "path": file_path,
                         "mode": "100644",
                         "type": "blob",
-                        "content": file["content"],
-                    } for file in commit_payload
+                        "content": content,
+                    } for file_path, content in files_to_commit.items()
                 ],
             }
-            tree_response = requests.post(tree_url, json=tree_payload, headers=self.headers)
+            if head_sha:
+                tree_payload["base_tree"] = head_sha
+            tree_response = await self._request('POST', f"{self.base_url}/git/trees", json=tree_payload)
             tree_response.raise_for_status()
-            tree_data = tree_response.json()
 
-            # Step 4: Create a commit with the new tree
-            commit_url = f"{self.base_url}/git/commits"
+            # Step 3: A commit with the new tree
             commit_payload = {
                 "message": commit,
-                "tree": tree_data["sha"],
-                "parents": [base_tree_sha] if base_tree_sha else [],
+                "tree": tree_response.json()["sha"],
+                "parents": [head_sha] if head_sha else [],
             }
-            commit_response = requests.post(commit_url, json=commit_payload, headers=self.headers)
+            commit_response = await self._request('POST', f"{self.base_url}/git/commits", json=commit_payload)
             commit_response.raise_for_status()
-            commit_data = commit_response.json()
+            commit_sha = commit_response.json()["sha"]
 
-            # Step 5: Update the branch reference or create it
-            if base_tree_sha:
-                # Update the branch reference to point to the new commit
-                ref_update_payload = {"sha": commit_data["sha"]}
-                requests.patch(ref_url, json=ref_update_payload, headers=self.headers)
+            # Step 4: Move the branch to the commit, or create it. Not forced, the
+            # update is rejected when someone else pushed since the head was read
+            if head_sha:
+                ref_response = await self._request('PATCH', ref_url, json={"sha": commit_sha})
             else:
-                # Create the branch with the new commit
-                ref_create_payload = {"ref": f"refs/heads/{branch}", "sha": commit_data["sha"]}
-                requests.post(f"{self.base_url}/git/refs", json=ref_create_payload, headers=self.headers)
+                ref_response = await self._request(
+                    'POST', f"{self.base_url}/git/refs", json={"ref": f"refs/heads/{branch}", "sha": commit_sha}
+                )
+            if ref_response.status_code not in (200, 201):
+                self._heads.pop(branch, None)
+                logger.error(f"Failed to update branch '{branch}'. Status code: {ref_response.status_code}")
+                return {"status": ref_response.status_code, "message": f"Failed to update branch '{branch}'."}
+            self._heads[branch] = commit_sha
 
             return {
                 "status": 201,
                 "message": "Files committed successfully.",
-                "commit_id": commit_data.get("sha"),
+                "commit_id": commit_sha,
             }
         except Exception as e:
             logger.error(f"Exception occurred while creating commit: {str(e)}")
@@ -300,7 +277,7 @@ class GitHubProvider:
         """
         try:
             # Get repository 
-            response = requests.get(self.base_url, headers=self.headers)
+            response = await self._request('GET', self.base_url)
             if response.status_code != 200:
                 logger.error("Failed to fetch repository details.")
                 return {"status": response.status_code, "message": "Failed to fetch repository details."}
@@ -316,7 +293,7 @@ class GitHubProvider:
             # If the owner is an organization, check if the username has access 
             if is_org:
                 collaborator_check_url = f'{self.base_url}/collaborators/{provided_username}'
-                collab_response = requests.get(collaborator_check_url, headers=self.headers)
+                collab_response = await self._request('GET', collaborator_check_url)
 
                 if collab_response.status_code == 204:
                     logger.info("Username is a valid has access to the repository.")
@@ -330,103 +307,127 @@ class GitHubProvider:
             logger.error(f"Failed to validate GitHub username: {str(e)}")
             return {"status": 500, "message": f"Error occurred while validating GitHub username. Url: {self.base_url}"}
         
+    async def _conditional_get(self, url, accept=None):
+        """ GET revalidated with the ETag of the previous answer, a 304 is served
+            from the stored body. Returns the status and the body text."""
+        headers = dict(self.headers)
+        if accept:
+            headers['Accept'] = accept
+        key = (url, self._cache_scope, accept)
+        cached = git_content_cache.validators.get(key)
+        if cached is not None:
+            headers['If-None-Match'] = cached[0]
+        response = await git_http_client.request('GET', url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return 200, cached[1]
+        if response.status_code == 200 and response.headers.get('ETag'):
+            git_content_cache.validators.set(key, (response.headers['ETag'], response.text))
+        return response.status_code, response.text
+
+    async def resolve_commit_sha(self, ref):
+        """Commit SHA `ref` (tag, branch or SHA) points to, None when it can't be resolved."""
+        if _COMMIT_SHA.match(ref):
+            return ref
+        key = (self.base_url, self._cache_scope, ref)
+        sha = git_content_cache.refs.get(key)
+        if sha is None:
+            status, body = await self._conditional_get(f'{self.base_url}/commits/{ref}', accept='application/vnd.github.sha')
+            if status != 200:
+                logger.error(f"Failed to resolve ref '{ref}'. Status code: {status}")
+                return None
+            sha = body.strip()
+            git_content_cache.refs.set(key, sha)
+        return sha
+
     async def get_file_content_by_version_tag(self, file_path, ref='main'):
         """
         Fetch the content of a file from the GitHub repository.
+        The content is cached by the commit SHA `ref` resolves to.
 
         Args:
             file_path (str): The path of the file in the repository (e.g., 'pipeline/pipeline.json').
-            branch (str): The branch to fetch the file from (default is 'main').
+            ref (str): The tag, branch or commit to fetch the file from (default is 'main').
 
         Returns:
             dict: JSON object of the file content if successful, or an error message.
         """
         file_url = f'{self.base_url}/contents/{file_path}'
-        try:
-            response = requests.get(file_url, headers=self.headers, params={"ref": ref})
-            if response.status_code == 200:
-                file_data = response.json()
-                content = base64.b64decode(file_data['content']).decode('utf-8')
-                logger.info(f"File '{file_path}' fetched successfully.")
-                return {
-                    "status": 200,
-                    "content": content,
-                    "message": f"File '{file_path}' fetched successfully."
-                }
-            else:
-                logger.error(f"Failed to fetch file '{file_path}'. Status code: {response.status_code}")
-                return {"status": response.status_code, "message": f"Failed to fetch file '{file_path}'."}
 
+        async def load():
+            response = await self._request('GET', file_url, params={"ref": sha})
+            if response.status_code != 200:
+                raise _GitReadError(response.status_code)
+            return base64.b64decode(response.json()['content']).decode('utf-8')
+
+        try:
+            sha = await self.resolve_commit_sha(ref)
+            if sha is None:
+                return {"status": 404, "message": f"Failed to fetch file '{file_path}'."}
+            content = await git_content_cache.get_or_load((self.base_url, self._cache_scope, sha, file_path), load)
+            logger.info(f"File '{file_path}' fetched successfully.")
+            return {
+                "status": 200,
+                "content": content,
+                "message": f"File '{file_path}' fetched successfully."
+            }
+        except _GitReadError as e:
+            logger.error(f"Failed to fetch file '{file_path}'. Status code: {e.status}")
+            return {"status": e.status, "message": f"Failed to fetch file '{file_path}'."}
         except Exception as e:
             logger.error(f"Exception occurred while fetching file '{file_path}': {str(e)}")
             return {"status": 500, "message": f"Error occurred while fetching file '{file_path}'."}
-        
+
     async def get_tags(self):
         """
         Fetch the list of tags along with their descriptions, handling lightweight and annotated tags.
+        All tag refs come from one conditional request, annotated tag messages are cached
+        by tag object SHA.
 
         Returns:
             dict: A dictionary containing the status and tags with descriptions or an error message.
         """
         try:
-            # Fetch the list of tags
-            response = requests.get(f"{self.base_url}/tags", headers=self.headers)
-            if response.status_code != 200:
+            status, body = await self._conditional_get(f"{self.base_url}/git/matching-refs/tags")
+            if status != 200:
                 return {
-                    "status": response.status_code,
-                    "message": response.json().get("message", "Failed to fetch tags.")
+                    "status": status,
+                    "message": json.loads(body or '{}').get("message", "Failed to fetch tags.")
                 }
 
-            tags = response.json()
-            detailed_tags = []
-            
-            for tag in tags:
-                tag_name = tag["name"]
-
-                # Fetch the tag reference
-                ref_response = requests.get(
-                    f"{self.base_url}/git/ref/tags/{tag_name}", headers=self.headers
-                )
-                if ref_response.status_code == 200:
-                    ref_data = ref_response.json()
-                    object_type = ref_data["object"]["type"]
-                    object_sha = ref_data["object"]["sha"]
-                    
-                    if object_type == "tag":  
-                    # Annotated tag which is created from github command 
-                    # ex.  git tag -a <tag_name> -m "<tag_message>"
-                    # git push origin <tag_name>
-
-                        tag_response = requests.get(
-                            f"{self.base_url}/git/tags/{object_sha}", headers=self.headers
-                        )
-                        if tag_response.status_code == 200:
-                            tag_data = tag_response.json()
-                            detailed_tags.append({
-                                "name": tag_name,
-                                "description": tag_data.get("message", ""),
-                                "sha": object_sha
-                            })
-                        else:
-                            detailed_tags.append({
-                                "name": tag_name,
-                                "description": "Failed to fetch tag description",
-                                "sha": object_sha
-                            })
-                    elif object_type == "commit":
-                        # Lightweight tag which is created from github ui
-                        detailed_tags.append({
-                            "name": tag_name,
-                            "description": "Lightweight tag, no description available",
-                            "sha": object_sha
-                        })
-                else:
-                    detailed_tags.append({
-                        "name": tag_name,
-                        "description": "Failed to fetch tag reference",
-                        "sha": None
-                    })
-
-            return {"status": 200, "tags": detailed_tags}
-        except requests.exceptions.RequestException as e:
+            detailed_tags = await asyncio.gather(*(self._describe_tag(ref) for ref in json.loads(body)))
+            return {"status": 200, "tags": [tag for tag in detailed_tags if tag is not None]}
+        except httpx.HTTPError as e:
             return {"status": 500, "message": str(e)}
+
+    async def _describe_tag(self, ref):
+        tag_name = ref["ref"][len("refs/tags/"):]
+        object_type = ref["object"]["type"]
+        object_sha = ref["object"]["sha"]
+
+        if object_type == "tag":
+            # Annotated tag which is created from github command
+            # ex.  git tag -a <tag_name> -m "<tag_message>"
+            # git push origin <tag_name>
+            async def load():
+                tag_response = await self._request('GET', f"{self.base_url}/git/tags/{object_sha}")
+                if tag_response.status_code != 200:
+                    raise _GitReadError(tag_response.status_code)
+                return tag_response.json().get("message", "")
+
+            try:
+                description = await git_content_cache.get_or_load((self.base_url, self._cache_scope, object_sha, 'tag:message'), load)
+            except _GitReadError:
+                description = "Failed to fetch tag description"
+            return {
+                "name": tag_name,
+                "description": description,
+                "sha": object_sha
+            }
+        if object_type == "commit":
+            # Lightweight tag which is created from github ui
+            return {
+                "name": tag_name,
+                "description": "Lightweight tag, no description available",
+                "sha": object_sha
+            }
+        return None
@@ -0,0 +1,50 @@
+from typing import Optional
+
+import httpx
+
+from app.core.config import Config
+from app.utils.request_metrics import http_event_hooks
+
+
+class GitHttpClient:
+    """ HTTP client of the git provider APIs shared by the whole process, so
+        connections (and their TLS sessions) are reused across `GitWrapper`s.
+
+    Args:
+        timeout: float: Request timeout in seconds
+        max_connections: int: Maximum number of open connections"""
+
+    def __init__(self, timeout: float = 30, max_connections: int = 20):
+        self.timeout = timeout
+        self.max_connections = max(1, max_connections)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "GitHttpClient":
+        return cls(timeout=cfg.GIT_HTTP_TIMEOUT, max_connections=cfg.GIT_HTTP_MAX_CONNECTIONS)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                # Renamed / transferred repositories answer with a redirect
+                follow_redirects=True,
+                event_hooks=http_event_hooks('git'),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self.client.request(method, url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+git_http_client = GitHttpClient.from_config(Config)
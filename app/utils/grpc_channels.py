@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import grpc
+from fastapi import HTTPException
+
+from app.core.config import Config
+from app.utils.request_metrics import current_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class _ChannelCalls:
+    """ Calls in flight on one channel, a channel carrying calls (e.g. an open log
+        stream) is not evicted. Each call is also recorded as `grpc` in the request
+        metrics once done, streams until their last message."""
+
+    def __init__(self):
+        self.active = 0
+
+    async def track(self, continuation, client_call_details, request):
+        metrics, start = current_metrics(), time.perf_counter()
+        self.active += 1
+        try:
+            call = await continuation(client_call_details, request)
+        except BaseException:
+            self.active -= 1
+            raise
+
+        def done(_) -> None:
+            self.active -= 1
+            if metrics is not None:
+                metrics.record('grpc', time.perf_counter() - start)
+
+        call.add_done_callback(done)
+        return call
+
+    def interceptors(self) -> list:
+        # grpc.aio files an interceptor under a single call type, hence one per type
+        return [_UnaryUnaryInterceptor(self), _UnaryStreamInterceptor(self)]
+
+
+class _UnaryUnaryInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    def __init__(self, calls: _ChannelCalls):
+        self.calls = calls
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        return await self.calls.track(continuation, client_call_details, request)
+
+
+class _UnaryStreamInterceptor(grpc.aio.UnaryStreamClientInterceptor):
+    def __init__(self, calls: _ChannelCalls):
+        self.calls = calls
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        return await self.calls.track(continuation, client_call_details, request)
+
+
+class GrpcChannelPool:
+    """ `grpc.aio` channels shared by the process, one per `host:port`.
+
+        - Keepalive pings, only while calls are open, detect dead connections of
+          long log streams. Servers reject pings more frequent than every 5
+          minutes by default (GOAWAY too_many_pings), keep `keepalive_time` above.
+        - Calls failing with UNAVAILABLE are retried by gRPC (`max_attempts`).
+        - `get` waits at most `connect_timeout` for the channel to be ready, so a
+          missing server fails fast instead of running into the call deadline.
+        - At most `max_channels` are kept, the least recently used idle one is closed
+          first. Channels with calls in flight are kept until they are idle.
+
+    Args:
+        max_channels: int: Maximum number of open channels
+        connect_timeout: float: Seconds to wait for a channel to connect
+        keepalive_time: int: Seconds between keepalive pings, 0 for gRPC's default (none)
+        keepalive_timeout: int: Seconds to wait for a ping acknowledgement
+        max_attempts: int: Attempts per call, including the first one"""
+
+    def __init__(
+            self,
+            max_channels: int = 16,
+            connect_timeout: float = 5,
+            keepalive_time: int = 300,
+            keepalive_timeout: int = 10,
+            max_attempts: int = 3,
+        ):
+        self.max_channels = max(1, max_channels)
+        self.connect_timeout = connect_timeout
+        self.options = [
+            ('grpc.enable_retries', 1),
+            ('grpc.service_config', json.dumps({
+                'methodConfig': [{
+                    'name': [{}],
+                    'retryPolicy': {
+                        'maxAttempts': max(2, max_attempts),
+                        'initialBackoff': '0.2s',
+                        'maxBackoff': '2s',
+                        'backoffMultiplier': 2,
+                        'retryableStatusCodes': ['UNAVAILABLE'],
+                    },
+                }],
+            })),
+        ]
+        if keepalive_time > 0:
+            self.options += [
+                ('grpc.keepalive_time_ms', keepalive_time * 1000),
+                ('grpc.keepalive_timeout_ms', keepalive_timeout * 1000),
+            ]
+        self._channels: "OrderedDict[str, grpc.aio.Channel]" = OrderedDict()
+        self._calls: Dict[str, _ChannelCalls] = {}
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "GrpcChannelPool":
+        return cls(
+            max_channels=cfg.GRPC_MAX_CHANNELS,
+            connect_timeout=cfg.GRPC_CONNECT_TIMEOUT,
+            keepalive_time=cfg.GRPC_KEEPALIVE_TIME,
+            keepalive_timeout=cfg.GRPC_KEEPALIVE_TIMEOUT,
+            max_attempts=cfg.GRPC_MAX_ATTEMPTS,
+        )
+
+    def channel(self, host: str, port: int) -> grpc.aio.Channel:
+        """The shared channel to `host:port`, without waiting for it to connect."""
+        target = f'{host}:{port}'
+        channel = self._channels.get(target)
+        if channel is None or channel.get_state() == grpc.ChannelConnectivity.SHUTDOWN:
+            calls = _ChannelCalls()
+            channel = grpc.aio.insecure_channel(target, options=self.options, interceptors=calls.interceptors())
+            self._channels[target] = channel
+            self._calls[target] = calls
+        self._channels.move_to_end(target)
+        self._evict_idle(keep=target)
+        return channel
+
+    def active_calls(self, host: str, port: int) -> int:
+        calls = self._calls.get(f'{host}:{port}')
+        return calls.active if calls is not None else 0
+
+    def _evict_idle(self, keep: str) -> None:
+        """Close the least recently used idle channels above `max_channels`, busy ones stay."""
+        for target in list(self._channels):
+            if len(self._channels) <= self.max_channels:
+                return
+            if target == keep or self._calls[target].active:
+                continue
+            evicted = self._channels.pop(target)
+            self._calls.pop(target)
+            # A call starting right now still gets a grace period
+            asyncio.create_task(evicted.close(grace=self.connect_timeout))
+
+    async def get(self, host: str, port: int) -> grpc.aio.Channel:
+        """The shared channel to `host:port` once it is connected, 503 when it can't connect."""
+        channel = self.channel(host, port)
+        if channel.get_state(try_to_connect=True) != grpc.ChannelConnectivity.READY:
+            try:
+                await asyncio.wait_for(channel.channel_ready(), timeout=self.connect_timeout)
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=503, detail=f"gRPC server {host}:{port} is not reachable")
+        return channel
+
+    async def is_healthy(self, host: str, port: int) -> bool:
+        try:
+            await self.get(host, port)
+            return True
+        except HTTPException:
+            return False
+
+    async def close_all(self) -> None:
+        channels = list(self._channels.values())
+        self._channels.clear()
+        self._calls.clear()
+        for channel in channels:
+            try:
+                await channel.close()
+            except Exception as e:
+                logger.warning(f"Could not close gRPC channel: {e}")
+
+
+grpc_channels = GrpcChannelPool.from_config(Config)
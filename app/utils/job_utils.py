@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from app.core.config import Config
+from app.enums.job import JobBackend
+
+logger = logging.getLogger(__name__)
+
+AS_JOB_DESCRIPTION = (
+    "Run in the background and return the job id, follow it with "
+    "`/jobs/{job_id}` or `/jobs/{job_id}/events`."
+)
+
+
+class BaseJobBackend(ABC):
+    """Hands queued jobs (rows of `bh_job`) to something that runs them."""
+
+    @abstractmethod
+    async def dispatch(self, job_id: int) -> None:
+        ...
+
+    async def shutdown(self) -> None:
+        pass
+
+
+class LocalJobBackend(BaseJobBackend):
+    """ Runs jobs on the event loop of this process, `concurrency` at a time.
+        Jobs outlive the request which queued them; jobs interrupted by a restart
+        are queued again on startup (see `resume_jobs`) or by the `JobReclaimer`."""
+
+    def __init__(self, concurrency: int = 2):
+        self.concurrency = max(1, concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    async def dispatch(self, job_id: int) -> None:
+        if job_id in self._tasks:
+            # Already waiting or running here, e.g. found again by the reclaimer
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        task = asyncio.create_task(self._run(job_id), name=f"job-{job_id}")
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job_id: int) -> None:
+        from app.celery_conf.tasks import execute_job
+        async with self._semaphore:
+            try:
+                await execute_job(job_id)
+            except Exception:
+                logger.exception(f"Job {job_id} crashed")
+
+    async def shutdown(self) -> None:
+        from app.celery_conf.tasks import release_job
+        tasks = dict(self._tasks)
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        # Hand the interrupted jobs back to the queue instead of waiting for them to go stale
+        for job_id in tasks:
+            await release_job(job_id)
+
+
+class CeleryJobBackend(BaseJobBackend):
+    """Sends jobs to the Celery workers of `app.celery_conf.celery_app`."""
+
+    async def dispatch(self, job_id: int) -> None:
+        from app.celery_conf.celery_app import celery_app, RUN_JOB_TASK
+        # Publishing talks to the broker synchronously
+        await asyncio.to_thread(celery_app.send_task, RUN_JOB_TASK, args=[job_id])
+
+
+_backend: Optional[BaseJobBackend] = None
+
+
+def get_job_backend() -> BaseJobBackend:
+    """The job backend selected by `Config.JOB_BACKEND`, shared by the process."""
+    global _backend
+    if _backend is None:
+        if JobBackend(Config.JOB_BACKEND) == JobBackend.CELERY:
+            _backend = CeleryJobBackend()
+        else:
+            _backend = LocalJobBackend(concurrency=Config.JOB_LOCAL_CONCURRENCY)
+    return _backend
+
+
+async def resume_jobs(stale_only: bool = False) -> int:
+    """ Dispatch queued jobs and running jobs whose worker went away. Claiming is
+        atomic, so several API workers calling this at startup do not run a job twice.
+        `stale_only` leaves out queued jobs which may still be waiting for a worker."""
+    from app.core.context import Context
+    async with Context() as ctx:
+        job_ids = await ctx.job_service.resumable_job_ids(stale_only=stale_only)
+    backend = get_job_backend()
+    for job_id in job_ids:
+        await backend.dispatch(job_id)
+    if job_ids:
+        logger.info(f"Resumed jobs {job_ids}")
+    return len(job_ids)
+
+
+class JobReclaimer:
+    """ Dispatches again, every `interval` seconds, the jobs of workers which crashed
+        (running without heartbeat) and the queued jobs nobody picked up, so they
+        don't wait for the next deploy.
+
+    Args:
+        interval: float: Seconds between two sweeps, 0 disables the sweeps"""
+
+    def __init__(self, interval: float = 300):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "JobReclaimer":
+        return cls(interval=cfg.JOB_RECLAIM_INTERVAL)
+
+    async def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._sweep(), name="job-reclaimer")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await resume_jobs(stale_only=True)
+            except Exception:
+                logger.exception("Could not reclaim stale jobs")
+
+
+job_reclaimer = JobReclaimer.from_config(Config)
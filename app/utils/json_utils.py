@@ -0,0 +1,65 @@
+from decimal import Decimal
+from pathlib import PurePath
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.utils.request_metrics import timed
+
+# Media type of the streamed list / export responses, one JSON document per line
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+NDJSON_DESCRIPTION = "`ndjson` streams one row per line as the rows are read, without the pagination headers"
+
+# datetime, date, UUID, dataclasses and numpy arrays (pgvector columns) are encoded natively
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not know, encoded the way `jsonable_encoder` does."""
+    if isinstance(obj, BaseModel):
+        return obj.dict(by_alias=True)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if isinstance(obj, PurePath):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+
+def loads(data) -> Any:
+    return orjson.loads(data)
+
+
+def to_jsonable(obj: Any) -> Any:
+    """ `obj` as plain JSON types (dicts, lists, strings...), a faster
+        `jsonable_encoder` for ORM objects and pydantic models."""
+    return orjson.loads(dumps(obj))
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class of the app, rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        with timed('serialize'):
+            return dumps(content)
+
+
+async def to_ndjson_lines(rows: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    """One JSON line per row, each serialised as soon as it is fetched."""
+    async for row in rows:
+        with timed('serialize'):
+            line = dumps(row) + b'\n'
+        yield line
+
+
+def ndjson_response(rows: AsyncIterable[Any], headers: Optional[dict] = None) -> StreamingResponse:
+    return StreamingResponse(to_ndjson_lines(rows), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -5,6 +5,7 @@ from fastapi import HTTPException
 from datetime import datetime
 
 from app.models import bh_project
+from app.utils.request_metrics import http_event_hooks
 
 FAILED_JOB_SQL_TEMPLATE = "SELECT * FROM auditdb.bh_job_details WHERE flow_status={flow_status}"
 IN_PROGRESS_JOB_SQL_TEMPLATE = "SELECT * FROM auditdb.bh_job_details WHERE flow_status='{flow_status}' AND job_start_time < NOW() - INTERVAL '{hours} hours'"
@@ -72,7 +73,7 @@ def store_monitor_data(flow_id: int, project_id: int, bh_project_name: Optional[
 
 
 async def request_create_monitor(monitor_data: dict):
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(event_hooks=http_event_hooks()) as client:
         try:
             cfg = Config()
             response = await client.post(cfg.BH_MONITER_URL, json=monitor_data)
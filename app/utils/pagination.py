@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.types import Date, DateTime
+
+from app.exceptions.base import InvalidCursor
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+TOTAL_COUNT_HEADER = 'X-Total-Count'
+
+CURSOR_DESCRIPTION = (
+    "Keyset pagination cursor. Send an empty value to start, then pass the "
+    f"`{NEXT_CURSOR_HEADER}` response header of the previous page. `offset` is ignored when set."
+)
+
+
+class Page(list):
+    """ A list of results which also carries keyset pagination info.
+        Serialises exactly like a plain list, so existing response models keep working."""
+
+    def __init__(self, items: Iterable = (), next_cursor: Optional[str] = None, total: Optional[int] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.total = total
+
+
+def encode_cursor(order_value: Any, key_value: Any) -> str:
+    payload = json.dumps(jsonable_encoder([order_value, key_value]), separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, order_column, key_column) -> Tuple[Any, Any]:
+    """ Decode an opaque cursor back into (order value, primary key value)
+        typed for the given columns."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        order_value, key_value = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return _to_column_type(order_column, order_value), _to_column_type(key_column, key_value)
+    except (ValueError, TypeError):
+        raise InvalidCursor(context={'cursor': cursor})
+
+
+def _to_column_type(column, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+def set_page_headers(response: Response, page: List) -> None:
+    """Expose the keyset cursor and total of a `Page` as response headers."""
+    if not isinstance(page, Page):
+        return
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total)
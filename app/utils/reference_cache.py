@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import Config
+from app.utils.cache_utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceCache:
+    """ Process-wide snapshots of small, read-mostly tables (codes, DQ types, ...),
+        one entry per table. Entries expire after `ttl` seconds as a safety net
+        and are dropped by `invalidate` when the table is written.
+
+        With `redis_url` set, invalidations are also published on `channel` and
+        `start()` subscribes to it, so every API worker drops its copy.
+
+    Args:
+        ttl: float: Seconds a table snapshot is served before it is reloaded
+        redis_url: str: Optional Redis URL of the invalidation channel
+        channel: str: Redis pub/sub channel name"""
+
+    def __init__(self, ttl: float = 300, redis_url: Optional[str] = None, channel: str = 'bh-catalog:reference-data'):
+        self.redis_url = redis_url
+        self.channel = channel
+        self._tables = TTLCache(maxsize=64, ttl=ttl)
+        self._generations: Dict[str, int] = {}
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "ReferenceCache":
+        return cls(ttl=cfg.REFERENCE_CACHE_TTL, redis_url=cfg.REFERENCE_CACHE_REDIS_URL)
+
+    async def get_table(self, name: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """ Snapshot of table `name`, loaded with `loader()` when missing. Concurrent
+            callers share one load."""
+        generation = self._generations.get(name, 0)
+        value = await self._tables.get_or_load(name, loader)
+        if self._generations.get(name, 0) != generation:
+            # Invalidated while loading, the snapshot may predate the write
+            self._tables.pop(name)
+        return value
+
+    def forget(self, name: str) -> None:
+        self._generations[name] = self._generations.get(name, 0) + 1
+        self._tables.pop(name)
+
+    def clear(self) -> None:
+        for name in list(self._generations):
+            self.forget(name)
+        self._tables.clear()
+
+    async def invalidate(self, *names: str) -> None:
+        """Drop the snapshots of `names` here and, with Redis, in every other worker."""
+        for name in names:
+            self.forget(name)
+        if self._redis is None:
+            return
+        try:
+            for name in names:
+                await self._redis.publish(self.channel, name)
+        except Exception as e:
+            logger.warning(f"Could not publish reference data invalidation of {names}: {e}")
+
+    async def start(self) -> None:
+        if not self.redis_url or self._listener is not None:
+            return
+        import redis.asyncio as redis
+        self._redis = redis.from_url(self.redis_url, decode_responses=True)
+        self._listener = asyncio.create_task(self._listen(), name="reference-cache-listener")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self.forget(message['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed meanwhile, start over from the database
+                logger.warning(f"Reference data invalidation channel failed: {e}")
+                self.clear()
+                await asyncio.sleep(5)
+            finally:
+                await pubsub.aclose()
+
+
+reference_cache = ReferenceCache.from_config(Config)
@@ -0,0 +1,124 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = 'Server-Timing'
+
+
+class RequestMetrics:
+    """ Cost of one request per kind of work (`db`, `http`, `git`, `grpc`, `aws`,
+        `serialize`): number of calls and seconds spent in them. Work done in
+        worker threads (`asyncio.to_thread`) records into the same object."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.calls.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def server_timing(self) -> str:
+        """`Server-Timing` header value, the call count is the description of each metric."""
+        with self._lock:
+            metrics = [
+                f'{name};dur={seconds * 1000:.1f};desc="{count}"'
+                for name, (count, seconds) in sorted(self.calls.items())
+            ]
+        metrics.append(f'total;dur={self.elapsed * 1000:.1f}')
+        return ', '.join(metrics)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                name: {'count': count, 'ms': round(seconds * 1000, 1)}
+                for name, (count, seconds) in sorted(self.calls.items())
+            }
+
+    def log(self, method: str, path: str, status_code: int, min_ms: float = 0) -> None:
+        """ One JSON log line with the cost of the request, at INFO when it took at
+            least `min_ms` and at DEBUG otherwise."""
+        duration_ms = round(self.elapsed * 1000, 1)
+        level = logging.INFO if duration_ms >= min_ms else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(level, json.dumps({
+            'method': method,
+            'path': path,
+            'status': status_code,
+            'duration_ms': duration_ms,
+            **self.summary(),
+        }))
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar('request_metrics', default=None)
+
+
+def start_request() -> RequestMetrics:
+    """New metrics for the request running in the current context, tasks it spawns inherit them."""
+    metrics = RequestMetrics()
+    _current.set(metrics)
+    return metrics
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+def record(name: str, seconds: float) -> None:
+    """Add a call of `seconds` to the current request, no-op outside of a request."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record(name, seconds)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def http_event_hooks(name: str = 'http') -> dict:
+    """ `httpx` event hooks recording each call as `name`, timed until the
+        response headers arrived."""
+    async def on_request(request) -> None:
+        request.extensions['metrics_start'] = time.perf_counter()
+
+    async def on_response(response) -> None:
+        start = response.request.extensions.get('metrics_start')
+        if start is not None:
+            record(name, time.perf_counter() - start)
+
+    return {'request': [on_request], 'response': [on_response]}
+
+
+def instrument_boto3_client(client, name: str = 'aws'):
+    """Record every API call of a boto3 `client` as `name`, returns the client."""
+    def on_before_call(context, **kwargs) -> None:
+        context['metrics_start'] = time.perf_counter()
+
+    def on_after_call(context, **kwargs) -> None:
+        start = context.pop('metrics_start', None)
+        if start is not None:
+            record(name, time.perf_counter() - start)
+
+    client.meta.events.register('before-call', on_before_call)
+    client.meta.events.register('after-call', on_after_call)
+    client.meta.events.register('after-call-error', on_after_call)
+    return client
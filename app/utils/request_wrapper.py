@@ -1,10 +1,11 @@
 import httpx
 from app.exceptions import APIException
+from app.utils.request_metrics import http_event_hooks
 
 class RequestWrapper:
     def __init__(self, base_url):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self.client = httpx.AsyncClient(timeout=60.0, event_hooks=http_event_hooks())
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
@@ -0,0 +1,52 @@
+from typing import Any, List
+
+import jsonschema
+from jsonschema.protocols import Validator
+
+from app.core.config import Config
+from app.utils.cache_utils import TTLCache
+
+# Compiled validators keyed by (commit sha, schema path), the schema at a commit never changes
+schema_validators = TTLCache(maxsize=Config.SCHEMA_VALIDATOR_CACHE_SIZE, ttl=24 * 3600)
+
+
+def compile_schema(schema: dict) -> Validator:
+    """Validator of the schema's draft, the schema itself is checked once here."""
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema, format_checker=cls.FORMAT_CHECKER)
+
+
+def _json_pointer(path) -> str:
+    return ''.join('/' + str(part).replace('~', '~0').replace('/', '~1') for part in path)
+
+
+def _document_position(instance: Any, path) -> tuple:
+    """Position of `path` in `instance`: the array index or object key order at each level."""
+    position = []
+    for part in path:
+        if isinstance(instance, dict):
+            position.append(list(instance).index(part) if part in instance else len(instance))
+            instance = instance.get(part)
+        elif isinstance(instance, list):
+            position.append(part)
+            instance = instance[part] if isinstance(part, int) and part < len(instance) else None
+        else:
+            break
+    return tuple(position)
+
+
+def collect_errors(validator: Validator, instance: Any, limit: int = Config.SCHEMA_VALIDATION_MAX_ERRORS) -> List[dict]:
+    """ Every validation error of `instance` (at most `limit`), in document order,
+        as `{"path": <JSON pointer>, "message", "validator"}`."""
+    errors = []
+    for error in validator.iter_errors(instance):
+        errors.append((_document_position(instance, error.absolute_path), len(errors), {
+            'path': _json_pointer(error.absolute_path),
+            'message': error.message,
+            'validator': str(error.validator),
+        }))
+        if len(errors) >= limit:
+            break
+    # The index keeps the order of several errors at the same path
+    return [error for _, _, error in sorted(errors, key=lambda e: e[:2])]
@@ -0,0 +1,35 @@
+from typing import List
+
+from sqlalchemy import func, literal_column
+
+# Text search configuration of the tsvector expression indexes. `simple` does no
+# stemming, which suits identifiers like table and column names.
+SEARCH_CONFIG = 'simple'
+
+# Search indexes are created by hand in migrations, autogenerate skips this prefix
+SEARCH_INDEX_PREFIX = 'ix_search_'
+
+TEXT_SEARCH_DESCRIPTION = (
+    "Words to look for in the name and description. Matches are ranked by full "
+    "text relevance and trigram similarity, so small typos still match."
+)
+
+
+def _search_config():
+    # Rendered inline, a bound parameter would keep PostgreSQL from matching the index expression
+    return literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+def search_document(columns: List):
+    """ `to_tsvector` over the given text columns joined by a space. It has to stay
+        in sync with the `ix_search_*_tsv` expression indexes to be served by them."""
+    document = None
+    for column in columns:
+        part = func.coalesce(column, literal_column("''"))
+        document = part if document is None else document.op('||')(literal_column("' '")).op('||')(part)
+    return func.to_tsvector(_search_config(), document)
+
+
+def search_query(term: str):
+    """Parse free text (quotes, `or`, `-word`) into a tsquery."""
+    return func.websearch_to_tsquery(_search_config(), term)
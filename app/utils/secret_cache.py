@@ -0,0 +1,39 @@
+import asyncio
+import copy
+import logging
+from typing import Any, Callable, Dict, Hashable
+
+from app.core.config import Config
+from app.utils.cache_utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# (provider, ..., secret_name) -> secret value, shared by every request of the process
+secret_cache: TTLCache = TTLCache(
+    maxsize=Config.SECRETS_CACHE_SIZE,
+    ttl=Config.SECRETS_CACHE_TTL,
+)
+# Bumped by every write of a secret, part of its cache key so reads never join
+# or fill the cache with a fetch started before the write
+_generations: Dict[Hashable, int] = {}
+
+
+async def get_cached_secret(key: Hashable, fetch: Callable[[], Any]) -> Any:
+    """ Return the secret cached under `key` or fill it by running the blocking
+        `fetch()` in a worker thread. Concurrent reads of a missing secret share
+        one fetch. A copy is returned, callers are free to modify it."""
+    generation = _generations.get(key, 0)
+    value = await secret_cache.get_or_load((key, generation), lambda: asyncio.to_thread(fetch))
+    if _generations.get(key, 0) != generation:
+        # Written or deleted while loading, the value may predate the write
+        secret_cache.pop((key, generation))
+    return copy.deepcopy(value)
+
+
+def forget_secret(key: Hashable) -> None:
+    """ Drop a secret from the cache, call it whenever the secret is written or deleted.
+        Reads still in flight are not cached, later reads fetch the secret again."""
+    generation = _generations.get(key, 0)
+    _generations[key] = generation + 1
+    if secret_cache.pop((key, generation), None) is not None:
+        logger.debug(f"Secret {key} dropped from cache")
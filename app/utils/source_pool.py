@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Hashable, Optional
+
+import aiomysql
+import asyncpg
+import oracledb
+from fastapi import HTTPException
+from google.cloud import bigquery
+from google.oauth2 import service_account
+
+from app.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def config_fingerprint(conn_type: str, db_config: dict) -> str:
+    """Hash of the connection settings, a pool is rebuilt when they change."""
+    payload = json.dumps([conn_type, db_config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SourcePool:
+    """ Connection pool to one source database (postgres, mysql, oracle) or a
+        shared BigQuery client. Pools start empty and open connections on demand.
+
+    Args:
+        conn_type: str: Connection type of the source, as in the stored credentials
+        fingerprint: str: `config_fingerprint` of the settings the pool was built from
+        pool: Any: asyncpg / aiomysql / oracledb pool, or a `bigquery.Client`"""
+
+    def __init__(self, conn_type: str, fingerprint: str, pool: Any):
+        self.conn_type = conn_type
+        self.fingerprint = fingerprint
+        self.pool = pool
+        self.in_use = 0
+        self.retired = False
+        self.last_used = time.monotonic()
+
+    @classmethod
+    async def create(cls, conn_type: str, db_config: dict, max_size: int, idle_timeout: float) -> 'SourcePool':
+        if conn_type == "postgres":
+            pool = await asyncpg.create_pool(
+                host=db_config.get('host'), port=db_config.get('port'), database=db_config.get('database'),
+                user=db_config.get('username'), password=db_config.get('password'),
+                min_size=0, max_size=max_size, max_inactive_connection_lifetime=idle_timeout,
+            )
+        elif conn_type == "mysql":
+            # autocommit, otherwise the pool drops every connection left inside a read transaction
+            pool = await aiomysql.create_pool(
+                host=db_config.get('host'), port=db_config.get('port'), user=db_config.get('username'),
+                password=db_config.get('password'), db=db_config.get('database'),
+                minsize=0, maxsize=max_size, autocommit=True, pool_recycle=int(idle_timeout),
+            )
+        elif conn_type == "oracle":
+            service_name = db_config.get('service_name')
+            dsn = f"{db_config.get('host')}:{db_config.get('port')}/" + (service_name if service_name else db_config.get('sid'))
+            pool = await asyncio.to_thread(
+                oracledb.create_pool,
+                user=db_config.get('username'), password=db_config.get('password'), dsn=dsn,
+                min=0, max=max_size, increment=1, timeout=int(idle_timeout),
+            )
+        elif conn_type == "bigquery":
+            creds = service_account.Credentials.from_service_account_info(db_config["credentials_json"])
+            pool = bigquery.Client(credentials=creds, project=db_config["project_id"])
+        else:
+            raise HTTPException(status_code=500, detail="Unsupported database type")
+        return cls(conn_type, config_fingerprint(conn_type, db_config), pool)
+
+    async def acquire(self) -> Any:
+        if self.conn_type in ("postgres", "mysql"):
+            return await self.pool.acquire()
+        if self.conn_type == "oracle":
+            return await asyncio.to_thread(self.pool.acquire)
+        return self.pool
+
+    async def release(self, conn: Any) -> None:
+        if self.conn_type == "postgres":
+            await self.pool.release(conn)
+        elif self.conn_type == "mysql":
+            self.pool.release(conn)
+        elif self.conn_type == "oracle":
+            await asyncio.to_thread(self.pool.release, conn)
+
+    async def close(self) -> None:
+        try:
+            if self.conn_type == "postgres":
+                await self.pool.close()
+            elif self.conn_type == "mysql":
+                self.pool.close()
+                await self.pool.wait_closed()
+            elif self.conn_type == "oracle":
+                await asyncio.to_thread(self.pool.close, force=True)
+            else:
+                self.pool.close()
+        except Exception:
+            logger.exception(f"Could not close {self.conn_type} source pool")
+
+
+class SourcePoolRegistry:
+    """ Source database pools of the process, keyed by `connection_config_id`.
+
+        - A pool is created on first use and rebuilt when the credentials change.
+        - Pools unused for `idle_timeout` seconds are closed, at most `max_pools`
+          are kept (least recently used first out).
+        - A pool dropped while connections are checked out is closed once they
+          are all released.
+
+    Args:
+        max_pools: int: Maximum number of pools kept open
+        max_size: int: Maximum number of connections per pool
+        idle_timeout: float: Seconds after which an idle connection or pool is closed"""
+
+    def __init__(self, max_pools: int = 32, max_size: int = 5, idle_timeout: float = 300):
+        self.max_pools = max(1, max_pools)
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self._pools: "OrderedDict[Hashable, SourcePool]" = OrderedDict()
+        self._lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_config(cls, config) -> 'SourcePoolRegistry':
+        return cls(
+            max_pools=config.SOURCE_POOL_MAX_POOLS,
+            max_size=config.SOURCE_POOL_MAX_SIZE,
+            idle_timeout=config.SOURCE_POOL_IDLE_TIMEOUT,
+        )
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    @asynccontextmanager
+    async def connection(self, key: Hashable, conn_type: str, db_config: dict) -> AsyncIterator[Any]:
+        """Check out a connection (the client for BigQuery) to the source database of `key`."""
+        pool = await self._checkout(key, conn_type, db_config)
+        try:
+            conn = await pool.acquire()
+        except Exception:
+            await self._checkin(pool)
+            raise
+        try:
+            yield conn
+        finally:
+            try:
+                await pool.release(conn)
+            finally:
+                await self._checkin(pool)
+
+    async def invalidate(self, key: Hashable) -> None:
+        """Drop the pool of `key`, call it whenever its credentials change or are deleted."""
+        async with self._get_lock():
+            pool = self._pools.pop(key, None)
+        if pool is not None:
+            await self._retire(pool)
+
+    async def close_all(self) -> None:
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.close()
+        # The lock belongs to the event loop that is going away
+        self._lock = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _checkout(self, key: Hashable, conn_type: str, db_config: dict) -> SourcePool:
+        retired = []
+        async with self._get_lock():
+            now = time.monotonic()
+            for idle_key in [k for k, p in self._pools.items() if p.in_use == 0 and now - p.last_used > self.idle_timeout]:
+                retired.append(self._pools.pop(idle_key))
+
+            pool = self._pools.get(key)
+            if pool is not None and pool.fingerprint != config_fingerprint(conn_type, db_config):
+                retired.append(self._pools.pop(key))
+                pool = None
+            if pool is None:
+                pool = await SourcePool.create(conn_type, db_config, self.max_size, self.idle_timeout)
+                self._pools[key] = pool
+            self._pools.move_to_end(key)
+            while len(self._pools) > self.max_pools:
+                retired.append(self._pools.popitem(last=False)[1])
+
+            pool.in_use += 1
+            pool.last_used = now
+        for old in retired:
+            await self._retire(old)
+        return pool
+
+    async def _checkin(self, pool: SourcePool) -> None:
+        pool.in_use -= 1
+        pool.last_used = time.monotonic()
+        if pool.retired and pool.in_use == 0:
+            await pool.close()
+
+    async def _retire(self, pool: SourcePool) -> None:
+        pool.retired = True
+        if pool.in_use == 0:
+            await pool.close()
+
+
+source_pools = SourcePoolRegistry.from_config(Config)
@@ -1,8 +1,7 @@
 import json
-import jsonschema
-from jsonschema import validate
 
 from app.exceptions.flow import JsonNotValidError
+from app.utils.schema_validation import collect_errors, compile_schema
 
 schema = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -1189,11 +1188,17 @@ schema = {
   }
   
 
+_validator = None
+
+
 def validate_json(data):
-    try:    
-        json_data = json.loads(data) # convert string to json
-        validate(instance=json_data, schema=schema) # validate json against schema
-    except jsonschema.exceptions.ValidationError as err:
+    global _validator
+    if _validator is None:
+        # Checking and compiling the schema is done once
+        _validator = compile_schema(schema)
+    json_data = json.loads(data) # convert string to json
+    errors = collect_errors(_validator, json_data)
+    if errors:
         raise JsonNotValidError(
-            context={"error":err}
+            context={"error": "; ".join(f"{e['path'] or '/'}: {e['message']}" for e in errors)}
         )
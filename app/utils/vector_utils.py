@@ -0,0 +1,29 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+
+
+def fit_dimensions(embedding: Sequence[float], dim: int) -> List[float]:
+    """ Repeat `embedding` until it has `dim` dimensions. The 1536 dimension columns
+        hold two concatenated 768 dimension embeddings, a single query embedding is
+        tiled the same way (see get_query_embedding)."""
+    embedding = list(embedding)
+    if len(embedding) == dim:
+        return embedding
+    if not embedding or dim % len(embedding):
+        raise ValueError(f"Cannot fit an embedding of {len(embedding)} dimensions to {dim}")
+    return embedding * (dim // len(embedding))
+
+
+async def tune_vector_search(session, ef_search: int, iterative_scan: Optional[str] = None) -> None:
+    """ Set the HNSW search parameters for the current transaction only, so they
+        never leak to other requests sharing the pooled connection."""
+    if session.bind.dialect.name != 'postgresql':
+        return
+
+    settings = {'ef_search': str(ef_search)}
+    statement = "SELECT set_config('hnsw.ef_search', :ef_search, true)"
+    if iterative_scan:
+        settings['iterative_scan'] = iterative_scan
+        statement += ", set_config('hnsw.iterative_scan', :iterative_scan, true)"
+    await session.execute(text(statement), settings)
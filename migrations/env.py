@@ -10,6 +10,7 @@ from alembic import context
 
 from app.models import Base
 from app.core.config import Config
+from app.utils.search_utils import SEARCH_INDEX_PREFIX
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -47,6 +48,9 @@ def include_object(object, name, type_, reflected, compare_to):
                 return False
             else:
                 return True
+    if type_ == "index" and name and name.startswith(SEARCH_INDEX_PREFIX):
+        # Expression and trigram indexes for search live in migrations only
+        return False
     return True
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,39 @@
+"""sync_catalog_sequences
+
+Revision ID: 7c41d9e2a5f3
+Revises: 3a6e0c8f2b71
+Create Date: 2026-10-18 12:41:08.613592
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel             # NEW
+
+
+# revision identifiers, used by Alembic.
+revision = '7c41d9e2a5f3'
+down_revision = '3a6e0c8f2b71'
+branch_labels = None
+depends_on = None
+
+# Ids of these tables used to be assigned as max(id) + 1 by the catalog import,
+# which leaves the sequences behind the data. Move them past the highest id.
+SEQUENCE_COLUMNS = {
+    'data_source': 'data_src_id',
+    'data_source_layout': 'data_src_lyt_id',
+    'layout_fields': 'lyt_fld_id',
+}
+
+
+def upgrade() -> None:
+    for table, column in SEQUENCE_COLUMNS.items():
+        op.execute(
+            f"SELECT setval(pg_get_serial_sequence('catalogdb.{table}', '{column}'), "
+            f"coalesce(max({column}), 1), max({column}) IS NOT NULL) "
+            f"FROM catalogdb.{table}"
+        )
+
+
+def downgrade() -> None:
+    # Nothing to undo, the sequences stay ahead of the data
+    pass
@@ -0,0 +1,41 @@
+"""vector_search_indexes
+
+Revision ID: d8b74fa7bf91
+Revises: f1dbb06d5501
+Create Date: 2026-10-18 11:02:17.540913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel             # NEW
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b74fa7bf91'
+down_revision = 'f1dbb06d5501'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # HNSW needs pgvector >= 0.5. Queries order by cosine distance (<=>).
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_search_data_source_embeddings_hnsw "
+        "ON catalogdb.data_source USING hnsw (data_src_embeddings vector_cosine_ops) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_search_data_source_relationships_embeddings_hnsw "
+        "ON catalogdb.data_source USING hnsw (data_src_relationships_embeddings vector_cosine_ops) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
+    # Pre-filters of the vector search, selective ones let the planner skip the ANN index
+    op.create_index(op.f('ix_catalogdb_data_source_connection_config_id'), 'data_source', ['connection_config_id'], unique=False, schema='catalogdb')
+    op.create_index(op.f('ix_catalogdb_data_source_bh_project_id'), 'data_source', ['bh_project_id'], unique=False, schema='catalogdb')
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_catalogdb_data_source_bh_project_id'), table_name='data_source', schema='catalogdb')
+    op.drop_index(op.f('ix_catalogdb_data_source_connection_config_id'), table_name='data_source', schema='catalogdb')
+    op.execute("DROP INDEX IF EXISTS catalogdb.ix_search_data_source_relationships_embeddings_hnsw")
+    op.execute("DROP INDEX IF EXISTS catalogdb.ix_search_data_source_embeddings_hnsw")
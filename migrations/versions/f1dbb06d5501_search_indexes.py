@@ -0,0 +1,52 @@
+"""search_indexes
+
+Revision ID: f1dbb06d5501
+Revises: e831c4343c1c
+Create Date: 2026-10-18 10:12:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel             # NEW
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1dbb06d5501'
+down_revision = 'e831c4343c1c'
+branch_labels = None
+depends_on = None
+
+# table -> searchable text columns, same as `search_fields` of the services
+SEARCH_COLUMNS = {
+    'data_source': ('data_src_name', 'data_src_desc'),
+    'layout_fields': ('lyt_fld_name', 'lyt_fld_desc'),
+    'pipeline': ('pipeline_name', 'notes'),
+    'flow': ('flow_name', 'notes'),
+}
+
+
+def _document(columns) -> str:
+    # Must match app.utils.search_utils.search_document
+    joined = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+    return f"to_tsvector('simple'::regconfig, {joined})"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, columns in SEARCH_COLUMNS.items():
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_search_{table}_tsv "
+            f"ON catalogdb.{table} USING gin ({_document(columns)})"
+        )
+        for column in columns:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_search_{table}_{column}_trgm "
+                f"ON catalogdb.{table} USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    for table, columns in SEARCH_COLUMNS.items():
+        op.execute(f"DROP INDEX IF EXISTS catalogdb.ix_search_{table}_tsv")
+        for column in columns:
+            op.execute(f"DROP INDEX IF EXISTS catalogdb.ix_search_{table}_{column}_trgm")
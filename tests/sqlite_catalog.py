@@ -0,0 +1,34 @@
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import MetaData, event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.config import Config
+
+
+async def create_catalog_engine(directory: Optional[Path] = None) -> AsyncEngine:
+    """ SQLite engine with the catalog tables under the `Config.DB_SCHEMA` schema.
+        In memory by default; pass a `directory` for a database shared by several
+        sessions, e.g. work done from contexts of its own."""
+    if directory is None:
+        url, schema_path = "sqlite+aiosqlite://", ":memory:"
+    else:
+        url, schema_path = f"sqlite+aiosqlite:///{directory / 'main.db'}", directory / 'catalog.db'
+    engine = create_async_engine(url)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE '{schema_path}' AS {Config.DB_SCHEMA}")
+
+    # The models' server defaults and indexes are PostgreSQL only, the tables are created without them
+    metadata = MetaData()
+    for table in SQLModel.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for column in copy.columns:
+            column.server_default = None
+        copy.indexes.clear()
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+    return engine
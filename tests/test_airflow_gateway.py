@@ -0,0 +1,76 @@
+import pytest
+
+from app.utils.airflow_utils.airflow_gateway import AirflowGateway
+
+
+class FakeAirflow:
+    """`get_dag_status` answers per dag run id, one answer per poll, the last one repeats."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = {}
+
+    async def get_dag_status(self, dag_id, dag_run_id):
+        polls = self.calls[dag_run_id] = self.calls.get(dag_run_id, 0) + 1
+        answers = self.answers[dag_run_id]
+        answer = answers[min(polls, len(answers)) - 1]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+def ok(state):
+    return {'RestApiStatusCode': 200, 'RestApiResponse': {'state': state}}
+
+
+def gateway(**kwargs):
+    return AirflowGateway(status_ttl=0, terminal_ttl=0, **kwargs)
+
+
+async def watch(airflow, runs, **kwargs):
+    return [item async for item in gateway(**kwargs).watch(airflow, 'env', runs, interval=0)]
+
+
+@pytest.mark.asyncio
+async def test_watch_yields_state_changes_until_finished():
+    airflow = FakeAirflow({'r1': [ok('queued'), ok('running'), ok('running'), ok('success')]})
+
+    items = await watch(airflow, [('dag', 'r1')])
+
+    assert [item['state'] for item in items] == ['queued', 'running', 'success']
+
+
+@pytest.mark.asyncio
+async def test_watch_gives_up_a_run_not_found():
+    airflow = FakeAirflow({
+        'missing': [{'RestApiStatusCode': 404, 'RestApiResponse': {}}],
+        'r1': [ok('running'), ok('success')],
+    })
+
+    items = await watch(airflow, [('dag', 'missing'), ('dag', 'r1')])
+
+    missing = [item for item in items if item['dag_run_id'] == 'missing']
+    assert len(missing) == 1
+    assert missing[0]['done'] and missing[0]['error']
+    assert airflow.calls['missing'] == 1
+
+
+@pytest.mark.asyncio
+async def test_watch_gives_up_after_consecutive_failures():
+    airflow = FakeAirflow({'r1': [RuntimeError("Airflow is down")]})
+
+    items = await watch(airflow, [('dag', 'r1')], max_failures=3)
+
+    assert airflow.calls['r1'] == 3
+    assert items[-1]['done'] and items[-1]['error'] == "Airflow is down"
+
+
+@pytest.mark.asyncio
+async def test_watch_failure_count_resets_on_success():
+    down = RuntimeError("Airflow is down")
+    airflow = FakeAirflow({'r1': [down, down, ok('running'), down, down, ok('success')]})
+
+    items = await watch(airflow, [('dag', 'r1')], max_failures=3)
+
+    assert items[-1]['state'] == 'success'
+    assert not any(item.get('done') for item in items)
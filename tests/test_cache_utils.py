@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.utils.cache_utils import TTLCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_load():
+    cache = TTLCache()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    assert await asyncio.gather(*(cache.get_or_load('key', loader) for _ in range(3))) == ['value'] * 3
+    assert len(loads) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_loader_does_not_cancel_the_waiters():
+    cache = TTLCache()
+    started = asyncio.Event()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        started.set()
+        await asyncio.sleep(0.05)
+        return 'value'
+
+    first = asyncio.create_task(cache.get_or_load('key', loader))
+    await started.wait()
+    waiters = [asyncio.create_task(cache.get_or_load('key', loader)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    first.cancel()
+
+    assert await asyncio.gather(*waiters) == ['value', 'value']
+    assert first.cancelled()
+    # One of the waiters loaded again
+    assert len(loads) == 2
+    assert cache.get('key') == 'value'
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_raised_to_every_caller_and_not_cached():
+    cache = TTLCache()
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("down")
+
+    results = await asyncio.gather(*(cache.get_or_load('key', loader) for _ in range(2)), return_exceptions=True)
+
+    assert [str(result) for result in results] == ['down', 'down']
+    assert 'key' not in cache
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.dag_deployment import DagDeployer, dag_fingerprint
+
+
+INPUTS = {'bh_app_bucket': 'app', 'client_cloud_provider': 'aws'}
+TARGET = ('aws', 'airflow-bucket', 'dags/flow.py')
+
+
+def test_fingerprint_ignores_key_order():
+    assert dag_fingerprint({'a': 1, 'b': [1, 2]}, INPUTS) == dag_fingerprint({'b': [1, 2], 'a': 1}, dict(INPUTS))
+
+
+def test_fingerprint_changes_with_flow_and_inputs():
+    fingerprint = dag_fingerprint({'a': 1}, INPUTS)
+    assert dag_fingerprint({'a': 2}, INPUTS) != fingerprint
+    assert dag_fingerprint({'a': 1}, {**INPUTS, 'bh_app_bucket': 'other'}) != fingerprint
+
+
+@pytest.mark.asyncio
+async def test_skips_only_when_the_target_holds_the_fingerprint():
+    deployer = DagDeployer()
+    assert not await deployer.needs_upload(TARGET, 'f1', lambda: 'f1')
+    assert await deployer.needs_upload(TARGET, 'f1', lambda: None)
+
+
+@pytest.mark.asyncio
+async def test_revert_after_another_worker_deployed_is_uploaded():
+    # Worker A deploys f1, worker B then deploys f2, the user reverts to f1 on worker A
+    worker_a = DagDeployer()
+    s3 = {'fingerprint': None}
+
+    def upload(fingerprint):
+        return lambda: s3.update(fingerprint=fingerprint)
+
+    assert await worker_a.needs_upload(TARGET, 'f1', lambda: s3['fingerprint'])
+    worker_a.schedule(TARGET, 'f1', upload('f1'))
+    await worker_a.drain()
+
+    upload('f2')()
+
+    assert await worker_a.needs_upload(TARGET, 'f1', lambda: s3['fingerprint'])
+
+
+@pytest.mark.asyncio
+async def test_in_flight_fingerprint_is_not_uploaded_twice():
+    deployer = DagDeployer()
+    release = threading.Event()
+    deployer.schedule(TARGET, 'f1', release.wait)
+    await asyncio.sleep(0)
+
+    def unexpected_read():
+        raise AssertionError("the target is not read while an upload is in flight")
+
+    assert not await deployer.needs_upload(TARGET, 'f1', unexpected_read)
+    assert await deployer.needs_upload(TARGET, 'f2', unexpected_read)
+    assert deployer.status(TARGET)['fingerprint'] == 'f1'
+
+    release.set()
+    await deployer.drain()
+    assert deployer.status(TARGET) is None
+
+
+@pytest.mark.asyncio
+async def test_saves_during_an_upload_are_coalesced():
+    deployer = DagDeployer()
+    release = threading.Event()
+    uploaded = []
+
+    def upload(fingerprint):
+        def run():
+            release.wait()
+            uploaded.append(fingerprint)
+        return run
+
+    for fingerprint in ('f1', 'f2', 'f3', 'f4'):
+        deployer.schedule(TARGET, fingerprint, upload(fingerprint))
+        await asyncio.sleep(0)
+    release.set()
+    await deployer.drain()
+
+    assert uploaded == ['f1', 'f4']
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_is_reported_until_the_next_success():
+    deployer = DagDeployer()
+
+    def failing():
+        raise RuntimeError("access denied")
+
+    deployer.schedule(TARGET, 'f1', failing)
+    await deployer.drain()
+    assert deployer.status(TARGET) == {'state': 'failed', 'fingerprint': 'f1', 'error': 'access denied'}
+    # Nothing was deployed, the next save uploads again
+    assert await deployer.needs_upload(TARGET, 'f1', lambda: None)
+
+    deployer.schedule(TARGET, 'f1', lambda: None)
+    await deployer.drain()
+    assert deployer.status(TARGET) is None
@@ -0,0 +1,64 @@
+import pytest
+import pytest_asyncio
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.context import Context
+from app.exceptions import ObjectNotFound
+from app.models import CodesDtl, CodesHdr, DataSource, DataSourceLayout, LayoutFields
+from sqlite_catalog import create_catalog_engine
+
+ACTIVE, CSV, STRING, MASTER = 1, 2, 3, 4
+
+
+@pytest_asyncio.fixture
+async def ctx():
+    engine = await create_catalog_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(CodesHdr(id=1, description="codes", type_cd="test"))
+        for code_id, desc in ((ACTIVE, "Active"), (CSV, "CSV"), (STRING, "string"), (MASTER, "Master")):
+            session.add(CodesDtl(id=code_id, codes_hdr_id=1, dtl_desc=desc, dtl_id_filter=0))
+        await session.commit()
+
+        context = Context()
+        context.db_session = session
+        yield context
+    await engine.dispose()
+
+
+async def add_data_source(ctx, status_cd):
+    session = ctx.db_session
+    data_source = DataSource(data_src_name="orders", data_src_key="orders", data_src_status_cd=status_cd)
+    session.add(data_source)
+    await session.flush()
+    layout = DataSourceLayout(
+        data_src_id=data_source.data_src_id, data_src_lyt_name="orders", data_src_lyt_fmt_cd=CSV, data_src_lyt_type_cd=MASTER,
+    )
+    session.add(layout)
+    await session.flush()
+    session.add(LayoutFields(
+        lyt_id=layout.data_src_lyt_id, lyt_fld_name="id", lyt_fld_key="id", lyt_fld_order=1,
+        lyt_fld_data_type_cd=STRING,
+    ))
+    await session.commit()
+    return data_source.data_src_id
+
+
+@pytest.mark.asyncio
+async def test_export_resolves_code_values(ctx):
+    data_source_id = await add_data_source(ctx, status_cd=ACTIVE)
+
+    config = await ctx.engine_integrations_service.engine_config_export(data_source_id=data_source_id)
+
+    assert config['data_source']['data_src_status_val'] == "Active"
+    [layout] = config['data_source_layout']
+    assert layout['data_src_lyt_fmt_val'] == "CSV"
+    assert layout['data_src_lyt_delimiter_val'] is None
+    assert layout['layout_fields'][0]['lyt_fld_data_type_val'] == "string"
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_an_unknown_code(ctx):
+    data_source_id = await add_data_source(ctx, status_cd=99)
+
+    with pytest.raises(ObjectNotFound):
+        await ctx.engine_integrations_service.engine_config_export(data_source_id=data_source_id)
@@ -0,0 +1,88 @@
+import os
+import time
+
+import pytest
+
+from app.utils.git_utils import github_provider
+from app.utils.git_utils.content_cache import GitContentCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeGitHub:
+    """Resolves `main` for the tokens in `readers`, 404 for the others."""
+
+    def __init__(self, readers):
+        self.readers = readers
+        self.calls = 0
+
+    async def request(self, method, url, headers=None, **kwargs):
+        self.calls += 1
+        if headers['Authorization'] not in {f'token {token}' for token in self.readers}:
+            return FakeResponse(404)
+        return FakeResponse(200, 'a' * 40)
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = GitContentCache(directory=str(tmp_path), max_bytes=100, max_age=3600)
+    monkeypatch.setattr(github_provider, 'git_content_cache', cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_refs_are_not_shared_across_tokens(monkeypatch, cache):
+    github = FakeGitHub(readers={'reader'})
+    monkeypatch.setattr(github_provider, 'git_http_client', github)
+
+    reader = github_provider.GitHubProvider('reader', 'owner', 'repo')
+    outsider = github_provider.GitHubProvider('outsider', 'owner', 'repo')
+
+    assert await reader.resolve_commit_sha('main') == 'a' * 40
+    assert await outsider.resolve_commit_sha('main') is None
+    assert github.calls == 2
+    # The same token is served from the cache
+    assert await github_provider.GitHubProvider('reader', 'owner', 'repo').resolve_commit_sha('main') == 'a' * 40
+    assert github.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_content_is_loaded_once_and_kept_on_disk(cache, tmp_path):
+    async def load():
+        return 'content'
+
+    assert await cache.get_or_load(('repo', 'scope', 'sha', 'file'), load) == 'content'
+
+    async def unexpected_load():
+        raise AssertionError("read from disk")
+
+    restarted = GitContentCache(directory=str(tmp_path))
+    assert await restarted.get_or_load(('repo', 'scope', 'sha', 'file'), unexpected_load) == 'content'
+
+
+def test_prune_removes_expired_then_least_recently_read_files(cache):
+    now = time.time()
+    for i, age in enumerate([7200, 30, 20, 10]):
+        key = ('repo', 'scope', 'sha', f'file_{i}')
+        cache._write(key, 'x' * 40)
+        os.utime(cache._path(key), (now - age, now - age))
+
+    cache.prune()
+
+    kept = [i for i in range(4) if cache._read(('repo', 'scope', 'sha', f'file_{i}')) is not None]
+    # file_0 is too old, file_1 is the least recently read of the 120 bytes left
+    assert kept == [2, 3]
+
+
+def test_expired_file_is_not_served(cache):
+    key = ('repo', 'scope', 'sha', 'file')
+    cache._write(key, 'content')
+    old = time.time() - 7200
+    os.utime(cache._path(key), (old, old))
+
+    assert cache._read(key) is None
@@ -0,0 +1,163 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.core.context
+from app.celery_conf.tasks import update_embeddings
+from app.core.config import Config
+from app.core.context import Context
+from app.enums.job import JobItemStatus, JobStatus, JobType
+from app.models.job import BHJob
+from app.services.job import JobService, WORKER_ID
+from app.utils.job_utils import LocalJobBackend
+from sqlite_catalog import create_catalog_engine
+
+
+def long_ago():
+    return datetime.now(timezone.utc) - timedelta(seconds=Config.JOB_STALE_AFTER + 60)
+
+
+@pytest_asyncio.fixture
+async def session_factory(monkeypatch, tmp_path):
+    # A file database, heartbeats are written from sessions of their own
+    engine = await create_catalog_engine(tmp_path)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(app.core.context, 'AsyncSessionLocal', factory)
+    monkeypatch.setattr(JobService, 'dispatch', lambda self, job_id: asyncio.sleep(0))
+    yield factory
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def ctx(session_factory):
+    async with Context() as context:
+        yield context
+
+
+async def add_job(ctx, items, **values):
+    job = BHJob(job_type=JobType.UPDATE_EMBEDDINGS, items=items, progress={}, total_items=len(items), **values)
+    ctx.db_session.add(job)
+    await ctx.db_session.commit()
+    return job.job_id
+
+
+async def set_heartbeat(job_id, heartbeat_at):
+    async with Context() as other:
+        await other.db_session.execute(update(BHJob).where(BHJob.job_id == job_id).values(heartbeat_at=heartbeat_at))
+        await other.db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_job_is_claimed_once_until_its_heartbeat_is_stale(ctx):
+    job_id = await add_job(ctx, ['a'])
+
+    assert await ctx.job_service.claim(job_id)
+    assert not await ctx.job_service.claim(job_id)
+
+    await set_heartbeat(job_id, long_ago())
+    assert await ctx.job_service.claim(job_id)
+    job = await ctx.job_service.get_job(job_id)
+    assert (job.status, job.worker_id, job.attempts) == (JobStatus.RUNNING, WORKER_ID, 2)
+
+
+@pytest.mark.asyncio
+async def test_finished_job_is_not_claimed(ctx):
+    job_id = await add_job(ctx, ['a'], status=JobStatus.SUCCEEDED)
+
+    assert not await ctx.job_service.claim(job_id)
+
+
+@pytest.mark.asyncio
+async def test_resumed_job_skips_finished_items(ctx, monkeypatch):
+    monkeypatch.setattr(Config, 'JOB_CHUNK_SIZE', 2)
+    seen = []
+
+    async def handler(context, job, chunk):
+        seen.append(chunk)
+        return {item: {'status': JobItemStatus.DONE.value} for item in chunk}
+
+    monkeypatch.setitem(JobService.handlers, JobType.UPDATE_EMBEDDINGS, handler)
+    job_id = await add_job(ctx, ['a', 'b', 'c', 'd'], status=JobStatus.FAILED)
+    job = await ctx.job_service.get_job(job_id)
+    job.progress = {'a': {'status': JobItemStatus.DONE.value}, 'b': {'status': JobItemStatus.FAILED.value, 'error': 'x'}}
+    await ctx.db_session.commit()
+
+    await ctx.job_service.resume(job_id)
+    await ctx.job_service.run(job_id)
+
+    assert seen == [['b', 'c'], ['d']]
+    job = await ctx.job_service.get_job(job_id)
+    assert job.status == JobStatus.SUCCEEDED
+    assert (job.completed_items, job.failed_items, job.attempts) == (4, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_is_refreshed_during_a_long_chunk(ctx, monkeypatch):
+    monkeypatch.setattr(Config, 'JOB_HEARTBEAT_INTERVAL', 0.05)
+    job_id = await add_job(ctx, ['a'])
+    heartbeats = []
+
+    async def handler(context, job, chunk):
+        await set_heartbeat(job_id, long_ago())
+        await asyncio.sleep(0.3)
+        async with Context() as other:
+            heartbeats.append((await other.job_service.get_job(job_id)).heartbeat_at)
+        return {item: {'status': JobItemStatus.DONE.value} for item in chunk}
+
+    monkeypatch.setitem(JobService.handlers, JobType.UPDATE_EMBEDDINGS, handler)
+    await ctx.job_service.run(job_id)
+
+    assert heartbeats[0].replace(tzinfo=timezone.utc) > long_ago() + timedelta(seconds=30)
+
+
+@pytest.mark.asyncio
+async def test_stale_sweep_leaves_fresh_queued_jobs(ctx):
+    fresh = await add_job(ctx, ['a'], heartbeat_at=datetime.now(timezone.utc))
+    released = await add_job(ctx, ['a'], heartbeat_at=long_ago())
+    crashed = await add_job(ctx, ['a'], status=JobStatus.RUNNING, heartbeat_at=long_ago())
+    running = await add_job(ctx, ['a'], status=JobStatus.RUNNING, heartbeat_at=datetime.now(timezone.utc))
+
+    assert await ctx.job_service.resumable_job_ids() == [fresh, released, crashed]
+    assert await ctx.job_service.resumable_job_ids(stale_only=True) == [released, crashed]
+    assert running not in await ctx.job_service.resumable_job_ids()
+
+
+@pytest.mark.asyncio
+async def test_items_without_embeddings_are_skipped(ctx, monkeypatch):
+    async def embed(request):
+        return {'results': {request[0]: 'ok'}}
+
+    monkeypatch.setattr(ctx.data_source_service, 'update_embeddings', embed)
+    job_id = await add_job(ctx, ['1', '2'])
+
+    await ctx.job_service.run(job_id)
+
+    job = await ctx.job_service.get_job(job_id)
+    assert job.progress['2']['status'] == JobItemStatus.SKIPPED.value
+    assert (job.completed_items, job.skipped_items, job.failed_items) == (1, 1, 0)
+    assert job.status == JobStatus.SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_local_backend_runs_a_job_once_per_process(monkeypatch):
+    release = asyncio.Event()
+    runs = []
+
+    async def execute_job(job_id):
+        runs.append(job_id)
+        await release.wait()
+
+    monkeypatch.setattr('app.celery_conf.tasks.execute_job', execute_job)
+    backend = LocalJobBackend(concurrency=2)
+    await backend.dispatch(1)
+    await backend.dispatch(1)
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*backend._tasks.values())
+
+    assert runs == [1]
@@ -0,0 +1,47 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import Config
+from app.utils import moniter_utils
+from app.utils.request_metrics import start_request
+
+
+@pytest.fixture
+def monitor_api(monkeypatch):
+    """Answers the monitor API calls with `handler`, through the client built by `request_create_monitor`."""
+    monkeypatch.setattr(Config, 'BH_MONITER_URL', 'http://monitor.test/monitors')
+    client_class = httpx.AsyncClient
+
+    def install(handler):
+        monkeypatch.setattr(
+            httpx, 'AsyncClient',
+            lambda **kwargs: client_class(transport=httpx.MockTransport(handler), **kwargs),
+        )
+    return install
+
+
+@pytest.mark.asyncio
+async def test_request_create_monitor_posts_and_records_the_call(monitor_api):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(201, json={'monitor_id': 7})
+
+    monitor_api(handler)
+    metrics = start_request()
+
+    assert await moniter_utils.request_create_monitor({'flow_key': 'orders'}) == {'monitor_id': 7}
+    assert str(requests[0].url) == 'http://monitor.test/monitors'
+    assert metrics.summary()['http']['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_request_create_monitor_raises_the_api_error(monitor_api):
+    monitor_api(lambda request: httpx.Response(422, text='bad monitor'))
+
+    with pytest.raises(HTTPException) as error:
+        await moniter_utils.request_create_monitor({})
+
+    assert error.value.status_code == 422
@@ -0,0 +1,56 @@
+import json
+import logging
+
+import pytest
+
+from app.utils import request_metrics
+from app.utils.request_metrics import RequestMetrics, record, start_request, timed
+
+
+@pytest.fixture
+def metrics():
+    metrics = RequestMetrics()
+    metrics.record('db', 0.010)
+    metrics.record('db', 0.0025)
+    metrics.record('http', 0.2)
+    return metrics
+
+
+def test_server_timing_lists_each_kind_and_the_total(metrics):
+    *calls, total = metrics.server_timing().split(', ')
+
+    assert calls == ['db;dur=12.5;desc="2"', 'http;dur=200.0;desc="1"']
+    assert total.startswith('total;dur=')
+
+
+def test_summary_counts_calls_and_milliseconds(metrics):
+    assert metrics.summary() == {'db': {'count': 2, 'ms': 12.5}, 'http': {'count': 1, 'ms': 200.0}}
+
+
+def test_records_go_to_the_current_request():
+    metrics = start_request()
+    with timed('serialize'):
+        pass
+    record('db', 0.001)
+
+    assert {name: entry['count'] for name, entry in metrics.summary().items()} == {'db': 1, 'serialize': 1}
+
+
+@pytest.mark.parametrize("min_ms, level", [(0, logging.INFO), (60_000, logging.DEBUG)])
+def test_log_level_depends_on_min_ms(metrics, caplog, min_ms, level):
+    with caplog.at_level(logging.DEBUG, logger=request_metrics.__name__):
+        metrics.log('GET', '/api/v1/items/{item_id}', 200, min_ms=min_ms)
+
+    [entry] = caplog.records
+    assert entry.levelno == level
+    line = json.loads(entry.getMessage())
+    assert (line['method'], line['path'], line['status'], line['db']) == (
+        'GET', '/api/v1/items/{item_id}', 200, {'count': 2, 'ms': 12.5},
+    )
+
+
+def test_fast_requests_are_not_logged_at_info(metrics, caplog):
+    with caplog.at_level(logging.INFO, logger=request_metrics.__name__):
+        metrics.log('GET', '/health', 200, min_ms=60_000)
+
+    assert caplog.records == []
@@ -0,0 +1,17 @@
+from app.utils.schema_validation import collect_errors, compile_schema
+
+
+def test_errors_are_in_document_order():
+    validator = compile_schema({
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "items": {"type": "array", "items": {"type": "integer"}},
+        },
+        "required": ["id"],
+    })
+    document = {"name": 1, "items": [0, "a"] + list(range(8)) + ["b"]}
+
+    errors = collect_errors(validator, document)
+
+    assert [error['path'] for error in errors] == ['', '/name', '/items/1', '/items/10']
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.secret_cache import forget_secret, get_cached_secret, secret_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    secret_cache.clear()
+    yield
+    secret_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_secret_is_fetched_once_and_copied():
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {'password': 'old'}
+
+    first = await get_cached_secret(('aws', 'db'), fetch)
+    first['password'] = 'changed by the caller'
+
+    assert await get_cached_secret(('aws', 'db'), fetch) == {'password': 'old'}
+    assert len(fetches) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_in_flight_during_a_write_is_not_cached():
+    key = ('aws', 'db')
+    secret = {'password': 'old'}
+    fetching = threading.Event()
+    release = threading.Event()
+
+    def slow_fetch():
+        value = dict(secret)
+        fetching.set()
+        release.wait()
+        return value
+
+    stale_read = asyncio.create_task(get_cached_secret(key, slow_fetch))
+    await asyncio.to_thread(fetching.wait)
+
+    # The secret is written while the read is in flight
+    secret['password'] = 'new'
+    forget_secret(key)
+    fresh_read = asyncio.create_task(get_cached_secret(key, lambda: dict(secret)))
+
+    release.set()
+    assert await stale_read == {'password': 'old'}
+    assert await fresh_read == {'password': 'new'}
+    assert await get_cached_secret(key, lambda: {'password': 'unexpected fetch'}) == {'password': 'new'}
@@ -0,0 +1,90 @@
+import pytest
+import pytest_asyncio
+from fastapi.encoders import jsonable_encoder
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import Config
+from app.core.context import Context
+from app.models import BHProject, DataSource, LayoutFields
+from app.utils.json_utils import loads, to_jsonable, to_ndjson_lines
+from sqlite_catalog import create_catalog_engine
+
+
+@pytest_asyncio.fixture
+async def ctx(monkeypatch):
+    # Several fetches per stream
+    monkeypatch.setattr(Config, 'STREAM_BATCH_SIZE', 2)
+
+    engine = await create_catalog_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        project = BHProject(bh_project_name="sales")
+        session.add(project)
+        await session.flush()
+        for i in range(5):
+            session.add(DataSource(
+                data_src_name=f"source_{i}",
+                data_src_key=f"source_{i}",
+                bh_project_id=project.bh_project_id if i % 2 else None,
+                is_deleted=(i == 3),
+            ))
+            session.add(LayoutFields(
+                lyt_fld_name=f"field_{i}", lyt_fld_key=f"field_{i}", lyt_fld_order=i, lyt_fld_data_type_cd=1,
+                is_deleted=(i == 3),
+            ))
+        await session.commit()
+        session.expunge_all()
+
+        context = Context()
+        context.db_session = session
+        yield context
+    await engine.dispose()
+
+
+async def ndjson_rows(rows):
+    return [loads(line) async for line in to_ndjson_lines(rows)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("service_name", ["data_source_service", "layout_fields_service"])
+async def test_stream_list_matches_list(ctx, service_name):
+    service = getattr(ctx, service_name)
+
+    page = await service.list(limit=10, order_desc=True)
+    streamed = await ndjson_rows(service.stream_list(limit=10, order_desc=True))
+
+    assert len(streamed) == 4
+    assert streamed == jsonable_encoder(list(page))
+
+
+@pytest.mark.asyncio
+async def test_data_source_stream_has_project_names(ctx):
+    streamed = await ndjson_rows(ctx.data_source_service.stream_list(limit=10))
+
+    assert {row['data_src_name']: row['bh_project_name'] for row in streamed} == {
+        'source_0': None, 'source_1': 'sales', 'source_2': None, 'source_4': None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_stream_list_releases_streamed_rows(ctx):
+    async for _ in ctx.layout_fields_service.stream_list(limit=10):
+        pass
+
+    assert len(ctx.db_session.identity_map) <= 1
+
+
+@pytest.mark.asyncio
+async def test_stream_export_matches_export(ctx):
+    service = ctx.engine_integrations_service
+    models = {"data_source": DataSource, "layout_fields": LayoutFields}
+
+    exported = to_jsonable(await service.export_tables(models_to_export=models))
+    ctx.db_session.expunge_all()
+    streamed = await ndjson_rows(service.stream_export_tables(models_to_export=models))
+
+    regrouped = {}
+    for line in streamed:
+        regrouped.setdefault(line['table'], []).append(line['row'])
+    assert regrouped == exported
+    # The export includes deleted rows
+    assert len(regrouped['data_source']) == 5